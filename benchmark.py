@@ -0,0 +1,554 @@
+"""
+Offline benchmarks of the graph building, loading and visualization.
+
+The builds run against local stand-in servers for the GitHub, ORCID, ROR and Wikidata APIs, which
+serve either synthetic organizations of any size or responses recorded in a `cache.ResponseCache`
+file. Every build runs in a separate process, so memory peaks and module-level memos do not carry
+over between runs.
+
+Usage:
+    python benchmark.py                                  # synthetic orgs with 30, 300 and 3000 repos
+    python benchmark.py --sizes 30 300 --latency 0.05 --workers 8
+    python benchmark.py --rate-limited                   # servers enforce the real API rate limits
+    python benchmark.py --cassette http_cache.sqlite --org <github org> --ror-id <ror id>
+"""
+import argparse
+import json
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlencode, urlparse
+
+from scheduler import DEFAULT_RATE_LIMITS
+
+# Hosts of the real APIs, in the order of `utils.API_URLS`
+API_HOSTS = {
+    "github": "api.github.com",
+    "orcid": "pub.orcid.org",
+    "ror": "api.ror.org",
+    "wikidata": "query.wikidata.org",
+}
+
+# Paths of the base URLs of the APIs (see `utils.API_URLS`)
+API_PATHS = {
+    "github": "",
+    "orcid": "/v3.0",
+    "ror": "",
+    "wikidata": "/sparql",
+}
+
+
+class SyntheticAPIs:
+    """
+    Deterministic synthetic responses of the GitHub, ORCID, ROR and Wikidata APIs for a GitHub
+    organization with `n_repos` repositories. Contributors are shared between repositories, and
+    some of them have no name, no ORCID record or organizations that can only be resolved via
+    Wikidata or the ROR search, like in the real data. The ORCID records are served as JSON-LD
+    and as /person and /activities sections with the same data, and both the search and the
+    expanded-search of ORCID find every person that has a record.
+    """
+
+    def __init__(self, n_repos, seed=0):
+        self.n_repos = n_repos
+        self.seed = seed
+        self.n_persons = max(20, n_repos // 2)
+        self.n_organizations = max(10, self.n_persons // 10)
+
+    def contributors(self, repo):
+        rng = random.Random(self.seed * 1_000_003 + repo)
+        # Few people contribute to many repositories
+        weights = [1 / (person + 1) for person in range(self.n_persons)]
+        return sorted(set(rng.choices(range(self.n_persons), weights, k=rng.randint(1, 6))))
+
+    @staticmethod
+    def orcid(person):
+        return f"0000-0002-{person // 10000:04d}-{person % 10000:04d}"
+
+    @staticmethod
+    def ror_id(organization):
+        return f"0{organization:06d}bm"
+
+    def respond(self, api, path, query, base_urls):
+        if api == "github":
+            return self.github(path, query, base_urls["github"])
+        if api == "orcid":
+            return self.orcid_api(path, query)
+        if api == "ror":
+            return self.ror(path, query)
+        return self.wikidata(query)
+
+    def github(self, path, query, base):
+        parts = path.strip("/").split("/")
+        if parts[0] == "orgs" and len(parts) == 2:
+            return {"login": parts[1], "repos_url": f"{base}/orgs/{parts[1]}/repos"}, {}
+        if parts[0] == "orgs":
+            items = [{
+                "id": 100000 + repo,
+                "name": f"repo{repo}",
+                "url": f"{base}/repos/{parts[1]}/repo{repo}",
+                "contributors_url": f"{base}/repos/{parts[1]}/repo{repo}/contributors",
+                "pushed_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+            } for repo in range(self.n_repos)]
+            return paginate(items, query, f"{base}/{path.strip('/')}")
+        if parts[0] == "repos":
+            repo = int(parts[2][len("repo"):])
+            items = [{"login": f"user{person}", "url": f"{base}/users/user{person}"}
+                     for person in self.contributors(repo)]
+            return paginate(items, query, f"{base}/{path.strip('/')}")
+        if parts[0] == "users":
+            person = int(parts[1][len("user"):])
+            name = None if person % 10 == 9 else f"Given{person} Family{person}"
+            return {"login": parts[1], "name": name}, {}
+        return None, {}
+
+    def orcid_api(self, path, query):
+        parts = path.strip("/").split("/")
+        if parts[0] == "search":
+            match = re.search(r"family-name:Family(\d+)", query.get("q", ""))
+            person = int(match.group(1)) if match else None
+            if person is None or not self.has_orcid(person):
+                return {"result": None, "num-found": 0}, {}
+            return {"result": [{"orcid-identifier": {"path": self.orcid(person)}}], "num-found": 1}, {}
+        if parts[0] == "expanded-search":
+            return self.orcid_expanded_search(query), {}
+
+        orcid = parts[0]
+        person = int(orcid.split("-")[2]) * 10000 + int(orcid.split("-")[3])
+        if len(parts) == 1:
+            return self.orcid_record(person), {}
+        if parts[1] == "person":
+            return self.orcid_person_section(person), {}
+        if parts[1] == "activities":
+            return self.orcid_activities(person), {}
+        return None, {}
+
+    @staticmethod
+    def has_orcid(person):
+        return person % 7 != 6
+
+    def orcid_affiliations(self, person):
+        """The organization of a person, which also determines their other organizations, and their number of works."""
+        rng = random.Random(self.seed * 7_000_001 + person)
+        organization = rng.randrange(self.n_organizations)
+        return organization, rng.randint(0, 4)
+
+    def orcid_record(self, person):
+        """The JSON-LD record of a person."""
+        orcid = self.orcid(person)
+        organization, n_works = self.orcid_affiliations(person)
+        return {
+            "@context": "http://schema.org",
+            "@id": f"https://orcid.org/{orcid}",
+            "@type": "Person",
+            "mainEntityOfPage": f"https://orcid.org/{orcid}",
+            "givenName": f"Given{person}",
+            "familyName": f"Family{person}",
+            "affiliation": [
+                {"@type": "Organization", "@id": f"https://ror.org/{self.ror_id(organization)}",
+                 "name": f"Organization {organization}"},
+                {"@type": "Organization", "name": f"Organization {(organization + 1) % self.n_organizations}",
+                 "identifier": {"@type": "PropertyValue", "propertyID": "RINGGOLD",
+                                "value": str(10000 + (organization + 1) % self.n_organizations)}},
+            ],
+            "alumniOf": {"@type": "Organization", "name": f"Organization {(organization + 2) % self.n_organizations}",
+                         "@id": f"https://www.grid.ac/institutes/grid.{(organization + 2) % self.n_organizations}.1"},
+            "identifier": {"@type": "PropertyValue", "propertyID": "Scopus Author ID", "value": str(person)},
+            "@reverse": {"creator": [{
+                "@type": "CreativeWork",
+                "@id": f"https://doi.org/10.5555/{person}.{work}",
+                "name": f"Work {work} of person {person}",
+                "identifier": {"@type": "PropertyValue", "propertyID": "doi", "value": f"10.5555/{person}.{work}"},
+            } for work in range(n_works)]},
+        }
+
+    def orcid_person_section(self, person):
+        """The /person section of the record, with the same data as `orcid_record`."""
+        return {
+            "name": {"given-names": {"value": f"Given{person}"}, "family-name": {"value": f"Family{person}"}},
+            "external-identifiers": {"external-identifier": [
+                {"external-id-type": "Scopus Author ID", "external-id-value": str(person)}]},
+        }
+
+    def orcid_activities(self, person):
+        """The /activities section of the record, with the same data as `orcid_record`."""
+        organization, n_works = self.orcid_affiliations(person)
+
+        def affiliation_group(summary_key, name, source, identifier):
+            return {"summaries": [{summary_key: {"organization": {
+                "name": f"Organization {name}",
+                "disambiguated-organization": {"disambiguation-source": source,
+                                               "disambiguated-organization-identifier": identifier}}}}]}
+
+        ringgold = (organization + 1) % self.n_organizations
+        grid = (organization + 2) % self.n_organizations
+        return {
+            "employments": {"affiliation-group": [
+                affiliation_group("employment-summary", organization, "ROR", f"https://ror.org/{self.ror_id(organization)}"),
+                affiliation_group("employment-summary", ringgold, "RINGGOLD", str(10000 + ringgold)),
+            ]},
+            "educations": {"affiliation-group": [
+                affiliation_group("education-summary", grid, "GRID", f"grid.{grid}.1"),
+            ]},
+            "works": {"group": [{"work-summary": [{
+                "title": {"title": {"value": f"Work {work} of person {person}"}},
+                "external-ids": {"external-id": [{"external-id-type": "doi",
+                                                  "external-id-value": f"10.5555/{person}.{work}"}]},
+            }]} for work in range(n_works)]},
+        }
+
+    def orcid_expanded_search(self, query):
+        """Expanded search results of the persons named in the (given-names AND family-name) clauses of the query."""
+        persons = sorted({int(person) for person in re.findall(r'family-name:"?Family(\d+)', query.get("q", ""))})
+        results = [{
+            "orcid-id": self.orcid(person),
+            "given-names": f"Given{person}",
+            "family-names": f"Family{person}",
+            "credit-name": None,
+            "other-name": [],
+        } for person in persons if self.has_orcid(person)]
+        rows = int(query.get("rows", 1000))
+        return {"expanded-result": results[:rows] or None, "num-found": len(results)}
+
+    def ror(self, path, query):
+        if path.rstrip("/") == "/organizations":
+            organization = int(re.search(r"grid\.(\d+)", query.get("query", "")).group(1))
+            if organization % 8 == 0:
+                return {"number_of_results": 0, "items": []}, {}
+            return {"number_of_results": 1, "items": [{"id": f"https://ror.org/{self.ror_id(organization)}"}]}, {}
+        ror_id = path.rstrip("/").split("/")[-1]
+        organization = int(ror_id[1:7]) if ror_id.endswith("bm") else 0
+        return {
+            "id": f"https://ror.org/{ror_id}",
+            "name": f"Organization {organization}",
+            "aliases": [f"Org {organization}"],
+            "links": [f"https://organization{organization}.example.org"],
+            "addresses": [{"city": "Karlsruhe", "state": None, "country": None}],
+            "external_ids": {"GRID": {"preferred": f"grid.{organization}.1", "all": f"grid.{organization}.1"}},
+        }, {}
+
+    def wikidata(self, query):
+        sparql = query.get("query", "")
+        scheme = re.search(r"VALUES \?(\w+)", sparql).group(1)
+        bindings = []
+        for value in re.findall(r'"([^"]+)"', sparql):
+            organization = int(value.split(".")[1]) if scheme == "grid" else int(value) - 10000
+            if organization % 4 != 3:  # Some identifiers are unknown to Wikidata
+                bindings.append({scheme: {"value": value}, "ror_id": {"value": self.ror_id(organization)}})
+        return {"results": {"bindings": bindings}}, {}
+
+
+class CassetteAPIs:
+    """
+    Replays the API responses recorded in a `cache.ResponseCache` file, e.g. the http_cache.sqlite
+    of a previous build. Requests without a recorded response are answered with 404.
+    """
+
+    def __init__(self, cache_path):
+        import sqlite3
+        connection = sqlite3.connect(f"file:{cache_path}?mode=ro", uri=True)
+        self.responses = {}
+        for key, body, headers in connection.execute("SELECT key, body, headers FROM responses"):
+            url = key.rsplit(" [", 1)[0]
+            self.responses[canonical_url(url)] = (body, json.loads(headers))
+        connection.close()
+
+    def respond(self, api, path, query, base_urls):
+        url = f"https://{API_HOSTS[api]}{API_PATHS[api]}{path}"
+        if query:
+            url += "?" + urlencode(query)
+        recorded = self.responses.get(canonical_url(url))
+        if recorded is None:
+            return None, {}
+        body, headers = recorded
+        # Point the URLs in the recorded responses (e.g. repos_url, Link headers) to the local servers
+        for name, base_url in base_urls.items():
+            real_url = f"https://{API_HOSTS[name]}{API_PATHS[name]}"
+            body = body.replace(real_url, base_url)
+            headers = {key: value.replace(real_url, base_url) for key, value in headers.items()}
+        return json.loads(body), headers
+
+
+def canonical_url(url):
+    """URL with a sorted, unquoted query, to match requests independent of their encoding."""
+    parsed = urlparse(url)
+    query = sorted(parse_qsl(parsed.query, keep_blank_values=True))
+    return f"{parsed.netloc}{unquote(parsed.path)}?{query}"
+
+
+def paginate(items, query, url):
+    per_page = int(query.get("per_page", 30))
+    page = int(query.get("page", 1))
+    headers = {}
+    if page * per_page < len(items):
+        headers["Link"] = f'<{url}?per_page={per_page}&page={page + 1}>; rel="next"'
+    return items[(page - 1) * per_page:page * per_page], headers
+
+
+class ReplayServer:
+    """
+    Local HTTP stand-in for one API, answering with `apis.respond(...)`.
+
+    Args:
+        api (str): "github", "orcid", "ror" or "wikidata".
+        apis (SyntheticAPIs or CassetteAPIs): The source of the responses.
+        latency (float): Seconds every response is delayed by.
+        rate_limit (tuple): Optional (requests per second, burst). Requests beyond it are answered
+                            with 429 and a Retry-After header, like the real APIs do.
+    """
+
+    def __init__(self, api, apis, latency=0.0, rate_limit=None):
+        self.api = api
+        self.apis = apis
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.base_urls = {}
+        self.requests = 0
+        self.rejected = 0
+        self._tokens = rate_limit[1] if rate_limit else 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}{API_PATHS[api]}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _allow(self):
+        with self._lock:
+            self.requests += 1
+            if not self.rate_limit:
+                return True
+            rate, burst = self.rate_limit
+            now = time.monotonic()
+            self._tokens = min(burst, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.rejected += 1
+            return False
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # Headers and body are written separately
+
+            def do_GET(self):
+                if not server._allow():
+                    return self.send_json(429, {"message": "rate limit exceeded"}, {"Retry-After": "1"})
+                if server.latency:
+                    time.sleep(server.latency)
+                parsed = urlparse(self.path)
+                path = parsed.path[len(API_PATHS[server.api]):]
+                query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+                body, headers = server.apis.respond(server.api, path, query, server.base_urls)
+                if body is None:
+                    return self.send_json(404, {"message": "Not Found"}, {})
+                self.send_json(200, body, headers)
+
+            def send_json(self, status, body, headers):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def start_servers(apis, latency=0.0, rate_limited=False):
+    """Starts one `ReplayServer` per API, so every API has its own host (and rate limits) for the clients."""
+    servers = {}
+    for api, host in API_HOSTS.items():
+        rate_limit = DEFAULT_RATE_LIMITS[host] if rate_limited else None
+        servers[api] = ReplayServer(api, apis, latency, rate_limit)
+    base_urls = {api: server.url for api, server in servers.items()}
+    for server in servers.values():
+        server.base_urls = base_urls
+        server.start()
+    return servers
+
+
+def run_build(config):
+    """Runs one build as configured by `benchmark_build` (in the benchmark's child process)."""
+    import utils
+    from instrumentation import Instrumentation
+    from scheduler import RequestScheduler
+    from sessions import SessionPool
+
+    os.chdir(config["workdir"])
+
+    # Give the local stand-ins the limits of the APIs they replace
+    hosts = {api: urlparse(url).netloc for api, url in config["api_urls"].items()}
+    utils.set_api_urls(config["api_urls"])
+    utils.set_api_concurrency({hosts[api]: utils.API_CONCURRENCY[host] for api, host in API_HOSTS.items()})
+    utils.set_session_pool(SessionPool(pool_sizes={hosts[api]: max(4, config["max_workers"])
+                                                   for api in API_HOSTS}))
+    rate_limits = {hosts[api]: DEFAULT_RATE_LIMITS[host] for api, host in API_HOSTS.items()} \
+        if config["rate_limited"] else {hosts[api]: (1e9, 1e9) for api in API_HOSTS}
+    utils.set_request_scheduler(RequestScheduler(rate_limits=rate_limits))
+
+    instrumentation = Instrumentation()
+    start = time.perf_counter()
+    graph = utils.build_graph_from_github_org(config["org"], config["ror_id"], "token", "token",
+                                              max_workers=config["max_workers"],
+                                              instrumentation=instrumentation)
+    wall_seconds = time.perf_counter() - start
+    report = instrumentation.report()
+    return {
+        "wall_seconds": wall_seconds,
+        "requests": sum(host["attempts"] for host in report["hosts"].values()),
+        "retries": sum(host["retries"] for host in report["hosts"].values()),
+        "triples": len(graph),
+        "triples_per_second": len(graph) / wall_seconds,
+        "peak_memory_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "stages": {name: round(stage["seconds"], 3) for name, stage in report["stages"].items()},
+    }
+
+
+def benchmark_build(apis, org="benchmark-org", ror_id="0000000bm", latency=0.0, rate_limited=False, max_workers=1):
+    """Builds the graph of `org` against local replay servers in a child process and returns its measurements."""
+    servers = start_servers(apis, latency, rate_limited)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            config = {"api_urls": {api: server.url for api, server in servers.items()}, "org": org,
+                      "ror_id": ror_id, "max_workers": max_workers, "rate_limited": rate_limited,
+                      "workdir": workdir}
+            child = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", json.dumps(config)],
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True)
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        result["served_requests"] = sum(server.requests for server in servers.values())
+        result["rejected_requests"] = sum(server.rejected for server in servers.values())
+        return result
+    finally:
+        for server in servers.values():
+            server.stop()
+
+
+def benchmark_load_save(graph_file="graph.ttl"):
+    """Times parsing and serializing `graph_file` as Turtle and N-Triples and as a binary snapshot."""
+    from rdflib import Graph
+    from snapshot import load_snapshot, save_snapshot
+
+    results = {}
+
+    def timed(name, function):
+        start = time.perf_counter()
+        value = function()
+        results[name] = time.perf_counter() - start
+        return value
+
+    graph = timed("parse_turtle", lambda: Graph().parse(graph_file))
+    results["triples"] = len(graph)
+    with tempfile.TemporaryDirectory() as directory:
+        timed("serialize_turtle", lambda: graph.serialize(os.path.join(directory, "graph.ttl")))
+        timed("serialize_ntriples", lambda: graph.serialize(os.path.join(directory, "graph.nt"), format="nt"))
+        timed("parse_ntriples", lambda: Graph().parse(os.path.join(directory, "graph.nt"), format="nt"))
+        timed("save_snapshot", lambda: save_snapshot(graph, os.path.join(directory, "graph.snap")))
+        timed("load_snapshot", lambda: load_snapshot(os.path.join(directory, "graph.snap")))
+    return results
+
+
+def benchmark_visualize(graph_file="graph.ttl"):
+    """Times `visualize_graph` on the notebook's example queries and `visualize_large_graph` on the whole graph."""
+    from rdflib import Graph
+    from visualizer import visualize_graph, visualize_large_graph
+
+    graph = Graph().parse(graph_file)
+    contributors_query = """
+        PREFIX schema: <http://schema.org/>
+        SELECT ?subject ?predicate ?object
+        WHERE {
+          ?subject a schema:SoftwareSourceCode .
+          ?subject ?predicate ?object .
+          FILTER (?predicate = schema:contributor)
+        }
+    """
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)  # The visualizations are written to the working directory
+        try:
+            for name, function in [
+                ("visualize_query", lambda: visualize_graph(graph, sparql_query=contributors_query)),
+                ("visualize_query_again", lambda: visualize_graph(graph, sparql_query=contributors_query)),
+                ("visualize_large_graph", lambda: visualize_large_graph(graph)),
+            ]:
+                start = time.perf_counter()
+                function()
+                results[name] = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks of graph building, loading and visualization.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 3000],
+                        help="Numbers of repositories of the synthetic organizations.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Response delay of the local servers in seconds.")
+    parser.add_argument("--rate-limited", action="store_true",
+                        help="Enforce (and pace for) the rate limits of the real APIs.")
+    parser.add_argument("--workers", type=int, default=1, help="max_workers of the builds.")
+    parser.add_argument("--cassette", help="Replay the responses recorded in this ResponseCache file instead.")
+    parser.add_argument("--org", default="benchmark-org", help="GitHub organization of the cassette build.")
+    parser.add_argument("--ror-id", default="0000000bm", help="ROR ID of the cassette build.")
+    parser.add_argument("--graph", default="graph.ttl", help="Graph file for the load/save and visualization benchmarks.")
+    parser.add_argument("--skip-build", action="store_true", help="Only run the load/save and visualization benchmarks.")
+    parser.add_argument("--report", default="benchmark_report.json", help="JSON file the results are written to.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_build(json.loads(args.child))))
+        return
+
+    report = {"config": vars(args), "builds": {}}
+    if not args.skip_build:
+        if args.cassette:
+            cases = {f"cassette {args.org}": (CassetteAPIs(args.cassette), args.org, args.ror_id)}
+        else:
+            cases = {f"{size} repos": (SyntheticAPIs(size), "benchmark-org", "0000000bm") for size in args.sizes}
+        for name, (apis, org, ror_id) in cases.items():
+            result = benchmark_build(apis, org, ror_id, args.latency, args.rate_limited, args.workers)
+            report["builds"][name] = result
+            print(f"build {name}: {result['wall_seconds']:.2f}s, {result['requests']} requests "
+                  f"({result['retries']} retries), {result['triples']} triples "
+                  f"({result['triples_per_second']:.0f}/s), peak memory {result['peak_memory_mb']:.0f} MB")
+
+    if os.path.exists(args.graph):
+        report["load_save"] = benchmark_load_save(args.graph)
+        report["visualize"] = benchmark_visualize(args.graph)
+        for section in ("load_save", "visualize"):
+            print(", ".join(f"{name} {value:.3f}s" if isinstance(value, float) else f"{name} {value}"
+                            for name, value in report[section].items()))
+
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"Saved the results to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode, urlparse
+
+# Default time to live of cached responses in seconds, per API host
+DEFAULT_TTL = {
+    "api.github.com": 24 * 3600,
+    "pub.orcid.org": 7 * 24 * 3600,
+    "api.ror.org": 30 * 24 * 3600,
+    "query.wikidata.org": 30 * 24 * 3600,
+}
+
+# Response headers that are stored next to the cached body
+CACHED_HEADERS = ("ETag", "Last-Modified", "Link")
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache for the JSON responses fetched by `utils.fetch`.
+
+    Args:
+        path (str): Path of the SQLite database file.
+        ttl (dict): Time to live in seconds per API host, overriding `DEFAULT_TTL`.
+        default_ttl (int): Time to live in seconds for hosts without an entry in `ttl`.
+        max_bytes (int): Maximum total size of the cached bodies. The least recently used
+                         responses are evicted once the cache grows beyond it.
+        offline (bool): If True, responses are only served from the cache (fresh or stale)
+                        and no request is sent.
+
+    Notes:
+        - Stale responses with an ETag or Last-Modified header are revalidated with
+          If-None-Match / If-Modified-Since. A 304 answer refreshes the cached response,
+          and GitHub does not count it against the rate limit.
+        - The Authorization header is not part of the cache key, so cached responses are
+          shared between tokens.
+    """
+
+    def __init__(self, path="http_cache.sqlite", ttl=None, default_ttl=24 * 3600,
+                 max_bytes=512 * 1024 * 1024, offline=False):
+        self.path = path
+        self.ttl = dict(DEFAULT_TTL, **(ttl or {}))
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                host TEXT NOT NULL,
+                body TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._connection.commit()
+        self._size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def key(url, headers, params=None):
+        """Builds the cache key from the URL, the query parameters and the Accept header."""
+        key = url
+        if params:
+            key += ("&" if "?" in url else "?") + urlencode(sorted(params.items()))
+        accept = (headers or {}).get("Accept")
+        if accept:
+            key += f" [{accept}]"
+        return key
+
+    def get(self, key):
+        """
+        Returns the cached entry for `key` as a dict with the keys 'data', 'headers',
+        'host' and 'fetched_at', or None if the response is not cached.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT host, body, headers, fetched_at FROM responses WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._connection.commit()
+        host, body, headers, fetched_at = row
+        return {"data": json.loads(body), "headers": json.loads(headers),
+                "host": host, "fetched_at": fetched_at}
+
+    def is_fresh(self, entry):
+        ttl = self.ttl.get(entry["host"], self.default_ttl)
+        return time.time() - entry["fetched_at"] < ttl
+
+    def revalidation_headers(self, entry):
+        """Returns the conditional request headers to revalidate a stale entry."""
+        headers = {}
+        if "ETag" in entry["headers"]:
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if "Last-Modified" in entry["headers"]:
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def put(self, key, url, body, headers):
+        """Stores the response `body` (JSON text) and the relevant response `headers`."""
+        stored_headers = {name: headers[name] for name in CACHED_HEADERS if name in headers}
+        size = len(body)
+        now = time.time()
+        with self._lock:
+            previous = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if previous:
+                self._size -= previous[0]
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, urlparse(url).netloc, body, json.dumps(stored_headers), size, now, now))
+            self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+            self._connection.commit()
+
+    def touch(self, key):
+        """Marks a revalidated entry as fresh again."""
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self._connection.commit()
+
+    def _evict(self):
+        # Drop the least recently used responses until the cache fits into max_bytes again
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at")
+        evicted = []
+        for key, size in rows:
+            if self._size <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._size -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+            self._size = 0
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,82 @@
+import json
+import os
+
+from snapshot import load_snapshot, save_snapshot
+
+
+class BuildCheckpoint:
+    """
+    Periodic, crash-safe checkpoints of a graph build: a binary snapshot of the graph
+    (see `snapshot.py`) plus a JSON journal of the completed repositories and resolved contributors.
+
+    Args:
+        directory (str): Directory of the checkpoint files. It is created if it does not exist yet.
+        every (int): Number of completed repositories between two checkpoints.
+
+    Notes:
+        - Every checkpoint writes a new snapshot file first and then atomically replaces the journal,
+          which names the snapshot it belongs to. An interrupted write therefore always leaves the
+          previous, consistent checkpoint behind.
+    """
+
+    def __init__(self, directory, every=10):
+        self.directory = directory
+        self.every = every
+        self.journal_file = os.path.join(directory, "journal.json")
+        self._pending = 0
+        self._sequence = 0
+
+    def load(self, graph):
+        """
+        Loads the last checkpoint into `graph`.
+
+        Returns:
+            dict: The journal of the checkpoint, or None if there is no checkpoint or its journal
+                  cannot be read (e.g. a journal truncated by a full disk). The build then starts over.
+        """
+        if not os.path.exists(self.journal_file):
+            return None
+        with open(self.journal_file, encoding="utf-8") as f:
+            try:
+                journal = json.load(f)
+            except ValueError:
+                return None
+        load_snapshot(os.path.join(self.directory, journal["snapshot"]), graph)
+        self._sequence = journal["sequence"]
+        return journal
+
+    def save(self, graph, journal, force=False):
+        """Counts a completed repository and writes a checkpoint every `every` repositories (or if `force`)."""
+        self._pending += 1
+        if self._pending < self.every and not force:
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        previous = self._snapshot_name(self._sequence)
+        self._sequence += 1
+        snapshot = self._snapshot_name(self._sequence)
+        save_snapshot(graph, os.path.join(self.directory, snapshot))
+
+        tmp_file = f"{self.journal_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(dict(journal, snapshot=snapshot, sequence=self._sequence), f, indent=1)
+        os.replace(tmp_file, self.journal_file)
+
+        if os.path.exists(os.path.join(self.directory, previous)):
+            os.remove(os.path.join(self.directory, previous))
+        self._pending = 0
+        return True
+
+    def clear(self):
+        """Removes the checkpoint files, e.g. after the build completed."""
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.startswith("graph.") and name.endswith(".snap"):
+                    os.remove(os.path.join(self.directory, name))
+        self._pending = 0
+
+    @staticmethod
+    def _snapshot_name(sequence):
+        return f"graph.{sequence}.snap"
@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlparse
+
+# Upper bounds (in milliseconds) of the request latency histogram buckets
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+
+class Instrumentation:
+    """
+    Collects timings and counters of a graph build: time spent per build stage, triples added
+    per stage, and per API host the request, cache hit, retry and error counts together with
+    latency histograms. Pass it to `build_graph_from_github_org(instrumentation=...)` and save
+    the results with `save_report` and `save_chrome_trace`.
+
+    Args:
+        trace (bool): If True, every stage and request is also kept as an event for `save_chrome_trace`.
+
+    Notes:
+        - Stage times are summed over all threads, so stages that run in the worker threads
+          (e.g. "process_repo") can add up to more than the wall time of the build.
+        - A request counts all attempts of `utils.fetch` (including pacing and retries), an attempt
+          is a single HTTP request. Retries are the attempts beyond the first.
+    """
+
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.hosts = {}
+        self.counters = {}
+        self.events = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, graph=None):
+        """Times the enclosed block as stage `name`, and counts the triples it added to `graph`."""
+        size = len(graph) if graph is not None else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            triples = len(graph) - size if graph is not None else 0
+            with self._lock:
+                stage = self.stages.setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "triples": 0})
+                stage["count"] += 1
+                stage["seconds"] += end - start
+                stage["max_seconds"] = max(stage["max_seconds"], end - start)
+                stage["triples"] += triples
+                if self.trace:
+                    self.events.append(("stage", name, start, end, threading.get_ident()))
+
+    def record_request(self, url, seconds, outcome):
+        """Records a request of `utils.fetch`. `outcome` is "fetched", "cache_hit", "revalidated" or "failed"."""
+        host = urlparse(url).netloc
+        with self._lock:
+            stats = self._host(host)
+            stats["requests"] += 1
+            stats[outcome] = stats.get(outcome, 0) + 1
+            if self.trace:
+                end = time.perf_counter()
+                self.events.append(("request", f"{host} ({outcome})", end - seconds, end, threading.get_ident()))
+
+    def record_attempt(self, url, seconds, status):
+        """Records a single HTTP request. `status` is the status code, or None for connection errors."""
+        host = urlparse(url).netloc
+        with self._lock:
+            stats = self._host(host)
+            stats["attempts"] += 1
+            stats["histogram"][bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            if status is None or status >= 400:
+                stats["errors"] += 1
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _host(self, host):
+        if host not in self.hosts:
+            self.hosts[host] = {"requests": 0, "attempts": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                "histogram": [0] * len(LATENCY_BUCKETS_MS)}
+        return self.hosts[host]
+
+    def report(self):
+        """Returns the collected timings and counters as a JSON-serializable dict."""
+        with self._lock:
+            hosts = {}
+            for host, stats in self.hosts.items():
+                network = stats.get("fetched", 0) + stats.get("revalidated", 0) + stats.get("failed", 0)
+                hosts[host] = {
+                    **{key: value for key, value in stats.items() if key != "histogram"},
+                    "retries": max(0, stats["attempts"] - network),
+                    "mean_latency_seconds": stats["seconds"] / stats["attempts"] if stats["attempts"] else None,
+                    "p50_latency_ms": percentile_from_histogram(stats["histogram"], 0.5),
+                    "p95_latency_ms": percentile_from_histogram(stats["histogram"], 0.95),
+                    "latency_histogram_ms": {
+                        f"<={bound:g}": count for bound, count in zip(LATENCY_BUCKETS_MS, stats["histogram"])},
+                }
+            return {
+                "wall_seconds": time.perf_counter() - self.started,
+                "stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "hosts": hosts,
+                "counters": dict(self.counters),
+            }
+
+    def save_report(self, path="run_report.json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=1)
+
+    def save_chrome_trace(self, path="run_trace.json"):
+        """Saves the stage and request events in the Chrome trace format (chrome://tracing, Perfetto)."""
+        with self._lock:
+            events = list(self.events)
+        trace_events = [{
+            "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": thread,
+            "ts": round((start - self.started) * 1e6), "dur": round((end - start) * 1e6),
+        } for category, name, start, end, thread in events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+
+class NoInstrumentation:
+    """Stand-in used while no `Instrumentation` is active. All methods do nothing."""
+
+    _null_stage = nullcontext()
+
+    def stage(self, name, graph=None):
+        return self._null_stage
+
+    def record_request(self, url, seconds, outcome):
+        pass
+
+    def record_attempt(self, url, seconds, status):
+        pass
+
+    def count(self, name, value=1):
+        pass
+
+
+def percentile_from_histogram(histogram, fraction):
+    """Returns the upper bound (in milliseconds) of the bucket containing the given percentile."""
+    total = sum(histogram)
+    if not total:
+        return None
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS_MS, histogram):
+        seen += count
+        if seen >= fraction * total:
+            return bound if bound != float("inf") else None
+    return None
@@ -1,3 +1,4 @@
+from cache import ResponseCache
 from utils import build_graph_from_github_org
 from visualizer import visualize_graph
 
@@ -9,9 +10,12 @@ orcid_token = "your-orcid-token"
 github_org_name = "Materials-Data-Science-and-Informatics"
 corresponding_ror_id = "02nv7yv05"
 
+# Persistent cache of API responses, set offline=True to build only from cached responses
+cache = ResponseCache("http_cache.sqlite", offline=False)
+
 if __name__ == "__main__":
     # build graph
     graph = build_graph_from_github_org(github_org_name, corresponding_ror_id,
-                                        github_token, orcid_token)
+                                        github_token, orcid_token, cache=cache)
     # save graph
     graph.serialize(destination="graph.ttl")
\ No newline at end of file
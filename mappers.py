@@ -1,3 +1,9 @@
+import json
+import os
+from functools import lru_cache
+
+from rdflib import BNode, Graph, Literal, RDF, URIRef, XSD
+
 
 def ror_org_to_schema_org(ror_data):
     schema_org_organization = {
@@ -58,3 +64,239 @@ def github_repo_to_SoftwareSourceCode(github_repo):
     }
     return source_code
 
+
+def orcid_sections_to_schema_org(orcid, person, employments, educations, works=None):
+    """
+    Builds a schema.org Person from the ORCID v3.0 section records (/person and the employments,
+    educations and optionally works of /activities) in the shape of the ORCID JSON-LD record: employments
+    become `affiliation`, educations `alumniOf` and the works are added as lightweight
+    CreativeWork summaries (title, identifiers and links).
+    """
+    person = person or {}
+    name = person.get("name") or {}
+    schema_org_person = {
+        "@context": "http://schema.org",
+        "@type": "Person",
+        "@id": f"https://orcid.org/{orcid}",
+        "mainEntityOfPage": f"https://orcid.org/{orcid}",
+        "givenName": orcid_value(name.get("given-names")),
+        "familyName": orcid_value(name.get("family-name")),
+        "alternateName": [other_name["content"] for other_name in
+                          (person.get("other-names") or {}).get("other-name", []) if other_name.get("content")],
+        "address": [{"@type": "PostalAddress", "addressCountry": orcid_value(address.get("country"))}
+                    for address in (person.get("addresses") or {}).get("address", [])],
+        "url": [orcid_value(researcher_url.get("url")) for researcher_url in
+                (person.get("researcher-urls") or {}).get("researcher-url", []) if orcid_value(researcher_url.get("url"))],
+        "identifier": [{
+            "@type": "PropertyValue",
+            "propertyID": external_id.get("external-id-type"),
+            "value": external_id.get("external-id-value"),
+        } for external_id in (person.get("external-identifiers") or {}).get("external-identifier", [])],
+        "affiliation": [orcid_organization_to_schema_org(summary["organization"])
+                        for summary in orcid_affiliation_summaries(employments, "employment-summary")],
+        "alumniOf": [orcid_organization_to_schema_org(summary["organization"])
+                     for summary in orcid_affiliation_summaries(educations, "education-summary")],
+    }
+    if works is not None:
+        schema_org_person["@reverse"] = {"creator": [
+            orcid_work_summary_to_schema_org(group["work-summary"][0])
+            for group in works.get("group", []) if group.get("work-summary")]}
+
+    # Leave out empty properties like the ORCID JSON-LD record does
+    return {key: value for key, value in schema_org_person.items() if value not in (None, [])}
+
+def orcid_value(field):
+    return field.get("value") if isinstance(field, dict) else None
+
+def orcid_affiliation_summaries(section, summary_key):
+    if not section:
+        return []
+    return [summary[summary_key] for group in section.get("affiliation-group", [])
+            for summary in group.get("summaries", []) if summary.get(summary_key, {}).get("organization")]
+
+def orcid_organization_to_schema_org(organization):
+    schema_org_organization = {"@type": "Organization", "name": organization.get("name")}
+    disambiguated = organization.get("disambiguated-organization") or {}
+    source = disambiguated.get("disambiguation-source")
+    value = disambiguated.get("disambiguated-organization-identifier")
+    if source == "ROR" and value:
+        schema_org_organization["@id"] = value if value.startswith("http") else f"https://ror.org/{value}"
+    elif source == "GRID" and value:
+        schema_org_organization["@id"] = f"https://www.grid.ac/institutes/{value}"
+    elif source and value:
+        schema_org_organization["identifier"] = {"@type": "PropertyValue", "propertyID": source, "value": value}
+    return schema_org_organization
+
+def orcid_work_summary_to_schema_org(summary):
+    external_ids = (summary.get("external-ids") or {}).get("external-id", [])
+    work = {
+        "@type": "CreativeWork",
+        "name": orcid_value((summary.get("title") or {}).get("title")),
+        "identifier": [{
+            "@type": "PropertyValue",
+            "propertyID": external_id.get("external-id-type"),
+            "value": external_id.get("external-id-value"),
+        } for external_id in external_ids],
+        "sameAs": [orcid_value(external_id.get("external-id-url")) for external_id in external_ids
+                   if orcid_value(external_id.get("external-id-url"))],
+    }
+    doi = next((external_id.get("external-id-value") for external_id in external_ids
+                if external_id.get("external-id-type") == "doi"), None)
+    if doi:
+        work["@id"] = f"https://doi.org/{doi}"
+    return {key: value for key, value in work.items() if value not in (None, [])}
+
+
+
+# Direct triple emission for the schema.org documents built from ROR, ORCID and GitHub data.
+# Parsing them with graph.parse(format="json-ld") runs the full JSON-LD expansion for every
+# document; emitting the triples directly is much faster and produces an isomorphic graph.
+
+SCHEMA_ORG = "http://schema.org/"
+SCHEMA_ORG_CONTEXTS = {"http://schema.org", "https://schema.org", "http://schema.org/", "https://schema.org/"}
+
+# The schema.org JSON-LD context, shipped with the repository so that documents are processed the
+# same way with and without network access. It holds the terms of the documents we build, with the
+# type coercions of the official context (https://schema.org/docs/jsonldcontext.jsonld); other
+# terms are expanded with its @vocab.
+SCHEMA_ORG_CONTEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema_org_context.jsonld")
+
+
+@lru_cache(maxsize=None)
+def load_schema_org_context(path=SCHEMA_ORG_CONTEXT_FILE):
+    """Returns the schema.org JSON-LD context from the copy at `path` (by default the one next to this module)."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=1)
+def get_schema_org_terms():
+    """
+    Returns the term definitions of the schema.org context as a dict of
+    term -> (property IRI, type coercion), where the coercion is "@id", "@vocab",
+    a datatype IRI or None.
+    """
+    context = load_schema_org_context()["@context"]
+    prefixes = {term: value for term, value in context.items()
+                if isinstance(value, str) and value.endswith(("/", "#"))}
+
+    def expand(value):
+        prefix, _, suffix = value.partition(":")
+        if prefix in prefixes:
+            return prefixes[prefix] + suffix
+        return value if ":" in value else SCHEMA_ORG + value
+
+    terms = {}
+    for term, definition in context.items():
+        if term.startswith("@") or term in prefixes:
+            continue
+        if isinstance(definition, str):
+            terms[term] = (expand(definition), None)
+        elif isinstance(definition, dict):
+            coercion = definition.get("@type")
+            if coercion and not coercion.startswith("@"):
+                coercion = expand(coercion)
+            terms[term] = (expand(definition.get("@id", term)), coercion)
+    return terms
+
+
+def is_schema_org_document(document):
+    """Whether `document` only uses the plain schema.org context and can be emitted directly."""
+    return (isinstance(document, dict) and document.get("@context") in SCHEMA_ORG_CONTEXTS
+            and "@graph" not in document)
+
+
+def schema_org_to_triples(document):
+    """
+    Converts a compact schema.org JSON-LD document (like the ones returned by the mappers
+    and the ORCID API) directly into rdflib triples.
+
+    Returns:
+        list: The (subject, predicate, object) triples of the document.
+    """
+    terms = get_schema_org_terms()
+    triples = []
+    bnodes = {}
+
+    def to_iri(value):
+        if value.startswith("_:"):
+            return bnodes.setdefault(value, BNode())
+        return URIRef(value)
+
+    def term_iri(term):
+        if term in terms:
+            return URIRef(terms[term][0])
+        return URIRef(term if ":" in term else SCHEMA_ORG + term)
+
+    def add_node(node):
+        subject = to_iri(node["@id"]) if "@id" in node else BNode()
+        for key, values in node.items():
+            if key == "@type":
+                for node_type in values if isinstance(values, list) else [values]:
+                    triples.append((subject, RDF.type, term_iri(node_type)))
+            elif key == "@reverse":
+                for term, reverse_values in values.items():
+                    predicate = term_iri(term)
+                    for value in reverse_values if isinstance(reverse_values, list) else [reverse_values]:
+                        triples.append((add_node(value), predicate, subject))
+            elif not key.startswith("@"):
+                predicate = term_iri(key)
+                coercion = terms.get(key, (None, None))[1]
+                for value in values if isinstance(values, list) else [values]:
+                    obj = to_object(value, coercion)
+                    if obj is not None:
+                        triples.append((subject, predicate, obj))
+        return subject
+
+    def to_object(value, coercion):
+        if value is None:
+            return None
+        if isinstance(value, dict):
+            if "@value" in value:
+                if value["@value"] is None:
+                    return None
+                if "@language" in value:
+                    return Literal(value["@value"], lang=value["@language"])
+                if "@type" in value:
+                    return Literal(value["@value"], datatype=term_iri(value["@type"]))
+                return Literal(value["@value"])
+            return add_node(value)
+        if coercion == "@id" and isinstance(value, str):
+            return to_iri(value)
+        if coercion == "@vocab" and isinstance(value, str):
+            return term_iri(value)
+        if coercion:
+            return Literal(value, datatype=URIRef(coercion))
+        if isinstance(value, float):
+            return Literal(value, datatype=XSD.double)
+        return Literal(value)
+
+    add_node(document)
+    return triples
+
+
+def with_local_schema_org_context(document):
+    """Returns a copy of `document` that uses the local schema.org context instead of the URL."""
+    if isinstance(document, dict) and document.get("@context") in SCHEMA_ORG_CONTEXTS:
+        document = dict(document, **{"@context": load_schema_org_context()["@context"]})
+    return document
+
+
+def add_schema_org_document(graph, document):
+    """
+    Adds a schema.org JSON-LD document to `graph`. Documents using the plain schema.org context
+    are emitted directly as triples, others are parsed as JSON-LD with the local schema.org context.
+
+    Returns:
+        list: The triples of the document.
+    """
+    triples = get_schema_org_triples(document)
+    graph.addN((s, p, o, graph) for s, p, o in triples)
+    return triples
+
+
+def get_schema_org_triples(document):
+    """Returns the triples of a schema.org JSON-LD document, see `add_schema_org_document`."""
+    if is_schema_org_document(document):
+        return schema_org_to_triples(document)
+    return list(Graph().parse(data=with_local_schema_org_context(document), format="json-ld"))
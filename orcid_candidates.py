@@ -0,0 +1,187 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# Confidence of a search result, depending on how it matches the searched name
+EXACT_MATCH = 1.0          # Same given and family names
+SWAPPED_MATCH = 0.9        # Given and family names swapped (e.g. "Hofmann Volker")
+OTHER_NAME_MATCH = 0.8     # Matches the credit name or one of the other names of the record
+PARTIAL_MATCH = 0.6        # Same family name, the searched given names are part of the record's
+INITIALS_MATCH = 0.4       # Same family name and first initial
+
+
+def fold_name(name):
+    """Lowercase name tokens without accents and punctuation, e.g. "Müller-Lüdenscheidt, Jörg" -> ["jorg", "muller", "ludenscheidt"]."""
+    if not name:
+        return []
+    if name.count(",") == 1:  # "Family, Given"
+        family, given = name.split(",")
+        name = f"{given} {family}"
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    return re.sub(r"[^\w\s]", " ", name.casefold()).split()
+
+
+def name_key(name):
+    """Normalized key of a name that does not depend on the order of the given and family names."""
+    return " ".join(sorted(fold_name(name)))
+
+
+def split_name(name):
+    """Splits a name into given names and family name (the last token) like the ORCID search expects them."""
+    if name.count(",") == 1:
+        family, given = name.split(",")
+        return given.strip(), family.strip()
+    tokens = name.split()
+    return " ".join(tokens[:-1]), tokens[-1] if tokens else ""
+
+
+def match_confidence(name, result):
+    """
+    Confidence that an ORCID `expanded-search` result is the person called `name`, or 0.
+
+    Args:
+        name (str): The searched name, e.g. the name of a GitHub user.
+        result (dict): An item of the "expanded-result" list of the search response.
+    """
+    given, family = split_name(name)
+    given, family = fold_name(given), fold_name(family)
+    result_given = fold_name(result.get("given-names"))
+    result_family = fold_name(result.get("family-names"))
+    if not family or not result_family:
+        return 0.0
+    if given + family == result_given + result_family:  # Also for family names split differently ("van der Berg")
+        return EXACT_MATCH
+    if sorted(given + family) == sorted(result_given + result_family):
+        return SWAPPED_MATCH
+    other_names = [result.get("credit-name"), *(result.get("other-name") or [])]
+    if any(name_key(other_name) == name_key(name) for other_name in other_names if other_name):
+        return OTHER_NAME_MATCH
+    if family == result_family and given and result_given:
+        if set(given) <= set(result_given):
+            return PARTIAL_MATCH
+        if given[0][0] == result_given[0][0]:
+            return INITIALS_MATCH
+    return 0.0
+
+
+class OrcidCandidateStore:
+    """
+    Persistent store of ORCID search results per normalized name and of the ORCID IDs resolved
+    for GitHub logins, used by `utils.orcid_lookup` and `utils.lookup_contributor_orcid` to
+    answer repeated lookups without requests.
+
+    Args:
+        path (str): Path of the SQLite database file.
+        max_age (int): Seconds after which searched names and automatically resolved logins are
+                       looked up again. Confirmed logins (see `confirm`) do not expire.
+        min_confidence (float): Candidates with a lower confidence (see `match_confidence`)
+                                are not used.
+
+    Notes:
+        - Names are keyed by `name_key`, so different spellings (accents, punctuation, the
+          order of given and family names) share their search results.
+        - Logins without (valid) name or without ORCID ID are stored too, with ORCID ID None.
+    """
+
+    def __init__(self, path="orcid_candidates.sqlite", max_age=30 * 24 * 3600, min_confidence=0.5):
+        self.path = path
+        self.max_age = max_age
+        self.min_confidence = min_confidence
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS names (
+                name_key TEXT PRIMARY KEY,
+                candidates TEXT NOT NULL,
+                searched_at REAL NOT NULL
+            )
+        """)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS logins (
+                login TEXT PRIMARY KEY,
+                name TEXT,
+                orcid TEXT,
+                confirmed INTEGER NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+        """)
+        self._connection.commit()
+
+    def candidates(self, name):
+        """
+        Returns the stored candidates for `name` as a list of dicts with the keys 'orcid',
+        'given_names', 'family_names' and 'confidence' (best first), or None if the name
+        was not searched yet or the search expired.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT candidates, searched_at FROM names WHERE name_key = ?", (name_key(name),)).fetchone()
+        if row is None or time.time() - row[1] > self.max_age:
+            return None
+        return json.loads(row[0])
+
+    def best_candidate(self, name):
+        """Returns the ORCID ID of the best candidate for `name` that is confident enough, or None."""
+        candidates = self.candidates(name) or []
+        candidates = [candidate for candidate in candidates if candidate["confidence"] >= self.min_confidence]
+        return candidates[0]["orcid"] if candidates else None
+
+    def add_search_results(self, name, results):
+        """Scores the `expanded-search` results for `name` and stores them as its candidates."""
+        candidates = []
+        for result in results:
+            confidence = match_confidence(name, result)
+            if confidence and result.get("orcid-id"):
+                candidates.append({"orcid": result["orcid-id"], "given_names": result.get("given-names"),
+                                   "family_names": result.get("family-names"), "confidence": confidence})
+        candidates.sort(key=lambda candidate: -candidate["confidence"])  # Stable, keeps the search order
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO names VALUES (?, ?, ?)",
+                                     (name_key(name), json.dumps(candidates), time.time()))
+            self._connection.commit()
+        return candidates
+
+    def login(self, login):
+        """
+        Returns the stored entry of a GitHub login as a dict with the keys 'name', 'orcid'
+        and 'confirmed', or None if it is unknown or expired.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT name, orcid, confirmed, resolved_at FROM logins WHERE login = ?", (login,)).fetchone()
+        if row is None or (not row[2] and time.time() - row[3] > self.max_age):
+            return None
+        return {"name": row[0], "orcid": row[1], "confirmed": bool(row[2])}
+
+    def add_login(self, login, name, orcid):
+        """Stores the ORCID ID (or None) resolved for a GitHub login, unless the login is confirmed."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO logins VALUES (?, ?, ?, 0, ?) ON CONFLICT (login) DO UPDATE SET "
+                "name = excluded.name, orcid = excluded.orcid, resolved_at = excluded.resolved_at "
+                "WHERE NOT confirmed",
+                (login, name, orcid, time.time()))
+            self._connection.commit()
+
+    def confirm(self, login, orcid, name=None):
+        """Confirms the ORCID ID of a GitHub login (or that it has none, with `orcid` None). It is always used from now on."""
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO logins VALUES (?, ?, ?, 1, ?)",
+                                     (login, name, orcid, time.time()))
+            self._connection.commit()
+
+    def clear(self, confirmed=False):
+        """Removes the searched names and resolved logins, and with `confirmed` also the confirmed logins."""
+        with self._lock:
+            self._connection.execute("DELETE FROM names")
+            self._connection.execute("DELETE FROM logins" if confirmed else "DELETE FROM logins WHERE NOT confirmed")
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
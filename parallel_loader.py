@@ -0,0 +1,139 @@
+import gzip
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from rdflib import BNode, Dataset, Graph
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser
+from rdflib.util import guess_format
+
+from snapshot import add_encoded_triples, encode_triples
+
+# N-Triples files larger than this are split into chunks that are parsed in parallel
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Formats whose files can contain several graphs, their triples are merged
+QUAD_FORMATS = {"nquads", "trig", "trix"}
+
+
+def load_graphs(paths, graph=None, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Loads one or more saved graphs (e.g. one Turtle file per organization) into one graph,
+    parsing them in a process pool.
+
+    Args:
+        paths (list or str): The files to load. The format is guessed from the file extension
+                             (.ttl, .nt, .nq, .jsonld, ...), files ending in .gz are decompressed.
+        graph (rdflib.Graph): Optional graph to add the triples to. A new graph is created by default.
+        max_workers (int): Number of parser processes, by default the number of CPUs.
+        chunk_size (int): Uncompressed N-Triples files are split into chunks of about this many bytes,
+                          so that a single large file is parsed by several processes as well.
+
+    Returns:
+        rdflib.Graph: The merged graph.
+
+    Notes:
+        - The processes send their triples back in the compact term/ID encoding of snapshot.py.
+          The terms of all files are merged into one term dictionary, so equal terms are only
+          kept once in memory.
+        - Blank nodes are scoped per file: a blank node label means the same node in all chunks
+          of a file, but different nodes in different files, like when parsing the files one by one.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    if graph is None:
+        graph = Graph()
+
+    tasks = []
+    for path in paths:
+        # Blank node identifiers of the file get a prefix that is unique in this process
+        bnode_prefix = f"{BNode()}_"
+        format = guess_format(path[:-3] if path.endswith(".gz") else path) or "turtle"
+        if format == "nt" and not path.endswith(".gz"):
+            tasks += [(path, format, start, end, bnode_prefix) for start, end in split_lines(path, chunk_size)]
+        else:
+            tasks.append((path, format, None, None, bnode_prefix))
+
+    terms_cache = {}
+    with ProcessPoolExecutor(max_workers=min(max_workers or os.cpu_count(), len(tasks)) or 1) as executor:
+        futures = {executor.submit(parse_part, *task[:4]): task for task in tasks}
+        # Merge the parts in the order they are finished, while the other processes keep parsing
+        for future in as_completed(futures):
+            fields, payload = future.result()
+            add_encoded_triples(graph, memoryview(payload), *fields, bnode_prefix=futures[future][4],
+                                terms_cache=terms_cache)
+    return graph
+
+
+def split_lines(path, chunk_size):
+    """Splits a file into (start, end) byte ranges of about `chunk_size` bytes that end at line breaks."""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()  # Move to the end of the line
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+class FileBNodeLabels(dict):
+    """Blank node labels of a N-Triples chunk. Labels are kept, so all chunks of a file agree on them."""
+
+    def get(self, label, default=None):
+        return label
+
+
+class TripleCollector:
+    """Parser sink that only collects the triples."""
+
+    def __init__(self):
+        self.triples = []
+
+    def triple(self, s, p, o):
+        self.triples.append((s, p, o))
+
+
+def parse_part(path, format, start=None, end=None):
+    """
+    Parses a file, or the byte range [start, end) of a N-Triples file (in a worker process).
+
+    Returns:
+        tuple: The header fields and payload of `snapshot.encode_triples`.
+    """
+    if start is not None:
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start).decode("utf-8")
+        collector = TripleCollector()
+        W3CNTriplesParser(collector).parse(io.StringIO(data), bnode_context=FileBNodeLabels())
+        return encode_triples(collector.triples)
+
+    opener = gzip.open if path.endswith(".gz") else open
+    part = Dataset(default_union=True) if format in QUAD_FORMATS else Graph()
+    with opener(path, "rb") as f:
+        part.parse(f, format=format)
+    return encode_triples(part.triples((None, None, None)))
+
+
+if __name__ == "__main__":
+    # Benchmark: parse the given files one after another vs. in parallel
+    paths = sys.argv[1:] or ["graph.ttl"]
+
+    start = time.perf_counter()
+    sequential = Graph()
+    for path in paths:
+        sequential.parse(path)
+    sequential_time = time.perf_counter() - start
+    print(f"Parsed {len(paths)} files ({len(sequential)} triples) one after another in {sequential_time:.3f}s")
+
+    start = time.perf_counter()
+    parallel = load_graphs(paths)
+    parallel_time = time.perf_counter() - start
+    assert len(parallel) == len(sequential), "parallel load does not match"
+    print(f"Loaded them in parallel in {parallel_time:.3f}s ({sequential_time / parallel_time:.1f}x faster)")
@@ -0,0 +1,126 @@
+import json
+import os
+import sqlite3
+import threading
+import zipfile
+import zlib
+
+# External identifier types of the ROR data dump that are indexed (lowercase)
+ID_SCHEMES = {"grid", "isni", "wikidata", "fundref", "orgref", "ringgold"}
+
+
+def build_ror_index(dump_path, index_path="ror_index.sqlite"):
+    """
+    Builds a compact on-disk index from a ROR data dump (https://ror.readme.io/docs/data-dump).
+
+    Args:
+        dump_path (str): The dump as downloaded (.zip) or the extracted .json file.
+                         The v1 schema records are used, since the schema.org mapper expects them.
+        index_path (str): Path of the SQLite index file. An existing index is replaced.
+
+    Returns:
+        RorIndex: The opened index.
+
+    Notes:
+        - The index maps GRID, ISNI, Wikidata QID, FundRef and OrgRef IDs (and Ringgold IDs,
+          if a dump contains them) to ROR IDs, and ROR IDs to the full, compressed records.
+        - The whole dump is loaded into memory once while building the index.
+    """
+    records = load_ror_dump(dump_path)
+
+    tmp_path = f"{index_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    connection.execute("CREATE TABLE records (ror_id TEXT PRIMARY KEY, data BLOB NOT NULL) WITHOUT ROWID")
+    connection.execute("""
+        CREATE TABLE identifiers (
+            scheme TEXT NOT NULL,
+            value TEXT NOT NULL,
+            ror_id TEXT NOT NULL,
+            PRIMARY KEY (scheme, value)
+        ) WITHOUT ROWID
+    """)
+    for record in records:
+        ror_id = record["id"].split("/")[-1]
+        connection.execute("INSERT OR REPLACE INTO records VALUES (?, ?)",
+                           (ror_id, zlib.compress(json.dumps(record).encode("utf-8"))))
+        connection.executemany("INSERT OR IGNORE INTO identifiers VALUES (?, ?, ?)",
+                               [(scheme, value, ror_id) for scheme, value in get_external_ids(record)])
+    connection.commit()
+    connection.close()
+    os.replace(tmp_path, index_path)
+    return RorIndex(index_path)
+
+
+def load_ror_dump(dump_path):
+    if not zipfile.is_zipfile(dump_path):
+        with open(dump_path, encoding="utf-8") as f:
+            return json.load(f)
+    with zipfile.ZipFile(dump_path) as archive:
+        # Newer dumps contain the records in the v1 and the v2 schema
+        names = [name for name in archive.namelist()
+                 if name.endswith(".json") and "schema_v2" not in name]
+        with archive.open(names[0]) as f:
+            return json.load(f)
+
+
+def get_external_ids(record):
+    """Yields (scheme, value) for all external identifiers of a ROR record (v1 or v2 schema)."""
+    external_ids = record.get("external_ids", {})
+    if isinstance(external_ids, dict):  # v1: {"GRID": {"preferred": ..., "all": ...}}
+        external_ids = [dict(external_id, type=id_type) for id_type, external_id in external_ids.items()]
+    for external_id in external_ids:
+        scheme = external_id.get("type", "").lower()
+        if scheme not in ID_SCHEMES:
+            continue
+        values = external_id.get("all") or []
+        if isinstance(values, str):
+            values = [values]
+        if external_id.get("preferred"):
+            values = [external_id["preferred"], *values]
+        for value in values:
+            yield scheme, normalize_id(scheme, value)
+
+
+def normalize_id(scheme, value):
+    value = str(value).strip()
+    if scheme == "isni":
+        return value.replace(" ", "")
+    if scheme == "wikidata":
+        return value.split("/")[-1]
+    return value
+
+
+class RorIndex:
+    """
+    Read-only lookups in an index built by `build_ror_index`.
+
+    Args:
+        index_path (str): Path of the SQLite index file.
+    """
+
+    def __init__(self, index_path="ror_index.sqlite"):
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True, check_same_thread=False)
+
+    def lookup(self, scheme, value):
+        """Returns the ROR ID URL for an external identifier (e.g. ("grid", "grid.8385.6")), or None."""
+        scheme = scheme.lower()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT ror_id FROM identifiers WHERE scheme = ? AND value = ?",
+                (scheme, normalize_id(scheme, value))).fetchone()
+        return f"https://ror.org/{row[0]}" if row else None
+
+    def record(self, ror_id):
+        """Returns the full ROR record (v1 schema) for a ROR ID or ROR ID URL, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM records WHERE ror_id = ?", (ror_id.split("/")[-1],)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,197 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+# Sustained request rate (requests per second) and burst size per API host.
+# The rates stay just under the documented limits of the public APIs:
+#   - GitHub: 900 points per minute secondary limit; the hourly primary limit (5000 requests with a
+#     token) is tracked through the X-RateLimit-* headers
+#   - ORCID public API: 24 requests per second, bursts of 40
+#   - ROR: 2000 requests per 5 minutes
+#   - Wikidata Query Service: no fixed request limit, but heavy throttling of parallel clients
+DEFAULT_RATE_LIMITS = {
+    "api.github.com": (14, 100),
+    "pub.orcid.org": (22, 40),
+    "api.ror.org": (6, 20),
+    "query.wikidata.org": (2, 5),
+}
+
+# Once less than this fraction of a rate limit window is left, the remaining requests are
+# spread evenly until the window resets
+LOW_BUDGET_FRACTION = 0.2
+
+# Status codes of transient failures that are retried
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HostBudget:
+    """Token bucket that paces the requests to one API host."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a request may be sent. Returns the time spent waiting in seconds."""
+        waited = 0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def update(self, remaining, reset_in, limit):
+        """Adapts the pace to the remaining budget of the current rate limit window."""
+        with self._lock:
+            self.tokens = min(self.tokens, remaining)
+            if remaining > limit * LOW_BUDGET_FRACTION or reset_in <= 0:
+                self.rate = self.max_rate
+            else:
+                # Spread the rest of the budget evenly until the reset, with a small safety margin
+                self.rate = min(self.max_rate, max(remaining * 0.95 / reset_in, 1e-3))
+
+
+class RequestScheduler:
+    """
+    Central scheduler for all API requests. It keeps a request budget per host, paces
+    the requests to stay under each API's rate limit and retries transient failures.
+
+    Args:
+        rate_limits (dict): (requests per second, burst) per API host, overriding `DEFAULT_RATE_LIMITS`.
+                            Hosts that are not listed are not paced.
+        max_retries (int): Maximum number of retries of a failed request.
+        backoff_base (float): Base delay of the exponential backoff in seconds.
+        backoff_max (float): Maximum delay between two attempts in seconds.
+        reserve (int): Number of requests left in an API's rate limit window at which the
+                       scheduler pauses requests to that host until the window resets.
+
+    Notes:
+        - Rate limit headers (`X-RateLimit-Remaining`/`X-RateLimit-Reset`) are used to track
+          the budget of a host. When it runs low the remaining requests are spread until the
+          reset, and once it is exhausted requests to the host pause until the reset instead
+          of failing.
+        - 429 and 5xx responses as well as connection errors and timeouts are retried with
+          jittered exponential backoff. A `Retry-After` header takes precedence.
+    """
+
+    def __init__(self, rate_limits=None, max_retries=5, backoff_base=1.0, backoff_max=60.0, reserve=10):
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS, **(rate_limits or {}))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.reserve = reserve
+        self._budgets = {}
+        self._lock = threading.Lock()
+
+    def get_budget(self, host):
+        if host not in self.rate_limits:
+            return None
+        with self._lock:
+            if host not in self._budgets:
+                self._budgets[host] = HostBudget(*self.rate_limits[host])
+            return self._budgets[host]
+
+    def request(self, send, url, logger, **kwargs):
+        """
+        Sends a request with `send(url, **kwargs)` (e.g. `requests.get`), pacing it and
+        retrying transient failures.
+
+        Returns:
+            requests.Response: The last response. Connection errors of the last attempt are raised.
+        """
+        host = urlparse(url).netloc
+        budget = self.get_budget(host)
+        for attempt in range(self.max_retries + 1):
+            if budget:
+                waited = budget.acquire()
+                if waited > 1:
+                    logger.info(f"Waited {waited:.1f}s for the request budget of {host}")
+
+            try:
+                response = send(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(f"Request to {url} failed due to: {e}. Retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            self.update_budget(host, budget, response, logger)
+            if not self.should_retry(response) or attempt == self.max_retries:
+                return response
+
+            delay = max(self.backoff(attempt), get_retry_after(response) or 0)
+            logger.warning(f"Request to {url} returned status {response.status_code}. "
+                           f"Retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+            if budget:
+                budget.pause(delay)
+            else:
+                time.sleep(delay)
+        return response
+
+    def backoff(self, attempt):
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def should_retry(response):
+        if response.status_code in RETRY_STATUS_CODES:
+            return True
+        # GitHub answers 403 when the primary or a secondary rate limit is exceeded
+        return response.status_code == 403 and (
+            response.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in response.headers)
+
+    def update_budget(self, host, budget, response, logger):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if budget is None or remaining is None or reset is None:
+            return
+        try:
+            remaining, reset_in = int(remaining), float(reset) - time.time()
+            limit = int(response.headers.get("X-RateLimit-Limit", remaining))
+        except ValueError:
+            logger.debug(f"Ignoring malformed rate limit headers of {host}")
+            return
+        if remaining <= self.reserve and reset_in > 0:
+            logger.warning(f"Rate limit of {host} is exhausted ({remaining} requests left). "
+                           f"Pausing requests to {host} for {reset_in:.0f}s until the limit resets.")
+            budget.pause(reset_in + 1)
+        else:
+            budget.update(remaining - self.reserve, reset_in, limit)
+
+
+def get_retry_after(response):
+    """Returns the delay requested by a Retry-After header in seconds, or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,61 @@
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of pooled keep-alive connections per API host. It should be at least the number of
+# concurrent requests allowed for the host (see `utils.API_CONCURRENCY`).
+DEFAULT_POOL_SIZES = {
+    "api.github.com": 8,
+    "pub.orcid.org": 8,
+    "api.ror.org": 4,
+    "query.wikidata.org": 2,
+}
+
+
+class SessionPool:
+    """
+    Shared HTTP client layer with one keep-alive, connection-pooled `requests.Session` per
+    API host, so consecutive requests to a host reuse the TCP+TLS connection.
+
+    Args:
+        pool_sizes (dict): Number of pooled connections per API host, overriding `DEFAULT_POOL_SIZES`.
+        default_pool_size (int): Number of pooled connections for hosts without an entry in `pool_sizes`.
+
+    Notes:
+        - Responses are requested gzip/deflate compressed and decompressed transparently.
+        - Retries are not done by the sessions themselves but by `scheduler.RequestScheduler`.
+    """
+
+    def __init__(self, pool_sizes=None, default_pool_size=4):
+        self.pool_sizes = dict(DEFAULT_POOL_SIZES, **(pool_sizes or {}))
+        self.default_pool_size = default_pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, url):
+        """Returns the session for the host of `url`, creating it on first use."""
+        parsed = urlparse(url)
+        with self._lock:
+            if parsed.netloc not in self._sessions:
+                self._sessions[parsed.netloc] = self.create_session(parsed.netloc)
+            return self._sessions[parsed.netloc]
+
+    def create_session(self, host):
+        pool_size = self.pool_sizes.get(host, self.default_pool_size)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Accept-Encoding"] = "gzip, deflate"
+        return session
+
+    def get(self, url, **kwargs):
+        return self.get_session(url).get(url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
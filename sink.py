@@ -0,0 +1,82 @@
+import gzip
+import threading
+
+from rdflib import URIRef
+from rdflib.plugins.serializers.nquads import _nq_row
+from rdflib.plugins.serializers.nt import _nt_row
+
+
+class TripleSink:
+    """
+    Appends triples to an N-Triples or N-Quads file while a graph is built, see the `sink`
+    argument of `utils.build_graph_from_github_org`. Every line is complete on its own, so
+    other programs can read the file while it grows.
+
+    Args:
+        path (str): Path of the file. Files ending in .nq (or .nq.gz) are written as N-Quads,
+                    all others as N-Triples. Files ending in .gz are gzip compressed.
+        graph_name (str): Graph name of the written quads (N-Quads only). By default they
+                          belong to the default graph, see also `named`.
+        append (bool): If True, the triples are appended to an existing file instead of replacing it.
+
+    Notes:
+        - Triples that are part of several documents (e.g. the type of a work created by several
+          persons) can appear more than once. RDF loaders ignore duplicates.
+        - Unlike `graph.serialize(format="turtle")`, nothing has to be sorted or grouped in memory.
+    """
+
+    def __init__(self, path, graph_name=None, append=False):
+        self.path = path
+        self.quads = path.endswith((".nq", ".nq.gz"))
+        self.graph_name = URIRef(graph_name) if graph_name else None
+        self.triples_written = 0
+        self._lock = threading.Lock()
+        mode = "at" if append else "wt"
+        if path.endswith(".gz"):
+            self._file = gzip.open(path, mode, encoding="utf-8", newline="\n")
+        else:
+            self._file = open(path, mode, encoding="utf-8", newline="\n")
+
+    def write(self, triples, graph_name=None):
+        """Writes `triples` (to the graph `graph_name`, or the sink's `graph_name`)."""
+        if self.quads:
+            graph_name = URIRef(graph_name) if graph_name else self.graph_name
+            lines = [_nq_row(triple, graph_name) for triple in triples]
+        else:
+            lines = [_nt_row(triple) for triple in triples]
+        with self._lock:
+            self._file.write("".join(lines))
+            self.triples_written += len(lines)
+
+    def named(self, graph_name):
+        """Returns a sink that writes the quads of the graph `graph_name` into this sink's file."""
+        return NamedGraphSink(self, graph_name)
+
+    def flush(self):
+        """Makes the triples written so far visible to readers of the file."""
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NamedGraphSink:
+    """The part of a `TripleSink` that belongs to one named graph, see `TripleSink.named`."""
+
+    def __init__(self, sink, graph_name):
+        self.sink = sink
+        self.graph_name = URIRef(graph_name)
+
+    def write(self, triples):
+        self.sink.write(triples, self.graph_name)
+
+    def flush(self):
+        self.sink.flush()
@@ -0,0 +1,47 @@
+import os
+
+from rdflib import Graph, URIRef
+from rdflib.plugin import PluginException
+
+# On-disk rdflib stores and the packages that provide them
+PERSISTENT_STORES = {
+    "Oxigraph": "oxrdflib",
+    "BerkeleyDB": "berkeleydb",
+}
+
+DEFAULT_GRAPH_IDENTIFIER = URIRef("urn:x-ias9:graph")
+
+
+def open_graph(path=None, store="Oxigraph", identifier=DEFAULT_GRAPH_IDENTIFIER):
+    """
+    Opens an RDF graph backed by an on-disk, indexed store. The returned `rdflib.Graph` has the
+    same API as an in-memory graph and can be passed to `build_graph_from_github_org(graph=...)`
+    or used with `visualize_graph`.
+
+    Args:
+        path (str): Directory of the store. It is created if it does not exist yet.
+                    If None, a plain in-memory graph is returned.
+        store (str): Name of the rdflib store plugin, e.g. "Oxigraph" (requires `pip install oxrdflib`)
+                     or "BerkeleyDB" (requires `pip install berkeleydb`).
+        identifier (rdflib.URIRef): Name of the graph within the store.
+
+    Returns:
+        rdflib.Graph: The opened graph. Call `graph.close()` when done to flush it to disk.
+
+    Notes:
+        - Reopening a store is near-instant, since nothing has to be parsed, and the graph
+          data stays on disk instead of in memory.
+        - Oxigraph stores plain literals as xsd:string literals, which are the same in RDF 1.1.
+    """
+    if path is None:
+        return Graph(identifier=identifier)
+
+    try:
+        graph = Graph(store=store, identifier=identifier)
+    except (ImportError, PluginException) as e:
+        package = PERSISTENT_STORES.get(store)
+        hint = f" Install it with `pip install {package}`." if package else ""
+        raise ImportError(f"The rdflib store '{store}' is not available.{hint}") from e
+
+    graph.open(path, create=not os.path.exists(path))
+    return graph
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import threading
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+import requests
+
+# The modules of the repository are top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils
+from benchmark import API_HOSTS, API_PATHS, SyntheticAPIs
+from scheduler import DEFAULT_RATE_LIMITS, RequestScheduler
+
+
+def make_response(status_code=200, body=None, headers=None, url=""):
+    """Builds a `requests.Response` with a JSON `body`."""
+    response = requests.models.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode("utf-8") if body is not None else b""
+    response.headers.update(headers or {})
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+
+class StubSessionPool:
+    """
+    Stand-in for `sessions.SessionPool` that answers every request with `respond(url, params, headers)`
+    and records the (url, params, headers) of the requests.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        with self._lock:
+            self.requests.append((url, params, headers or {}))
+        return self.respond(url, params, headers or {})
+
+    def close(self):
+        pass
+
+
+class SyntheticResponder:
+    """Answers the requests to the real API hosts from a `benchmark.SyntheticAPIs`, without a server."""
+
+    def __init__(self, apis):
+        self.apis = apis
+        self.hosts = {host: api for api, host in API_HOSTS.items()}
+        self.base_urls = {api: f"https://{host}{API_PATHS[api]}" for api, host in API_HOSTS.items()}
+
+    def __call__(self, url, params, headers):
+        parsed = urlparse(url)
+        api = self.hosts[parsed.netloc]
+        query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+        query.update({key: str(value) for key, value in (params or {}).items()})
+        body, response_headers = self.apis.respond(api, parsed.path[len(API_PATHS[api]):], query, self.base_urls)
+        if body is None:
+            return make_response(404, {"message": "Not Found"}, url=url)
+        return make_response(200, body, response_headers, url=url)
+
+
+@pytest.fixture
+def stub_requests(monkeypatch):
+    """
+    Returns a function that routes the requests of `utils.fetch` to `respond(url, params, headers)`,
+    which returns a `requests.Response` (see `make_response`). Requests are neither paced nor delayed
+    between retries. The function returns the `StubSessionPool` with the recorded requests.
+    """
+    monkeypatch.setattr(utils, "request_scheduler", RequestScheduler(
+        rate_limits={host: (1e9, 1e9) for host in DEFAULT_RATE_LIMITS}, backoff_base=0, max_retries=2))
+
+    def install(respond):
+        pool = StubSessionPool(respond)
+        monkeypatch.setattr(utils, "session_pool", pool)
+        return pool
+
+    return install
+
+
+@pytest.fixture
+def synthetic_apis(stub_requests, monkeypatch, tmp_path):
+    """
+    Returns a function that answers the API requests of the builds from `apis` (by default a
+    `benchmark.SyntheticAPIs` organization with 12 repositories). The builds run in `tmp_path`,
+    so their logs and state files do not end up in the repository.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(utils, "ror_id_memo", {})
+
+    def install(apis=None):
+        return stub_requests(SyntheticResponder(apis or SyntheticAPIs(12)))
+
+    return install
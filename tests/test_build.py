@@ -0,0 +1,152 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from rdflib import RDF, Literal, URIRef
+from rdflib.compare import graph_diff, isomorphic, to_isomorphic
+
+import utils
+from benchmark import SyntheticAPIs, paginate
+from cache import ResponseCache
+from orcid_candidates import OrcidCandidateStore
+from instrumentation import Instrumentation
+
+ORG = "benchmark-org"
+ROR_ID = "0000000bm"
+
+
+def build(**kwargs):
+    return utils.build_graph_from_github_org(ORG, ROR_ID, "token", "token", **kwargs)
+
+
+class EditedAPIs(SyntheticAPIs):
+    """
+    The synthetic organization after repositories were deleted, added and changed (new timestamps
+    and contributors) and persons changed their given name in their ORCID record.
+    """
+
+    def __init__(self, n_repos, deleted=(), added=(), changed=(), renamed=()):
+        super().__init__(n_repos)
+        self.repos = [repo for repo in range(n_repos) if repo not in deleted] + list(added)
+        self.changed = set(changed)
+        self.renamed = set(renamed)
+
+    def contributors(self, repo):
+        contributors = super().contributors(repo)
+        if repo in self.changed:
+            return sorted(set(contributors[1:]) | {self.n_persons - 1 - repo})
+        return contributors
+
+    def github(self, path, query, base):
+        parts = path.strip("/").split("/")
+        if parts[0] != "orgs" or len(parts) == 2:
+            return super().github(path, query, base)
+        items = [{
+            "id": 100000 + repo,
+            "name": f"repo{repo}",
+            "url": f"{base}/repos/{parts[1]}/repo{repo}",
+            "contributors_url": f"{base}/repos/{parts[1]}/repo{repo}/contributors",
+            "pushed_at": "2024-06-01T00:00:00Z" if repo in self.changed else "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+        } for repo in self.repos]
+        return paginate(items, query, f"{base}/{path.strip('/')}")
+
+    def orcid_api(self, path, query):
+        document, headers = super().orcid_api(path, query)
+        if "@id" in document and int(document["@id"].split("-")[-1]) in self.renamed:
+            document["givenName"] = "Renamed"
+        return document, headers
+
+
+def requests_of(instrumentation):
+    # ROR IDs are memoized across builds, the GitHub and ORCID requests are the same in every build
+    return {host: instrumentation.hosts[host]["requests"] for host in ("api.github.com", "pub.orcid.org")}
+
+
+def test_concurrent_builds_keep_their_own_settings(synthetic_apis, tmp_path):
+    synthetic_apis()
+    alone = Instrumentation()
+    build(instrumentation=alone)
+
+    instrumentations = [Instrumentation(), Instrumentation()]
+    caches = [ResponseCache(str(tmp_path / f"cache{i}.sqlite")) for i in range(2)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(build, max_workers=2, instrumentation=instrumentation, cache=cache,
+                                   api_concurrency={"api.github.com": 2})
+                   for instrumentation, cache in zip(instrumentations, caches)]
+        for future in futures:
+            future.result()
+
+    # Every build recorded its own requests in its own instrumentation and cache
+    for instrumentation, cache in zip(instrumentations, caches):
+        assert instrumentation.counters["repos"] == alone.counters["repos"] == 12
+        assert requests_of(instrumentation) == requests_of(alone)
+        assert cache.get(cache.key(f"{utils.API_URLS['github']}/orgs/{ORG}", {})) is not None
+    # ... and nothing leaked into the process-wide settings
+    assert utils.get_instrumentation() is utils.active_instrumentation
+    assert utils.get_response_cache() is None
+    assert utils.API_CONCURRENCY["api.github.com"] == 8
+
+
+def test_an_update_equals_a_fresh_build(synthetic_apis):
+    # Person 8 only contributes to the deleted repositories, person 15 is added to the changed repo4
+    persons = {person: URIRef(f"https://orcid.org/{SyntheticAPIs.orcid(person)}") for person in (1, 8, 15)}
+    synthetic_apis(SyntheticAPIs(12))
+    graph = build(state_file="graph_state.json")
+    assert (persons[8], None, None) in graph and (persons[15], None, None) not in graph
+
+    synthetic_apis(EditedAPIs(12, deleted=[0, 11], added=[12, 13], changed=[4, 7], renamed=[1]))
+    updated = utils.update_graph_from_github_org(ORG, ROR_ID, "token", "token", graph, state_file="graph_state.json")
+    fresh = build()
+
+    assert (persons[8], None, None) not in updated
+    assert (None, utils.SCHEMA.contributor, persons[15]) in updated
+    assert (persons[1], utils.SCHEMA.givenName, Literal("Renamed")) in updated
+    if not isomorphic(updated, fresh):
+        _, only_updated, only_fresh = graph_diff(to_isomorphic(updated), to_isomorphic(fresh))
+        raise AssertionError(f"Only in the update: {sorted(only_updated)}\nOnly in the fresh build: {sorted(only_fresh)}")
+    assert len(updated) == len(fresh)
+
+
+def test_a_concurrent_build_equals_a_sequential_one(synthetic_apis):
+    synthetic_apis()
+    sequential = build()
+    synthetic_apis()
+    concurrent = build(max_workers=4)
+
+    assert len(concurrent) == len(sequential)
+    assert isomorphic(concurrent, sequential)
+
+
+def test_persons_in_several_repositories_are_added_once(synthetic_apis):
+    apis = SyntheticAPIs(12)
+    pool = synthetic_apis(apis)
+    graph = build(max_workers=4)
+
+    repos = Counter(person for repo in range(apis.n_repos) for person in apis.contributors(repo))
+    person = URIRef(f"https://orcid.org/{apis.orcid(0)}")
+    assert repos[0] > 1 and (person, RDF.type, utils.SCHEMA.Person) in graph
+    # The ORCID record was fetched and added once: a second copy would add its blank nodes again
+    assert [url for url, _, _ in pool.requests].count(f"{utils.API_URLS['orcid']}/{apis.orcid(0)}") == 1
+    assert len(list(graph.objects(person, utils.SCHEMA.identifier))) == 1
+    # Every further repository only links to the person
+    repo_links = [(repo, predicate) for repo, predicate in graph.subject_predicates(person)
+                  if (repo, RDF.type, utils.SCHEMA.SoftwareSourceCode) in graph]
+    assert {predicate for _, predicate in repo_links} == {utils.SCHEMA.contributor}
+    assert len(repo_links) == repos[0]
+
+
+def test_builds_from_orcid_sections_and_searches_equal_the_default_build(synthetic_apis, tmp_path):
+    synthetic_apis()
+    default = build()
+
+    pool = synthetic_apis()
+    sections = build(orcid_sections=utils.ORCID_SECTIONS)
+    assert any(url.endswith("/activities") for url, _, _ in pool.requests)
+    assert isomorphic(sections, default)
+
+    pool = synthetic_apis()
+    store = OrcidCandidateStore(str(tmp_path / "orcid_candidates.sqlite"))
+    searched = build(orcid_store=store)
+    store.close()
+    assert any("/expanded-search/" in url for url, _, _ in pool.requests)
+    assert isomorphic(searched, default)
@@ -0,0 +1,155 @@
+import logging
+
+import pytest
+
+import cache as cache_module
+import utils
+from cache import ResponseCache
+from conftest import make_response
+
+URL = "https://api.github.com/orgs/example"
+HEADERS = {"Accept": "application/json"}
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def logger():
+    return logging.getLogger("test_cache")
+
+
+def new_cache(tmp_path, **kwargs):
+    return ResponseCache(str(tmp_path / "http_cache.sqlite"), **kwargs)
+
+
+def test_entries_expire_after_the_ttl_of_their_host(tmp_path, clock):
+    response_cache = new_cache(tmp_path, ttl={"api.github.com": 60}, default_ttl=3600)
+    response_cache.put("github", URL, '{"login": "example"}', {})
+    response_cache.put("other", "https://example.org/data", "[]", {})
+
+    clock.now += 59
+    assert response_cache.is_fresh(response_cache.get("github"))
+    clock.now += 2
+    assert not response_cache.is_fresh(response_cache.get("github"))
+    assert response_cache.is_fresh(response_cache.get("other"))
+    clock.now += 3600
+    assert not response_cache.is_fresh(response_cache.get("other"))
+
+
+def test_entries_keep_their_data_and_headers(tmp_path, clock):
+    response_cache = new_cache(tmp_path)
+    key = response_cache.key(URL, HEADERS, {"per_page": 100})
+    response_cache.put(key, URL, '[{"id": 1}]', {"ETag": '"abc"', "Link": "<next>", "Server": "GitHub.com"})
+
+    entry = response_cache.get(key)
+    assert entry["data"] == [{"id": 1}]
+    assert entry["headers"] == {"ETag": '"abc"', "Link": "<next>"}
+    assert entry["host"] == "api.github.com"
+    assert response_cache.get(response_cache.key(URL, HEADERS)) is None
+
+
+def test_revalidation_headers(tmp_path, clock):
+    response_cache = new_cache(tmp_path)
+    response_cache.put("key", URL, "{}", {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    assert response_cache.revalidation_headers(response_cache.get("key")) == {
+        "If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+
+@pytest.mark.parametrize("validator, conditional_header", [
+    ({"ETag": '"abc"'}, "If-None-Match"),
+    ({"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, "If-Modified-Since"),
+])
+def test_stale_entries_are_revalidated_with_a_304(tmp_path, clock, stub_requests, monkeypatch, logger,
+                                                   validator, conditional_header):
+    response_cache = new_cache(tmp_path, ttl={"api.github.com": 60})
+    monkeypatch.setattr(utils, "response_cache", response_cache)
+    key = response_cache.key(URL, HEADERS)
+    response_cache.put(key, URL, '{"login": "example"}', validator)
+    clock.now += 120
+
+    pool = stub_requests(lambda url, params, headers: make_response(304, headers=validator, url=url))
+    assert utils.fetch(URL, HEADERS, logger) == {"login": "example"}
+    assert pool.requests[0][2][conditional_header] == list(validator.values())[0]
+    # The revalidated entry is fresh again and served without a request
+    assert response_cache.is_fresh(response_cache.get(key))
+    assert utils.fetch(URL, HEADERS, logger) == {"login": "example"}
+    assert len(pool.requests) == 1
+
+
+def test_changed_responses_replace_stale_entries(tmp_path, clock, stub_requests, monkeypatch, logger):
+    response_cache = new_cache(tmp_path, ttl={"api.github.com": 60})
+    monkeypatch.setattr(utils, "response_cache", response_cache)
+    key = response_cache.key(URL, HEADERS)
+    response_cache.put(key, URL, '{"login": "old"}', {"ETag": '"old"'})
+    clock.now += 120
+
+    stub_requests(lambda url, params, headers: make_response(200, {"login": "new"}, {"ETag": '"new"'}, url))
+    assert utils.fetch(URL, HEADERS, logger) == {"login": "new"}
+    entry = response_cache.get(key)
+    assert entry["data"] == {"login": "new"} and entry["headers"] == {"ETag": '"new"'}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    response_cache = new_cache(tmp_path, max_bytes=25)
+    for key in ("a", "b"):
+        clock.now += 1
+        response_cache.put(key, URL, '"0123456789"', {})  # 12 bytes each
+    clock.now += 1
+    response_cache.get("a")  # "b" is the least recently used entry now
+
+    clock.now += 1
+    response_cache.put("c", URL, '"0123456789"', {})
+    assert response_cache.get("b") is None
+    assert response_cache.get("a") is not None and response_cache.get("c") is not None
+
+    # Replacing an entry does not count its old size
+    clock.now += 1
+    response_cache.put("c", URL, '"0123456789"', {})
+    assert response_cache.get("a") is not None
+
+
+def test_the_size_is_restored_when_the_cache_is_reopened(tmp_path, clock):
+    response_cache = new_cache(tmp_path, max_bytes=25)
+    response_cache.put("a", URL, '"0123456789"', {})
+    response_cache.close()
+
+    response_cache = new_cache(tmp_path, max_bytes=25)
+    clock.now += 1
+    response_cache.put("b", URL, '"0123456789"', {})
+    clock.now += 1
+    response_cache.put("c", URL, '"0123456789"', {})
+    assert response_cache.get("a") is None
+    assert response_cache.get("b") is not None
+
+
+def test_offline_mode_serves_hits_and_sends_no_requests(tmp_path, clock, stub_requests, monkeypatch, logger):
+    response_cache = new_cache(tmp_path, ttl={"api.github.com": 60}, offline=True)
+    monkeypatch.setattr(utils, "response_cache", response_cache)
+    response_cache.put(response_cache.key(URL, HEADERS), URL, '{"login": "example"}', {})
+    clock.now += 3600  # Stale entries are served too
+
+    pool = stub_requests(lambda url, params, headers: pytest.fail(f"Unexpected request to {url}"))
+    assert utils.fetch(URL, HEADERS, logger) == {"login": "example"}
+    assert utils.fetch(f"{URL}/repos", HEADERS, logger) is None
+    assert pool.requests == []
+
+
+def test_clear(tmp_path, clock):
+    response_cache = new_cache(tmp_path)
+    response_cache.put("a", URL, "{}", {})
+    response_cache.clear()
+    assert response_cache.get("a") is None
@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+import utils
+from benchmark import SyntheticAPIs
+from checkpoint import BuildCheckpoint
+
+ORG = "benchmark-org"
+ROR_ID = "0000000bm"
+
+
+class FailingAPIs(SyntheticAPIs):
+    """The synthetic organization, where fetching the contributors of repository `fail_at` crashes the build."""
+
+    def __init__(self, n_repos, fail_at):
+        super().__init__(n_repos)
+        self.fail_at = fail_at
+
+    def github(self, path, query, base):
+        if path.rstrip("/").endswith(f"/repo{self.fail_at}/contributors"):
+            raise RuntimeError("Injected failure")
+        return super().github(path, query, base)
+
+
+def build(**kwargs):
+    return utils.build_graph_from_github_org(ORG, ROR_ID, "token", "token", **kwargs)
+
+
+def contributor_requests(pool):
+    return {url.split("/")[-2] for url, _, _ in pool.requests if url.endswith("/contributors")}
+
+
+def interrupted_build(synthetic_apis, checkpoint_dir, max_workers=1):
+    synthetic_apis(FailingAPIs(12, fail_at=7))
+    with pytest.raises(RuntimeError, match="Injected failure"):
+        build(checkpoint_dir=checkpoint_dir, checkpoint_every=3, max_workers=max_workers)
+    with open(os.path.join(checkpoint_dir, "journal.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_a_resumed_build_equals_an_uninterrupted_one(synthetic_apis, tmp_path, max_workers):
+    synthetic_apis()
+    uninterrupted = build()
+
+    checkpoint_dir = str(tmp_path / "checkpoint")
+    journal = interrupted_build(synthetic_apis, checkpoint_dir, max_workers)
+    # The repositories completed before the failure were saved, even between two regular checkpoints
+    assert 0 < len(journal["repos"]) <= 7
+
+    pool = synthetic_apis()
+    resumed = build(checkpoint_dir=checkpoint_dir, resume=True, max_workers=max_workers)
+
+    assert len(resumed) == len(uninterrupted)
+    assert isomorphic(resumed, uninterrupted)
+    # Only the repositories missing from the checkpoint were enriched again
+    completed = {f"repo{int(repo_id) - 100000}" for repo_id in journal["repos"]}
+    assert contributor_requests(pool) == {f"repo{repo}" for repo in range(12)} - completed
+    # The checkpoint is removed after the build completed
+    assert not os.path.exists(os.path.join(checkpoint_dir, "journal.json"))
+
+
+def test_a_truncated_journal_is_ignored(synthetic_apis, tmp_path):
+    synthetic_apis()
+    uninterrupted = build()
+
+    checkpoint_dir = str(tmp_path / "checkpoint")
+    interrupted_build(synthetic_apis, checkpoint_dir)
+    journal_file = os.path.join(checkpoint_dir, "journal.json")
+    with open(journal_file, "rb") as f:
+        data = f.read()
+    with open(journal_file, "wb") as f:
+        f.write(data[:len(data) // 2])
+    assert BuildCheckpoint(checkpoint_dir).load(Graph()) is None
+
+    # The build starts over
+    pool = synthetic_apis()
+    resumed = build(checkpoint_dir=checkpoint_dir, resume=True)
+    assert contributor_requests(pool) == {f"repo{repo}" for repo in range(12)}
+    assert isomorphic(resumed, uninterrupted)
+
+
+def test_a_truncated_journal_update_keeps_the_previous_checkpoint(synthetic_apis, tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoint")
+    journal = interrupted_build(synthetic_apis, checkpoint_dir)
+    # A crash while writing the next checkpoint leaves a partial temporary journal behind
+    with open(os.path.join(checkpoint_dir, "journal.json.tmp"), "w", encoding="utf-8") as f:
+        f.write('{"github_org_name": "benchmark-org", "repos": {"1000')
+
+    graph = Graph()
+    assert BuildCheckpoint(checkpoint_dir).load(graph) == journal
+    assert len(graph) > 0
@@ -0,0 +1,238 @@
+import json
+import os
+
+import pytest
+from rdflib import BNode, Graph, Namespace, URIRef
+from rdflib.compare import isomorphic, to_isomorphic, graph_diff
+
+from mappers import (github_repo_to_SoftwareSourceCode, orcid_sections_to_schema_org, ror_org_to_schema_org,
+                     schema_org_to_triples, with_local_schema_org_context)
+
+SCHEMA = Namespace("http://schema.org/")
+
+ROR_RECORD = {
+    "id": "https://ror.org/02nv7yv05",
+    "name": "Forschungszentrum Jülich",
+    "aliases": ["FZJ", "Jülich Research Centre"],
+    "links": ["https://www.fz-juelich.de"],
+    "addresses": [{"city": "Jülich", "state": "North Rhine-Westphalia", "country": None}],
+    "external_ids": {
+        "GRID": {"preferred": "grid.8385.6", "all": "grid.8385.6"},
+        "ISNI": {"preferred": "0000 0001 2297 375X", "all": ["0000 0001 2297 375X"]},
+        "Wikidata": {"preferred": "Q697575", "all": ["Q697575"]},
+    },
+}
+
+GITHUB_REPO = {
+    "id": 123456,
+    "name": "metador-push",
+    "url": "https://api.github.com/repos/Materials-Data-Science-and-Informatics/metador-push",
+}
+
+# Shape of the JSON-LD records of the ORCID API, with the works as @reverse creator
+ORCID_PERSON = {
+    "@context": "http://schema.org",
+    "@id": "https://orcid.org/0000-0002-1825-0097",
+    "@type": "Person",
+    "mainEntityOfPage": "https://orcid.org/0000-0002-1825-0097",
+    "givenName": "Josiah",
+    "familyName": "Carberry",
+    "alternateName": ["J. Carberry", "Josiah S. Carberry"],
+    "address": {"@type": "PostalAddress", "addressCountry": "US"},
+    "url": ["https://example.org/carberry"],
+    "identifier": [
+        {"@type": "PropertyValue", "propertyID": "Scopus Author ID", "value": "1234567"},
+        {"@type": "PropertyValue", "propertyID": "ResearcherID", "value": "A-1234-2010"},
+    ],
+    "affiliation": [
+        {"@type": "Organization", "@id": "https://ror.org/05gq02987", "name": "Brown University"},
+        {"@type": "Organization", "name": "Wesleyan University",
+         "identifier": {"@type": "PropertyValue", "propertyID": "RINGGOLD", "value": "5719"}},
+    ],
+    "alumniOf": {"@type": "Organization", "@id": "https://www.grid.ac/institutes/grid.40263.33",
+                 "name": "Brown University"},
+    "@reverse": {
+        "creator": [
+            {"@type": "CreativeWork", "@id": "https://doi.org/10.5555/12345678", "name": "Toward a Unified Theory",
+             "identifier": {"@type": "PropertyValue", "propertyID": "doi", "value": "10.5555/12345678"},
+             "sameAs": "https://doi.org/10.5555/12345678"},
+            {"@type": "CreativeWork", "name": "A work without identifiers"},
+        ],
+        "funder": {"@type": "Organization", "@id": "https://ror.org/021nxhr62", "name": "NSF"},
+    },
+}
+
+# Responses of the ORCID v3.0 /person and /activities endpoints
+ORCID_PERSON_SECTION = {
+    "name": {"given-names": {"value": "Josiah"}, "family-name": {"value": "Carberry"}},
+    "other-names": {"other-name": [{"content": "J. Carberry"}]},
+    "addresses": {"address": [{"country": {"value": "US"}}]},
+    "researcher-urls": {"researcher-url": [{"url": {"value": "https://example.org/carberry"}}]},
+    "external-identifiers": {"external-identifier": [
+        {"external-id-type": "Scopus Author ID", "external-id-value": "1234567"}]},
+}
+ORCID_ACTIVITIES = {
+    "employments": {"affiliation-group": [{"summaries": [{"employment-summary": {"organization": {
+        "name": "Brown University",
+        "disambiguated-organization": {"disambiguation-source": "ROR",
+                                       "disambiguated-organization-identifier": "https://ror.org/05gq02987"}}}}]}]},
+    "educations": {"affiliation-group": [{"summaries": [{"education-summary": {"organization": {
+        "name": "Wesleyan University",
+        "disambiguated-organization": {"disambiguation-source": "RINGGOLD",
+                                       "disambiguated-organization-identifier": "5719"}}}}]}]},
+    "works": {"group": [{"work-summary": [{
+        "title": {"title": {"value": "Toward a Unified Theory"}},
+        "external-ids": {"external-id": [{"external-id-type": "doi", "external-id-value": "10.5555/12345678",
+                                          "external-id-url": {"value": "https://doi.org/10.5555/12345678"}}]},
+    }]}]},
+}
+
+
+def repo_document():
+    source_code = github_repo_to_SoftwareSourceCode(GITHUB_REPO)
+    source_code["sourceOrganisation"] = {"@id": "https://ror.org/02nv7yv05"}
+    source_code["contributor"] = [{"@id": "https://orcid.org/0000-0002-1825-0097"},
+                                  {"@id": "https://orcid.org/0000-0001-5109-3700"}]
+    return source_code
+
+
+def value_document():
+    # Value objects, numbers, booleans and null values
+    return {
+        "@context": "https://schema.org",
+        "@id": "https://example.org/thing",
+        "@type": ["Thing", "CreativeWork"],
+        "name": [{"@value": "Titel", "@language": "de"}, {"@value": None}, None],
+        "dateCreated": {"@value": "2024-01-01", "@type": "Date"},
+        "position": 3,
+        "ratingValue": 4.5,
+        "isAccessibleForFree": True,
+        "author": {"@id": "_:author", "name": "Anonymous"},
+        "editor": {"@id": "_:author"},
+    }
+
+
+DOCUMENTS = {
+    "ror_organization": lambda: ror_org_to_schema_org(ROR_RECORD),
+    "orcid_person": lambda: ORCID_PERSON,
+    "orcid_sections": lambda: orcid_sections_to_schema_org("0000-0002-1825-0097", ORCID_PERSON_SECTION,
+                                                           ORCID_ACTIVITIES["employments"],
+                                                           ORCID_ACTIVITIES["educations"], ORCID_ACTIVITIES["works"]),
+    "repository": repo_document,
+    "values": value_document,
+}
+
+
+def parse_json_ld(document):
+    return Graph().parse(data=json.dumps(with_local_schema_org_context(document)), format="json-ld")
+
+
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+def test_triples_are_isomorphic_to_json_ld_parsing(name):
+    document = DOCUMENTS[name]()
+    expected = parse_json_ld(document)
+    graph = Graph()
+    graph.addN((s, p, o, graph) for s, p, o in schema_org_to_triples(document))
+
+    if not isomorphic(graph, expected):
+        _, only_direct, only_json_ld = graph_diff(to_isomorphic(graph), to_isomorphic(expected))
+        pytest.fail(f"Only in the direct triples: {sorted(only_direct)}\nOnly in the JSON-LD graph: {sorted(only_json_ld)}")
+    assert len(graph) > 0
+
+
+def test_reverse_works_link_to_the_person():
+    triples = schema_org_to_triples(ORCID_PERSON)
+    creators = {obj for _, predicate, obj in triples if predicate == SCHEMA.creator}
+    funded = {subject for subject, predicate, _ in triples if predicate == SCHEMA.funder}
+    assert creators == {URIRef("https://orcid.org/0000-0002-1825-0097")}
+    assert funded == {URIRef("https://ror.org/021nxhr62")}
+
+
+GRAPH_SLICE = os.path.join(os.path.dirname(__file__), "graph_slice.ttl")
+GRAPH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "graph.ttl")
+
+# The records behind tests/graph_slice.ttl, in the shapes returned by the ROR, GitHub and ORCID APIs
+FZJ_ROR_RECORD = {
+    "id": "https://ror.org/02nv7yv05",
+    "name": "Forschungszentrum Jülich",
+    "aliases": [],
+    "links": ["https://www.fz-juelich.de"],
+    "addresses": [{"city": "Jülich", "state": None, "country": None}],
+    "external_ids": {
+        "GRID": {"preferred": "grid.8385.6", "all": "grid.8385.6"},
+        "ISNI": {"preferred": None, "all": ["0000 0001 2297 375X"]},
+        "Wikidata": {"preferred": None, "all": ["Q697575"]},
+    },
+}
+
+DISLOCATION_ONTOLOGY_REPO = {
+    "id": 374087446,
+    "name": "dislocation-ontology",
+    "url": "https://api.github.com/repos/Materials-Data-Science-and-Informatics/dislocation-ontology",
+}
+
+VIVACE_ORCID_PERSON = {
+    "@context": "http://schema.org",
+    "@id": "https://orcid.org/0000-0002-1057-9138",
+    "@type": "Person",
+    "mainEntityOfPage": "https://orcid.org/0000-0002-1057-9138",
+    "givenName": "Antonio",
+    "familyName": "Vivace",
+    "address": [{"@type": "PostalAddress", "addressCountry": country} for country in ("FR", "IT", "CH")],
+    "url": ["https://avivace.com/", "https://github.com/avivace"],
+    "affiliation": [{"@id": "https://ror.org/01ggx4157"}, {"@id": "https://ror.org/0335j3x48"}],
+    "alumniOf": {"@id": "https://ror.org/01ynf4891"},
+    "@reverse": {
+        "creator": [
+            {"@type": "CreativeWork", "@id": "https://doi.org/10.5281/zenodo.10203444",
+             "name": "The Challenge of Digital Preservation at CERN",
+             "identifier": [
+                 {"@type": "PropertyValue", "propertyID": "doi", "value": "10.5281/zenodo.10203444"},
+                 {"@type": "PropertyValue", "propertyID": "doi", "value": "10.5281/zenodo.10203445"},
+             ],
+             "sameAs": "https://doi.org/10.5281/zenodo.10203445"},
+            {"@type": "CreativeWork", "name": "Modernising the CERN CMS Trigger Rates Monitoring software",
+             "identifier": {"@type": "PropertyValue", "propertyID": "source-work-id",
+                            "value": "od________65::284ceb489830865b94068c554945bead"},
+             "sameAs": "https://explore.openaire.eu/search/publication?id=od________65::284ceb489830865b94068c554945bead"},
+        ],
+    },
+}
+
+OSSCAR_FUNDER = {
+    "@context": "http://schema.org",
+    "@id": "https://orcid.org/0000-0002-3583-4377",
+    "@reverse": {
+        "funder": {"@type": "Organization", "@id": "https://doi.org/10.13039/501100001703",
+                   "name": "École Polytechnique Fédérale de Lausanne",
+                   "alternateName": "Open Software Services for Education and Research (OSSCAR)",
+                   "identifier": {"@type": "PropertyValue", "propertyID": "grant_number", "value": "2018"}},
+    },
+}
+
+
+def graph_slice_documents():
+    repo = github_repo_to_SoftwareSourceCode(DISLOCATION_ONTOLOGY_REPO)
+    repo["sourceOrganisation"] = {"@id": FZJ_ROR_RECORD["id"]}
+    repo["contributor"] = [{"@id": "https://orcid.org/0000-0002-1008-4530"},
+                           {"@id": "https://orcid.org/0000-0002-2089-6364"}]
+    return [ror_org_to_schema_org(FZJ_ROR_RECORD), repo, VIVACE_ORCID_PERSON, OSSCAR_FUNDER]
+
+
+def test_triples_are_isomorphic_to_the_original_json_ld_parse():
+    # Unlike the test above, the expected triples were not produced with the local context
+    expected = Graph().parse(GRAPH_SLICE, format="turtle")
+    graph = Graph()
+    for document in graph_slice_documents():
+        graph.addN((s, p, o, graph) for s, p, o in schema_org_to_triples(document))
+
+    if not isomorphic(graph, expected):
+        _, only_direct, only_original = graph_diff(to_isomorphic(graph), to_isomorphic(expected))
+        pytest.fail(f"Only in the direct triples: {sorted(only_direct)}\nOnly in graph.ttl: {sorted(only_original)}")
+
+
+def test_the_graph_slice_is_taken_from_graph_ttl():
+    original = Graph().parse(GRAPH, format="turtle")
+    for triple in Graph().parse(GRAPH_SLICE, format="turtle"):
+        if not any(isinstance(term, BNode) for term in triple):
+            assert triple in original
@@ -0,0 +1,84 @@
+import pytest
+
+from orcid_candidates import (EXACT_MATCH, INITIALS_MATCH, OTHER_NAME_MATCH, PARTIAL_MATCH, SWAPPED_MATCH,
+                              OrcidCandidateStore, fold_name, match_confidence, name_key)
+
+
+def result(given, family, orcid="0000-0002-0000-0001", **kwargs):
+    """An item of the "expanded-result" list of an ORCID expanded-search response."""
+    return {"orcid-id": orcid, "given-names": given, "family-names": family, **kwargs}
+
+
+@pytest.mark.parametrize("name, tokens", [
+    ("Müller-Lüdenscheidt, Jörg", ["jorg", "muller", "ludenscheidt"]),
+    ("José María Aznar", ["jose", "maria", "aznar"]),
+    ("Ångström", ["angstrom"]),
+    ("Strauß", ["strauss"]),
+    ("O'Brien", ["o", "brien"]),
+    ("J.R.R. Tolkien", ["j", "r", "r", "tolkien"]),
+    ("  Volker   Hofmann ", ["volker", "hofmann"]),
+    ("", []),
+    (None, []),
+])
+def test_fold_name(name, tokens):
+    assert fold_name(name) == tokens
+
+
+@pytest.mark.parametrize("name, other", [
+    ("Volker Hofmann", "Hofmann Volker"),
+    ("Volker Hofmann", "Hofmann, Volker"),
+    ("Jörg Müller", "jorg muller"),
+    ("Ludwig van der Berg", "van der Berg, Ludwig"),
+])
+def test_name_keys_of_spellings_agree(name, other):
+    assert name_key(name) == name_key(other)
+
+
+@pytest.mark.parametrize("name, other", [
+    ("Volker Hofmann", "Volker Hoffmann"),
+    ("Volker Hofmann", "V. Hofmann"),
+])
+def test_name_keys_of_other_names_differ(name, other):
+    assert name_key(name) != name_key(other)
+
+
+@pytest.mark.parametrize("name, candidate, confidence", [
+    ("Volker Hofmann", result("Volker", "Hofmann"), EXACT_MATCH),
+    ("Völker Hofmann", result("Volker", "Hofmann"), EXACT_MATCH),
+    ("Hofmann, Volker", result("Volker", "Hofmann"), EXACT_MATCH),
+    # Particles belong to the family name in ORCID but to the given names in split_name
+    ("Ludwig van der Berg", result("Ludwig", "van der Berg"), EXACT_MATCH),
+    ("María de la Cruz", result("Maria", "de la Cruz"), EXACT_MATCH),
+    ("Hofmann Volker", result("Volker", "Hofmann"), SWAPPED_MATCH),
+    ("Vovo Hofmann", result("Volker", "Hofmann", **{"other-name": ["Vovo Hofmann"]}), OTHER_NAME_MATCH),
+    ("Volli Hofmann", result("Volker", "Hofmann", **{"credit-name": "Hofmann, Volli"}), OTHER_NAME_MATCH),
+    ("Volker Hofmann", result("Volker Ernst", "Hofmann"), PARTIAL_MATCH),
+    ("V. Hofmann", result("Volker", "Hofmann"), INITIALS_MATCH),
+    ("Volker E. Hofmann", result("Volker Ernst", "Hofmann"), INITIALS_MATCH),
+    ("Anna Hofmann", result("Volker", "Hofmann"), 0.0),
+    ("Volker Hoffmann", result("Volker", "Hofmann"), 0.0),
+    ("Hofmann", result("Volker", "Hofmann"), 0.0),
+    ("Volker Hofmann", result("Volker", None), 0.0),
+])
+def test_match_confidence(name, candidate, confidence):
+    assert match_confidence(name, candidate) == confidence
+
+
+def test_candidates_below_the_confidence_threshold_are_not_used(tmp_path):
+    store = OrcidCandidateStore(str(tmp_path / "orcid_candidates.sqlite"), min_confidence=0.5)
+    assert INITIALS_MATCH < store.min_confidence <= PARTIAL_MATCH
+
+    candidates = store.add_search_results("V. Hofmann", [result("Volker", "Hofmann")])
+    assert [candidate["confidence"] for candidate in candidates] == [INITIALS_MATCH]
+    assert store.best_candidate("V. Hofmann") is None
+
+    store.add_search_results("Volker Hofmann", [
+        result("Anna", "Hofmann", orcid="0000-0002-0000-0003"),
+        result("Volker Ernst", "Hofmann", orcid="0000-0002-0000-0002"),
+        result("Volker", "Hofmann", orcid="0000-0002-0000-0001"),
+    ])
+    # Results without a match are dropped, the best candidate comes first
+    assert [candidate["orcid"] for candidate in store.candidates("Hofmann, Volker")] == [
+        "0000-0002-0000-0001", "0000-0002-0000-0002"]
+    assert store.best_candidate("Volker Hofmann") == "0000-0002-0000-0001"
+    store.close()
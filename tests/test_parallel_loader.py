@@ -0,0 +1,80 @@
+import gzip
+
+from rdflib import BNode, Graph, Namespace, URIRef
+from rdflib.compare import isomorphic
+
+from parallel_loader import load_graphs, split_lines
+
+SCHEMA = Namespace("http://schema.org/")
+
+# Both files use the blank node label _:b0, in their first and last lines
+FILE_A = "".join([
+    '<https://orcid.org/a> <http://schema.org/address> _:b0 .\n',
+    *[f'<https://orcid.org/a> <http://schema.org/alternateName> "Name {i}" .\n' for i in range(20)],
+    '_:b0 <http://schema.org/addressLocality> "Karlsruhe" .\n',
+])
+FILE_B = "".join([
+    '<https://orcid.org/b> <http://schema.org/address> _:b0 .\n',
+    *[f'<https://orcid.org/b> <http://schema.org/alternateName> "Name {i}"@en .\n' for i in range(20)],
+    '_:b0 <http://schema.org/addressLocality> "Jülich" .\n',
+])
+
+
+def write_files(tmp_path):
+    paths = []
+    for name, data in (("a.nt", FILE_A), ("b.nt", FILE_B)):
+        path = tmp_path / name
+        path.write_text(data, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def parse_sequentially(paths):
+    graph = Graph()
+    for path in paths:
+        graph.parse(path)
+    return graph
+
+
+def test_files_are_split_into_chunks_at_line_breaks(tmp_path):
+    path = write_files(tmp_path)[0]
+    ranges = split_lines(path, chunk_size=200)
+    assert len(ranges) > 2
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(FILE_A.encode("utf-8"))
+    data = FILE_A.encode("utf-8")
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[end - 1:end] == b"\n"
+
+
+def test_a_chunked_load_equals_a_sequential_parse(tmp_path):
+    paths = write_files(tmp_path)
+    graph = load_graphs(paths, max_workers=2, chunk_size=200)
+    sequential = parse_sequentially(paths)
+
+    assert len(graph) == len(sequential)
+    assert isomorphic(graph, sequential)
+
+
+def test_blank_node_labels_are_scoped_per_file(tmp_path):
+    graph = load_graphs(write_files(tmp_path), max_workers=2, chunk_size=200)
+
+    addresses = {person: graph.value(URIRef(f"https://orcid.org/{person}"), SCHEMA.address) for person in "ab"}
+    assert all(isinstance(address, BNode) for address in addresses.values())
+    # The files' _:b0 are different nodes ...
+    assert addresses["a"] != addresses["b"]
+    # ... but within a file, the chunks with the first and the last line agree on it
+    assert str(graph.value(addresses["a"], SCHEMA.addressLocality)) == "Karlsruhe"
+    assert str(graph.value(addresses["b"], SCHEMA.addressLocality)) == "Jülich"
+    assert len(set(graph.subjects(SCHEMA.addressLocality, None))) == 2
+
+
+def test_other_formats_are_loaded_whole(tmp_path):
+    paths = write_files(tmp_path)
+    turtle = tmp_path / "a.ttl"
+    parse_sequentially(paths[:1]).serialize(str(turtle), format="turtle")
+    compressed = tmp_path / "b.nt.gz"
+    with gzip.open(compressed, "wt", encoding="utf-8") as f:
+        f.write(FILE_B)
+
+    graph = load_graphs([str(turtle), str(compressed)], max_workers=2, chunk_size=200)
+    assert isomorphic(graph, parse_sequentially(paths))
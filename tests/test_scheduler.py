@@ -0,0 +1,178 @@
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+import scheduler
+from conftest import make_response
+from scheduler import RequestScheduler, get_retry_after
+
+URL = "https://api.github.com/orgs/example"
+LOGGER = logging.getLogger("test_scheduler")
+
+
+class FakeTime:
+    """Stand-in for the `time` module of the scheduler, where sleeping only advances the clock."""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(scheduler, "time", clock)
+    return clock
+
+
+def sender(*responses):
+    """Returns a `send` function answering with `responses` one after another (exceptions are raised)."""
+    responses = list(responses)
+    sent = []
+
+    def send(url, **kwargs):
+        sent.append(url)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    send.sent = sent
+    return send
+
+
+def unpaced_scheduler(**kwargs):
+    """Scheduler without a request budget for URL, so retries sleep instead of pausing the budget."""
+    request_scheduler = RequestScheduler(backoff_base=0, **kwargs)
+    request_scheduler.rate_limits.pop("api.github.com")
+    return request_scheduler
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_transient_failures_are_retried(clock, status):
+    send = sender(make_response(status), make_response(200, {"ok": True}))
+    response = unpaced_scheduler().request(send, URL, LOGGER)
+    assert response.status_code == 200
+    assert len(send.sent) == 2
+
+
+@pytest.mark.parametrize("status", [400, 401, 404, 422])
+def test_other_failures_are_not_retried(clock, status):
+    send = sender(make_response(status))
+    assert unpaced_scheduler().request(send, URL, LOGGER).status_code == status
+    assert len(send.sent) == 1
+
+
+def test_the_last_response_is_returned_after_all_retries(clock):
+    send = sender(*[make_response(503)] * 4)
+    response = unpaced_scheduler(max_retries=3).request(send, URL, LOGGER)
+    assert response.status_code == 503
+    assert len(send.sent) == 4
+
+
+def test_connection_errors_are_retried_and_raised_after_all_retries(clock):
+    error = requests.exceptions.ConnectionError("connection reset")
+    send = sender(error, make_response(200, {}))
+    assert unpaced_scheduler().request(send, URL, LOGGER).status_code == 200
+
+    send = sender(error, error, error)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        unpaced_scheduler(max_retries=2).request(send, URL, LOGGER)
+    assert len(send.sent) == 3
+
+
+@pytest.mark.parametrize("headers, retried", [
+    ({"X-RateLimit-Remaining": "0"}, True),
+    ({"Retry-After": "1"}, True),
+    ({"X-RateLimit-Remaining": "12"}, False),
+    ({}, False),
+])
+def test_github_rate_limit_403_is_retried(clock, headers, retried):
+    send = sender(make_response(403, {"message": "rate limit"}, headers), make_response(200, {}))
+    response = unpaced_scheduler().request(send, URL, LOGGER)
+    assert response.status_code == (200 if retried else 403)
+
+
+def test_retry_after_takes_precedence_over_the_backoff(clock):
+    send = sender(make_response(429, headers={"Retry-After": "7"}), make_response(200, {}))
+    unpaced_scheduler().request(send, URL, LOGGER)
+    assert clock.sleeps == [7.0]
+
+
+def test_retry_after_pauses_the_budget_of_the_host(clock):
+    send = sender(make_response(429, headers={"Retry-After": "7"}), make_response(200, {}))
+    RequestScheduler(backoff_base=0).request(send, URL, LOGGER)
+    # The second attempt waited for the pause instead of sleeping in the retry loop
+    assert sum(clock.sleeps) == pytest.approx(7.0)
+
+
+def test_retry_after_dates(clock):
+    date = format_datetime(datetime.fromtimestamp(clock.now + 30, timezone.utc), usegmt=True)
+    assert get_retry_after(make_response(429, headers={"Retry-After": date})) == pytest.approx(30, abs=1)
+    assert get_retry_after(make_response(429, headers={"Retry-After": "soon"})) is None
+    assert get_retry_after(make_response(429)) is None
+
+
+def rate_limit_headers(clock, remaining, reset_in, limit=5000):
+    return {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(int(clock.now + reset_in)),
+            "X-RateLimit-Limit": str(limit)}
+
+
+def test_requests_pause_until_the_reset_once_the_reserve_is_reached(clock):
+    request_scheduler = RequestScheduler(reserve=10)
+    send = sender(make_response(200, {}, rate_limit_headers(clock, 10, 60)), make_response(200, {}))
+    request_scheduler.request(send, URL, LOGGER)
+    assert clock.sleeps == []
+
+    request_scheduler.request(send, URL, LOGGER)
+    assert sum(clock.sleeps) == pytest.approx(61)
+
+
+def test_a_low_budget_is_spread_until_the_reset(clock):
+    request_scheduler = RequestScheduler(reserve=10)
+    budget = request_scheduler.get_budget("api.github.com")
+    send = sender(make_response(200, {}, rate_limit_headers(clock, 110, 100, limit=1000)))
+    request_scheduler.request(send, URL, LOGGER)
+    assert budget.rate == pytest.approx(100 * 0.95 / 100)
+
+    # A new window restores the full rate
+    send = sender(make_response(200, {}, rate_limit_headers(clock, 4999, 3600)))
+    request_scheduler.request(send, URL, LOGGER)
+    assert budget.rate == budget.max_rate
+
+
+@pytest.mark.parametrize("headers", [
+    {"X-RateLimit-Remaining": "many", "X-RateLimit-Reset": "1700000060"},
+    {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "tomorrow"},
+    {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "1700000060", "X-RateLimit-Limit": ""},
+])
+def test_malformed_rate_limit_headers_are_ignored(clock, headers):
+    request_scheduler = RequestScheduler()
+    budget = request_scheduler.get_budget("api.github.com")
+    send = sender(make_response(200, {}, headers), make_response(200, {}))
+    assert request_scheduler.request(send, URL, LOGGER).status_code == 200
+    assert budget.paused_until == 0 and budget.rate == budget.max_rate
+    request_scheduler.request(send, URL, LOGGER)
+    assert clock.sleeps == []
+
+
+def test_requests_are_paced_to_the_rate_limit(clock):
+    request_scheduler = RequestScheduler(rate_limits={"api.github.com": (2, 3)})
+    send = sender(*[make_response(200, {})] * 5)
+    for _ in range(5):
+        request_scheduler.request(send, URL, LOGGER)
+    # The burst of 3 is sent at once, the other requests at 2 per second
+    assert sum(clock.sleeps) == pytest.approx(1.0)
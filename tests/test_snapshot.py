@@ -0,0 +1,71 @@
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, URIRef, XSD
+from rdflib.compare import isomorphic
+
+from snapshot import load_snapshot, save_snapshot
+
+SCHEMA = Namespace("http://schema.org/")
+PERSON = URIRef("https://orcid.org/0000-0002-0000-0001")
+
+
+def edge_case_graph():
+    graph = Graph()
+    address = BNode()
+    graph.add((PERSON, SCHEMA.address, address))
+    graph.add((address, SCHEMA.addressLocality, Literal("Jülich")))
+    graph.add((BNode(), SCHEMA.sameAs, BNode()))  # Blank nodes without any other triple
+    graph.add((PERSON, SCHEMA.name, Literal("Anna", lang="de")))
+    graph.add((PERSON, SCHEMA.name, Literal("Anna", lang="en-GB")))
+    graph.add((PERSON, SCHEMA.name, Literal("Anna")))
+    graph.add((PERSON, SCHEMA.description, Literal("first line\nsecond line\r\n\tindented \"quoted\"")))
+    graph.add((PERSON, SCHEMA.description, Literal("")))
+    graph.add((PERSON, SCHEMA.description, Literal("", lang="en")))
+    graph.add((PERSON, SCHEMA.position, Literal("01", datatype=XSD.integer, normalize=False)))
+    graph.add((PERSON, SCHEMA.position, Literal("1", datatype=XSD.integer)))
+    graph.add((PERSON, SCHEMA.position, Literal("abc", datatype=XSD.integer)))  # Ill-typed
+    graph.add((PERSON, SCHEMA.height, Literal("1.50", datatype=XSD.decimal)))
+    graph.add((PERSON, SCHEMA.birthDate, Literal("2024-01-01", datatype=XSD.date)))
+    graph.add((PERSON, SCHEMA.url, URIRef("https://example.org/ä?q=1#frag")))
+    graph.add((PERSON, SCHEMA.identifier, Literal("https://example.org", datatype=URIRef("https://example.org/type"))))
+    return graph
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("graph", [edge_case_graph(), Graph()], ids=["edge_cases", "empty"])
+def test_snapshots_round_trip(tmp_path, graph, compress):
+    path = str(tmp_path / "graph.snap")
+    save_snapshot(graph, path, compress=compress)
+    loaded = load_snapshot(path)
+
+    assert len(loaded) == len(graph)
+    assert isomorphic(loaded, graph)
+
+
+def test_terms_keep_their_lexical_form_language_and_datatype(tmp_path):
+    graph = edge_case_graph()
+    path = str(tmp_path / "graph.snap")
+    save_snapshot(graph, path)
+    loaded = load_snapshot(path)
+
+    literals = {(str(o), o.language, o.datatype) for o in loaded.objects(PERSON, None) if isinstance(o, Literal)}
+    assert literals == {(str(o), o.language, o.datatype) for o in graph.objects(PERSON, None) if isinstance(o, Literal)}
+    assert ("01", None, XSD.integer) in literals
+    # Blank nodes keep their identifiers
+    assert set(loaded.all_nodes()) == set(graph.all_nodes())
+
+
+def test_snapshots_are_loaded_into_the_given_graph(tmp_path):
+    path = str(tmp_path / "graph.snap")
+    save_snapshot(edge_case_graph(), path)
+    graph = Graph()
+    graph.add((PERSON, SCHEMA.familyName, Literal("Schmidt")))
+
+    assert load_snapshot(path, graph) is graph
+    assert len(graph) == len(edge_case_graph()) + 1
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "graph.ttl"
+    path.write_bytes(b"@prefix schema: <http://schema.org/> .\n" + b" " * 64)
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
@@ -0,0 +1,110 @@
+from rdflib import Graph, Literal, Namespace, RDF, URIRef
+
+from views import GraphViews, bump_graph_version, get_graph_views, graph_version
+from visualizer import PERSON_NEIGHBOURHOOD_QUERY, get_node_index, get_subgraph
+
+SCHEMA = Namespace("http://schema.org/")
+ORG = URIRef("https://ror.org/02nv7yv05")
+REPOS = {name: URIRef(f"https://api.github.com/repositories/{i}") for i, name in enumerate(("r1", "r2", "r3"))}
+PERSONS = {name: URIRef(f"https://orcid.org/0000-0002-0000-000{i}") for i, name in enumerate("abcd")}
+
+
+def example_graph():
+    graph = Graph()
+    for repo, contributors in (("r1", "abc"), ("r2", "ab"), ("r3", "bd")):
+        graph.add((REPOS[repo], RDF.type, SCHEMA.SoftwareSourceCode))
+        graph.add((REPOS[repo], SCHEMA.sourceOrganisation, ORG))
+        for person in contributors:
+            graph.add((REPOS[repo], SCHEMA.contributor, PERSONS[person]))
+    for person, iri in PERSONS.items():
+        graph.add((iri, RDF.type, SCHEMA.Person))
+        graph.add((iri, SCHEMA.familyName, Literal(f"Family {person}")))
+        graph.add((iri, SCHEMA.affiliation, ORG))
+    return graph
+
+
+def view_tables(views):
+    """The contents of the views without empty entries, to compare them with freshly built ones."""
+    return {
+        "contributors": {repo: persons for repo, persons in views.contributors.items() if persons},
+        "repos": {person: repos for person, repos in views.repos.items() if repos},
+        "co_contributors": {person: dict(counts) for person, counts in views.co_contributors.items() if counts},
+        "affiliations": {person: orgs for person, orgs in views.affiliations.items() if orgs},
+        "family_names": {person: names for person, names in views.family_names.items() if names},
+    }
+
+
+def test_co_contributors():
+    views = GraphViews(example_graph())
+    assert views.co_contributors_of(PERSONS["b"]) == [(PERSONS["a"], 2), (PERSONS["c"], 1), (PERSONS["d"], 1)]
+    assert views.co_contributor_pairs(min_shared_repos=2) == {(PERSONS["a"], PERSONS["b"]): 2}
+    assert views.contributor_counts(ORG) == {REPOS["r1"]: 3, REPOS["r2"]: 2, REPOS["r3"]: 2}
+
+
+def test_refresh_after_a_contributor_was_removed():
+    graph = example_graph()
+    views = GraphViews(graph)
+    graph.remove((REPOS["r1"], SCHEMA.contributor, PERSONS["a"]))
+    views.refresh([REPOS["r1"]])
+
+    assert views.contributors_of(REPOS["r1"]) == [PERSONS["b"], PERSONS["c"]]
+    assert views.repos_of(PERSONS["a"]) == [REPOS["r2"]]
+    assert views.co_contributors_of(PERSONS["a"]) == [(PERSONS["b"], 1)]
+    assert views.co_contributors_of(PERSONS["b"]) == [(PERSONS["a"], 1), (PERSONS["c"], 1), (PERSONS["d"], 1)]
+    assert views.co_contributors_of(PERSONS["c"]) == [(PERSONS["b"], 1)]
+    assert view_tables(views) == view_tables(GraphViews(graph))
+
+
+def test_refresh_after_repositories_and_persons_changed():
+    graph = example_graph()
+    views = GraphViews(graph)
+    # r3 is rebuilt with other contributors, and person d changed their name and affiliation
+    graph.remove((REPOS["r3"], None, None))
+    graph.add((REPOS["r3"], SCHEMA.contributor, PERSONS["c"]))
+    graph.add((REPOS["r3"], SCHEMA.contributor, PERSONS["a"]))
+    graph.set((PERSONS["d"], SCHEMA.familyName, Literal("Other")))
+    graph.remove((PERSONS["d"], SCHEMA.affiliation, ORG))
+    views.refresh([REPOS["r3"], PERSONS["d"]])
+
+    assert views.co_contributors_of(PERSONS["d"]) == []
+    assert views.persons_by_family_name("Other") == [PERSONS["d"]]
+    assert views.persons_by_family_name("Family d") == []
+    assert PERSONS["d"] not in views.persons_affiliated_with(ORG)
+    assert view_tables(views) == view_tables(GraphViews(graph))
+
+
+def test_views_are_rebuilt_after_edits_that_keep_the_number_of_triples():
+    graph = example_graph()
+    views = get_graph_views(graph)
+    assert get_graph_views(graph) is views and views.fingerprint == graph_version(graph)
+
+    # Replace a contributor: the number of triples stays the same
+    graph.remove((REPOS["r3"], SCHEMA.contributor, PERSONS["d"]))
+    graph.add((REPOS["r3"], SCHEMA.contributor, PERSONS["c"]))
+    bump_graph_version(graph)
+
+    views = get_graph_views(graph)
+    assert views.contributors_of(REPOS["r3"]) == [PERSONS["b"], PERSONS["c"]]
+    assert view_tables(views) == view_tables(GraphViews(graph))
+
+
+def test_views_are_rebuilt_after_added_triples():
+    graph = example_graph()
+    get_graph_views(graph)
+    graph.add((REPOS["r2"], SCHEMA.contributor, PERSONS["d"]))
+    assert get_graph_views(graph).contributors_of(REPOS["r2"]) == [PERSONS["a"], PERSONS["b"], PERSONS["d"]]
+
+
+def test_visualizer_caches_follow_the_graph_version():
+    graph = example_graph()
+    persons = get_subgraph(graph, PERSON_NEIGHBOURHOOD_QUERY)
+    node_index = get_node_index(graph)
+    assert get_subgraph(graph, PERSON_NEIGHBOURHOOD_QUERY) is persons
+    assert get_node_index(graph) is node_index
+
+    graph.remove((PERSONS["d"], RDF.type, SCHEMA.Person))
+    graph.add((PERSONS["d"], RDF.type, SCHEMA.Organization))
+    bump_graph_version(graph)
+
+    assert (PERSONS["d"], SCHEMA.familyName, Literal("Family d")) not in get_subgraph(graph, PERSON_NEIGHBOURHOOD_QUERY)
+    assert get_node_index(graph) is not node_index
@@ -1,12 +1,112 @@
+import atexit
+import contextvars
+import hashlib
+import itertools
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from urllib.parse import urlparse
 import requests
+from requests.utils import parse_header_links
 from mappers import *
-from rdflib import Graph
+from orcid_candidates import name_key, split_name
+from checkpoint import BuildCheckpoint
+from instrumentation import NoInstrumentation
+from scheduler import RequestScheduler
+from sessions import SessionPool
+from views import bump_graph_version, get_graph_views, refresh_graph_views
+from rdflib import BNode, Dataset, Graph, Namespace, RDF, URIRef
 from rdflib.extras.external_graph_libs import rdflib_to_networkx_graph
 from pyvis.network import Network
 
-def build_graph_from_github_org(github_org_name, corresponding_ror_id, github_token, orcid_token):
+# Maximum number of concurrent requests per API host, shared by all worker threads.
+# Hosts that are not listed are not limited.
+API_CONCURRENCY = {
+    "api.github.com": 8,
+    "pub.orcid.org": 8,
+    "api.ror.org": 4,
+    "query.wikidata.org": 2,
+}
+_api_semaphores = {}
+_api_semaphores_lock = threading.Lock()
+
+SCHEMA = Namespace("http://schema.org/")
+
+# Base URLs of the APIs, see `set_api_urls` (e.g. to run builds against a local replay server)
+API_URLS = {
+    "github": "https://api.github.com",
+    "orcid": "https://pub.orcid.org/v3.0",
+    "ror": "https://api.ror.org",
+    "wikidata": "https://query.wikidata.org/sparql",
+}
+
+# Memoized ROR IDs of GRID and Ringgold identifiers, shared by all builds.
+# Keys are ("grid", GRID ID) or ("ringgold", Ringgold ID), unresolvable identifiers map to None.
+ror_id_memo = {}
+_ror_id_memo_lock = threading.Lock()
+
+# WikiData properties of the identifiers that are resolved to ROR IDs in batches
+WIKIDATA_ID_PROPERTIES = {"ringgold": "P3500", "grid": "P2427"}
+WIKIDATA_BATCH_SIZE = 100
+
+# Optional persistent response cache used by fetch, see `set_response_cache`
+response_cache = None
+
+# Optional local index of the ROR data dump used by the ROR resolvers, see `set_ror_index`
+ror_index = None
+
+# Optional persistent store of ORCID search results and GitHub login -> ORCID ID matches,
+# see `set_orcid_candidate_store`
+orcid_candidate_store = None
+
+# Number of names searched in one ORCID expanded-search query, and the number of results requested
+ORCID_SEARCH_BATCH_SIZE = 10
+ORCID_SEARCH_ROWS = 200
+
+# Scheduler that paces and retries all requests sent by fetch, see `set_request_scheduler`
+request_scheduler = RequestScheduler()
+
+# Shared keep-alive HTTP sessions (one per API host) used by fetch, see `set_session_pool`
+session_pool = SessionPool()
+
+# Collects stage timings and request statistics, see `set_instrumentation`. Does nothing by default.
+active_instrumentation = NoInstrumentation()
+
+# Settings of the running build that override the module globals above, see `build_settings`
+current_build_settings = contextvars.ContextVar("build_settings", default={})
+
+# Level of the per-request log messages of fetch, and only every `request_log_every`-th request
+# is logged. Failed requests are always logged. See `set_request_logging`.
+request_log_level = logging.DEBUG
+request_log_every = 1
+_request_log_counter = itertools.count()
+
+# Requests per (host, outcome) since the last `log_request_summary`
+request_counts = Counter()
+_request_counts_lock = threading.Lock()
+
+# Background threads writing the records of the asynchronous loggers, see `get_logger`
+_log_listeners = {}
+
+# ORCID v3.0 record sections that can be fetched instead of the full JSON-LD record, see `set_orcid_sections`
+ORCID_SECTIONS = ("person", "employments", "educations", "works")
+
+# Sections fetched per ORCID record, or None to fetch the full JSON-LD record (including all works)
+orcid_sections = None
+
+def build_graph_from_github_org(github_org_name, corresponding_ror_id, github_token, orcid_token,
+                                max_workers=1, api_concurrency=None, registry=None, cache=None,
+                                state_file=None, ror_index=None, graph=None, checkpoint_dir=None,
+                                checkpoint_every=10, resume=False, instrumentation=None, orcid_sections=None,
+                                orcid_store=None, sink=None):
     """
     Builds an RDF graph representing a GitHub organization's repositories and contributors, 
     enriched with data from ORCID and ROR APIs. 
@@ -17,6 +117,41 @@ def build_graph_from_github_org(github_org_name, corresponding_ror_id, github_to
                                     (e.g., "https://ror.org/02nv7yv05").
         github_token (str): GitHub API access token for authenticating API requests.
         orcid_token (str): ORCID API access token for authenticating API requests.
+        max_workers (int): Number of repositories enriched concurrently. With the default of 1
+                           the repositories are processed one after another.
+        api_concurrency (dict): Optional maximum number of concurrent requests per API host
+                                (e.g. {"api.github.com": 8}), overriding `API_CONCURRENCY`.
+        registry (EntityRegistry): Optional registry of already resolved contributors.
+                                   A new one is created for every build by default.
+        cache (cache.ResponseCache): Optional persistent response cache for the API requests of this build.
+                                     See `set_response_cache` to use it for all `fetch` calls.
+        state_file (str): Optional JSON file to save the per-repository build state to. It is used by
+                          `update_graph_from_github_org` to refresh the graph incrementally.
+        ror_index (ror_index.RorIndex): Optional local index of the ROR data dump. ROR records and
+                                        GRID IDs are then resolved without network access.
+                                        See `set_ror_index` to use it for all calls.
+        graph (rdflib.Graph): Optional (empty) graph to build into, e.g. a graph backed by an on-disk
+                              store from `storage.open_graph`. A new in-memory graph is used by default.
+        checkpoint_dir (str): Optional directory for crash-safe checkpoints of the build. The graph and
+                              a journal of the completed repositories are saved every `checkpoint_every`
+                              repositories and when the build fails. They are removed once the build completed.
+        checkpoint_every (int): Number of completed repositories between two checkpoints.
+        resume (bool): If True, the build continues from the last checkpoint in `checkpoint_dir`
+                       instead of starting from zero.
+        instrumentation (instrumentation.Instrumentation): Optional collector of stage timings, triples
+                                                           per stage and per-API request statistics of this build.
+        orcid_sections (tuple): Optional ORCID record sections to fetch instead of the full JSON-LD record,
+                                e.g. ("person", "employments", "educations") to leave out the works, or
+                                with "works" to add them as lightweight summaries. See `set_orcid_sections`
+                                to fetch sections in all builds.
+        orcid_store (orcid_candidates.OrcidCandidateStore): Optional persistent store of ORCID search results
+                                                            and of the ORCID IDs of GitHub logins. Known logins and
+                                                            names are then resolved without requests, and new names
+                                                            are searched in batches. See `set_orcid_candidate_store`
+                                                            to use it for all calls.
+        sink (sink.TripleSink): Optional N-Triples/N-Quads file the triples are appended to while the graph
+                                is built: the organization first, then every repository with its newly
+                                resolved contributors as soon as it is added to the graph.
 
     Returns:
         rdflib.Graph: An RDF graph containing information about the organization, its repositories, 
@@ -31,81 +166,727 @@ def build_graph_from_github_org(github_org_name, corresponding_ror_id, github_to
             - `schema.org:SoftwareSourceCode`: Representing individual repositories.
         - Only contributors with an associated ORCID record are included in the graph.
         - Only organizations with an associated ROR ID record are included in the graph.
+        - The concurrent mode produces the same graph as the sequential one.
+        - Every contributor is resolved and added to the graph once, no matter in how many
+          repositories they appear.
+        - The build fails with a RuntimeError if a repository or contributor listing cannot be
+          fetched completely, instead of returning a graph with missing repositories.
+        - `api_concurrency`, `cache`, `ror_index`, `instrumentation`, `orcid_sections` and `orcid_store`
+          only apply to this build and its worker threads (see `build_settings`), so builds running at
+          the same time in other threads can use different ones.
     """
     # Initialize a logger for tracking the function's operations
     logger = get_logger(name="build_graph_logs", overwrite=True)
     logger.info(f"Starting the process to build an RDF graph for the GitHub organization: {github_org_name}.")
+    with build_settings(api_concurrency=api_concurrency, cache=cache, ror_index=ror_index,
+                        instrumentation=instrumentation, orcid_sections=orcid_sections, orcid_store=orcid_store):
+        # Initialize an RDFLib graph and the registry of resolved contributors
+        if graph is None:
+            graph = Graph()
+        if registry is None:
+            registry = EntityRegistry()
+
+        # Continue from the last checkpoint, reusing its completed repositories and resolved contributors
+        checkpoint = BuildCheckpoint(checkpoint_dir, every=checkpoint_every) if checkpoint_dir else None
+        completed_repos = {}
+        if checkpoint and resume:
+            journal = checkpoint.load(graph)
+            if journal:
+                if (journal["github_org_name"], journal["corresponding_ror_id"]) != (github_org_name, corresponding_ror_id):
+                    raise ValueError(f"The checkpoint in {checkpoint_dir} belongs to the GitHub organization "
+                                     f"{journal['github_org_name']}")
+                completed_repos = journal["repos"]
+                for login, orcid in journal["logins"].items():
+                    registry.add(registry.orcids, login, orcid)
+                registry.person_digests.update(journal.get("persons", {}))
+                for person in graph.subjects(RDF.type, SCHEMA.Person):
+                    registry.add(registry.persons, str(person).split("/")[-1], {"@id": str(person)})
+                logger.info(f"Resuming from the checkpoint in {checkpoint_dir} with {len(completed_repos)} completed repositories.")
+
+        # Step 1: Fetch and add the organization data from ROR to the graph
+        logger.info(f"Fetching organization data from ROR for ID: {corresponding_ror_id}")
+        with get_instrumentation().stage("organization", graph):
+            org = fetch_schema_org_organization_from_ror(corresponding_ror_id, logger)
+            if not org:
+                raise RuntimeError(f"Could not fetch the ROR record of the organization: {corresponding_ror_id}")
+            if (URIRef(org["@id"]), RDF.type, None) not in graph:  # Already part of a resumed graph
+                triples = add_registered_document(graph, org, registry)
+                if sink:
+                    sink.write(triples)
+
+        # Step 2: Fetch GitHub organization details
+        logger.info(f"Fetching GitHub organization details for: {github_org_name}")
+        with get_instrumentation().stage("github_organization"):
+            github_org = fetch_github_org(github_org_name, github_token, logger)
+        if not github_org:
+            raise RuntimeError(f"Could not fetch the GitHub organization: {github_org_name}")
+    
+        # Step 3: Fetch the repositories associated with the GitHub organization.
+        # They are streamed page by page, so the enrichment starts before the listing is complete.
+        logger.info(f"Fetching repositories for the organization: {github_org_name}")
+        repos = fetch_github_repos(github_org["repos_url"], github_token, logger)
+        if completed_repos:
+            repos = (repo for repo in repos if str(repo["id"]) not in completed_repos)
+
+        # Steps 4-8: Enrich the repositories and add them with their contributors to the graph
+        save_checkpoint = None
+        if checkpoint:
+            save_checkpoint = lambda records, force=False: checkpoint.save(
+                graph, make_build_state(github_org_name, corresponding_ror_id, {**completed_repos, **records}, registry),
+                force)
+        with get_instrumentation().stage("repositories", graph):
+            repo_records = add_repos_to_graph(graph, repos, org, github_token, orcid_token, logger,
+                                              registry, max_workers, save_checkpoint, sink)
+        repo_records = {**completed_repos, **repo_records}
+        logger.info(f"Found {len(repo_records)} repositories for the organization.")
+
+        # Remember what was built, so that `update_graph_from_github_org` can refresh the graph later
+        if state_file:
+            save_build_state(make_build_state(github_org_name, corresponding_ror_id, repo_records, registry),
+                             state_file)
+            logger.info(f"Saved the build state to {state_file}.")
+
+        # Materialize the aggregate views (contributors per repo, co-contributors, ...) of the graph
+        with get_instrumentation().stage("views"):
+            get_graph_views(graph)
+
+        if checkpoint:
+            checkpoint.clear()
+    
+        log_request_summary(logger)
+        logger.info("Graph building process completed successfully.")
+        # Return the constructed RDF graph
+        return graph
+
+
+def update_graph_from_github_org(github_org_name, corresponding_ror_id, github_token, orcid_token,
+                                 graph, state_file="graph_state.json", max_workers=1,
+                                 api_concurrency=None, cache=None, ror_index=None, orcid_store=None,
+                                 refresh_persons=True):
+    """
+    Incrementally refreshes a graph built by `build_graph_from_github_org`. Only repositories
+    that were pushed or updated since the last build and persons whose ORCID record changed
+    are re-parsed.
+
+    Args:
+        github_org_name (str): The GitHub organization name.
+        corresponding_ror_id (str): The ROR identifier for the organization.
+        github_token (str): GitHub API access token for authenticating API requests.
+        orcid_token (str): ORCID API access token for authenticating API requests.
+        graph (rdflib.Graph): The previously built graph (e.g. loaded from graph.ttl). It is updated in place.
+        state_file (str): JSON file with the per-repository state of the previous build.
+                          If it does not exist yet, all repositories are treated as changed.
+                          The file is rewritten at the end of the update.
+        max_workers (int): Number of repositories enriched concurrently.
+        api_concurrency (dict): Optional maximum number of concurrent requests per API host.
+        cache (cache.ResponseCache): Optional persistent response cache for all API requests.
+        ror_index (ror_index.RorIndex): Optional local index of the ROR data dump.
+        orcid_store (orcid_candidates.OrcidCandidateStore): Optional persistent store of ORCID search results.
+        refresh_persons (bool): If True, the ORCID records of the persons already in the graph are fetched
+                                again (see `refresh_changed_persons`). Use a response cache to only send
+                                requests for records older than its TTL.
+
+    Returns:
+        rdflib.Graph: The updated graph.
+
+    Raises:
+        RuntimeError: If the organization or its repository listing cannot be fetched. The graph and the
+                      state file are left unchanged then, so a failed listing never deletes repositories.
 
-    # Initialize an RDFLib graph
+    Notes:
+        - A repository counts as changed if its `pushed_at` or `updated_at` timestamp differs
+          from the stored one. Its triples are removed and rebuilt.
+        - Triples of repositories that no longer exist in the organization are removed.
+        - GitHub logins and ORCID records resolved in earlier builds are reused. Only contributors
+          that newly appear are looked up and added. Persons that are no longer contributors of any
+          repository are removed together with the works only they created.
+        - A person counts as changed if the digest of their ORCID record differs from the one in the
+          state file. Their triples are then replaced, keeping the links from the repositories.
+    """
+    logger = get_logger(name="build_graph_logs", overwrite=True)
+    logger.info(f"Starting the incremental update of the RDF graph for the GitHub organization: {github_org_name}.")
+    with build_settings(api_concurrency=api_concurrency, cache=cache, ror_index=ror_index, orcid_store=orcid_store):
+        state = load_build_state(state_file)
+        previous_repos = state.get("repos", {})
+
+        # Reuse the contributors resolved in earlier builds
+        registry = EntityRegistry()
+        for login, orcid in state.get("logins", {}).items():
+            registry.add(registry.orcids, login, orcid)
+        for person in graph.subjects(RDF.type, SCHEMA.Person):
+            registry.add(registry.persons, str(person).split("/")[-1], {"@id": str(person)})
+        registry.person_digests.update(state.get("persons", {}))
+        known_persons = set(registry.persons)
+
+        org = fetch_schema_org_organization_from_ror(corresponding_ror_id, logger)
+        if not org:
+            raise RuntimeError(f"Could not fetch the ROR record of the organization: {corresponding_ror_id}")
+        github_org = fetch_github_org(github_org_name, github_token, logger)
+        if not github_org:
+            raise RuntimeError(f"Could not fetch the GitHub organization: {github_org_name}")
+        # The complete listing is needed to tell deleted repositories apart. If a page fails,
+        # `fetch_paginated` raises before anything in the graph or the state file is changed.
+        repos = list(fetch_github_repos(github_org["repos_url"], github_token, logger))
+
+        # Add the organization unless it is already part of the graph
+        if (URIRef(org["@id"]), RDF.type, None) not in graph:
+            add_schema_org_document(graph, org)
+
+        # Remove repositories that were deleted or changed since the last build
+        current_ids = set()
+        changed_repos = []
+        repo_records = {}
+        for repo in repos:
+            current_ids.add(str(repo["id"]))
+            record = previous_repos.get(str(repo["id"]))
+            if record and record["pushed_at"] == repo.get("pushed_at") and record["updated_at"] == repo.get("updated_at"):
+                repo_records[str(repo["id"])] = record
+            else:
+                changed_repos.append(repo)
+                # Also without a state file, the repository may be part of the graph already
+                remove_entity(graph, URIRef(github_repo_to_SoftwareSourceCode(repo)["@id"]))
+        for repo_id, record in previous_repos.items():
+            if repo_id not in current_ids:
+                logger.info(f"Removing deleted repository: {record['iri']}")
+                remove_entity(graph, URIRef(record["iri"]))
+        logger.info(f"Found {len(current_ids)} repositories for the organization: {len(changed_repos)} new or changed, "
+                    f"{len(previous_repos.keys() - current_ids)} deleted.")
+
+        # Rebuild the changed repositories
+        repo_records.update(add_repos_to_graph(graph, changed_repos, org, github_token, orcid_token, logger,
+                                               registry, max_workers))
+
+        # Remove persons from the previous build that are no longer contributors of any repository
+        previous_persons = {iri for record in previous_repos.values() for iri in record["contributors"]}
+        current_persons = {iri for record in repo_records.values() for iri in record["contributors"]}
+        for iri in previous_persons - current_persons:
+            logger.info(f"Removing person that is no longer a contributor: {iri}")
+            remove_person(graph, URIRef(iri))
+
+        # Replace the persons from earlier builds whose ORCID record changed. The other persons
+        # were fetched for the changed repositories just now.
+        changed_persons = []
+        if refresh_persons:
+            persons = [iri for iri in current_persons if iri.split("/")[-1] in known_persons]
+            changed_persons = refresh_changed_persons(graph, persons, registry, orcid_token, logger, max_workers)
+            logger.info(f"Refreshed {len(persons)} persons: {len(changed_persons)} changed.")
+
+        # Refresh the materialized views of the changed repositories and persons
+        bump_graph_version(graph)
+        changed_records = [record for repo_id, record in previous_repos.items() if repo_records.get(repo_id) != record]
+        changed_records += [repo_records[str(repo["id"])] for repo in changed_repos]
+        refresh_graph_views(graph, {iri for record in changed_records for iri in [record["iri"], *record["contributors"]]}
+                            | set(changed_persons))
+
+        save_build_state(make_build_state(github_org_name, corresponding_ror_id, repo_records, registry), state_file)
+        log_request_summary(logger)
+        logger.info("Incremental update completed successfully.")
+        return graph
+
+
+def build_graphs_from_manifest(manifest, github_token, orcid_token, max_orgs=4, max_workers=1,
+                               api_concurrency=None, cache=None, ror_index=None, sink=None):
+    """
+    Builds the graphs of several GitHub organizations in parallel into one rdflib Dataset,
+    with one named graph per organization.
+
+    Args:
+        manifest (list or str): (GitHub organization name, ROR ID) pairs, or the path of a JSON file
+                                with a list of {"github_org": ..., "ror_id": ...} objects.
+        github_token (str): GitHub API access token for authenticating API requests.
+        orcid_token (str): ORCID API access token for authenticating API requests.
+        max_orgs (int): Number of organizations built concurrently.
+        max_workers (int): Number of repositories enriched concurrently per organization.
+        api_concurrency (dict): Optional maximum number of concurrent requests per API host.
+                                The limits are shared by all organizations.
+        cache (cache.ResponseCache): Optional persistent response cache for all API requests.
+        ror_index (ror_index.RorIndex): Optional local index of the ROR data dump.
+        sink (sink.TripleSink): Optional N-Quads file the triples of every organization are appended to
+                                (in its named graph) while it is built.
+
+    Returns:
+        rdflib.Dataset: The named graph of an organization is `dataset.graph(URIRef("https://github.com/<org>"))`.
+                        The dataset's default graph is the merged, deduplicated union of all organizations
+                        (e.g. for `dataset.query(...)`), see also `get_merged_graph`.
+
+    Notes:
+        - Contributors and organizations are fetched and enriched once for the whole batch. Every
+          named graph still contains all of its persons, with the same blank nodes in every graph,
+          so they are deduplicated in the union.
+        - Organizations that fail to build are logged and left out of the dataset.
+    """
+    logger = get_logger(name="build_graph_logs", overwrite=True)
+    if isinstance(manifest, str):
+        manifest = load_manifest(manifest)
+    logger.info(f"Starting the batch build of {len(manifest)} GitHub organizations.")
+
+    shared_registry = EntityRegistry()
+    def build(entry):
+        github_org_name, corresponding_ror_id = entry
+        return build_graph_from_github_org(github_org_name, corresponding_ror_id, github_token, orcid_token,
+                                           max_workers=max_workers, registry=EntityRegistry(parent=shared_registry),
+                                           sink=sink.named(f"https://github.com/{github_org_name}") if sink else None)
+
+    # The builds share the settings of the batch, e.g. one set of concurrency limits for all organizations
+    dataset = Dataset(default_union=True)
+    with build_settings(api_concurrency=api_concurrency, cache=cache, ror_index=ror_index), \
+            ThreadPoolExecutor(max_workers=max_orgs) as executor:
+        futures = [executor.submit(with_build_settings(build), entry) for entry in manifest]
+        for (github_org_name, _), future in zip(manifest, futures):
+            try:
+                graph = future.result()
+            except Exception as e:
+                logger.error(f"Failed to build the graph of the GitHub organization {github_org_name}: {e}")
+                continue
+            # rdflib graphs are not thread-safe, so the named graphs are filled in this thread
+            named_graph = dataset.graph(URIRef(f"https://github.com/{github_org_name}"))
+            named_graph.addN((s, p, o, named_graph) for s, p, o in graph)
+            logger.info(f"Added {len(graph)} triples of the GitHub organization {github_org_name} to the dataset.")
+
+    logger.info("Batch build completed successfully.")
+    return dataset
+
+
+def load_manifest(manifest_file):
+    with open(manifest_file, encoding="utf-8") as f:
+        return [(entry["github_org"], entry["ror_id"]) for entry in json.load(f)]
+
+
+def get_merged_graph(dataset):
+    """Returns the union of all named graphs of `dataset` as a single, deduplicated graph."""
     graph = Graph()
+    graph.addN((s, p, o, graph) for s, p, o, _ in dataset.quads((None, None, None, None)))
+    return graph
 
-    # Step 1: Fetch and add the organization data from ROR to the graph
-    logger.info(f"Fetching organization data from ROR for ID: {corresponding_ror_id}")
-    org = fetch_schema_org_organization_from_ror(corresponding_ror_id, logger)
-    graph.parse(data=org, format="json-ld")
-
-    # Step 2: Fetch GitHub organization details
-    logger.info(f"Fetching GitHub organization details for: {github_org_name}")
-    github_org = fetch_github_org(github_org_name, github_token, logger)
-    
-    # Step 3: Fetch the repositories associated with the GitHub organization
-    logger.info(f"Fetching repositories for the organization: {github_org_name}")
-    repos = fetch_github_repos(github_org["repos_url"], github_token, logger)
-    logger.info(f"Found {len(repos)} repositories for the organization.")
-
-    for repo in repos:
-        # Step 4: Convert the repository data to schema.org SoftwareSourceCode format
-        logger.info(f"Processing repository: {repo.get('name', 'Unknown Name')}")
-        source_code = github_repo_to_SoftwareSourceCode(repo)
-        source_code["sourceOrganisation"] = org  # Link the repository to the organization
-        source_code["contributor"] = []  # Initialize an empty list for contributors
-        
-        # Step 5: Fetch contributors for the current repository
-        contributors = fetch_github_contributors(repo["contributors_url"], github_token, logger)
-        logger.info(f"Found {len(contributors)} contributors for the repository: {repo.get('name', 'Unknown Name')}")
+
+def add_repos_to_graph(graph, repos, org, github_token, orcid_token, logger, registry, max_workers=1,
+                       save_checkpoint=None, sink=None):
+    """
+    Enriches `repos` and adds them together with their newly resolved contributors to `graph`.
+    `save_checkpoint(repo_records, force=False)` is called after every added repository and with
+    `force=True` if the enrichment fails. The added triples are also written to `sink`, if given.
+
+    Returns:
+        dict: Per-repository build state records, keyed by the GitHub repository ID.
+    """
+    # Enrich the repositories, either one after another or in a thread pool.
+    # Results are yielded in repository order, so both paths produce the same graph.
+    def process(repo):
+        with get_instrumentation().stage("process_repo"):
+            return (repo,) + process_repo(repo, org, github_token, orcid_token, logger, registry)
+
+    if max_workers > 1:
+        logger.info(f"Processing repositories concurrently with {max_workers} workers.")
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        results = ordered_bounded_map(executor, with_build_settings(process), repos, window=2 * max_workers)
+    else:
+        executor = None
+        results = map(process, repos)
+
+    repo_records = {}
+    try:
+        for repo, source_code, persons in results:
+            # Add the data of newly resolved contributors to the graph.
+            # rdflib graphs are not thread-safe, so triples are always added in this thread.
+            with get_instrumentation().stage("add_to_graph"):
+                triples = []
+                for person in persons:
+                    triples += add_registered_document(graph, person, registry)
+                    # The graph has the person now, later appearances only need the reference
+                    registry.replace(registry.persons, person["@id"].split("/")[-1], {"@id": person["@id"]})
+
+                # Add the repository (SoftwareSourceCode) to the graph
+                triples += add_schema_org_document(graph, source_code)
+                bump_graph_version(graph)
+            if sink:
+                sink.write(triples)
+                sink.flush()
+            get_instrumentation().count("repos")
+            get_instrumentation().count("persons", len(persons))
+            logger.info(f"Repository {source_code.get('name', 'Unknown Name')} added to the graph.")
+
+            repo_records[str(repo["id"])] = {
+                "iri": source_code["@id"],
+                "pushed_at": repo.get("pushed_at"),
+                "updated_at": repo.get("updated_at"),
+                "contributors": [contributor["@id"] for contributor in source_code["contributor"]],
+            }
+            if save_checkpoint:
+                save_checkpoint(repo_records)
+    except BaseException:
+        # Keep the repositories that were completed so far
+        if save_checkpoint and repo_records:
+            save_checkpoint(repo_records, force=True)
+            logger.info("Saved a checkpoint of the completed repositories.")
+        raise
+    finally:
+        if executor:
+            executor.shutdown()
+    return repo_records
+
+
+def add_registered_document(graph, document, registry):
+    """
+    Adds a schema.org document with an @id to `graph`. If `registry` has a parent shared by several builds,
+    the triples are generated once and kept in the registries, so the graphs of the builds contain the same
+    blank nodes for the same entity. Single builds do not keep them.
+    """
+    if registry.parent is None:
+        return add_schema_org_document(graph, document)
+    triples, _ = registry.resolve(registry.documents, document["@id"], lambda: get_schema_org_triples(document))
+    graph.addN((s, p, o, graph) for s, p, o in triples)
+    return triples
+
+
+def ordered_bounded_map(executor, fn, iterable, window):
+    """
+    Like `executor.map`, but consumes `iterable` lazily and keeps at most `window`
+    tasks in flight, so memory stays flat for long (streamed) inputs.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def make_build_state(github_org_name, corresponding_ror_id, repo_records, registry):
+    persons = {iri for record in repo_records.values() for iri in record["contributors"]}
+    return {
+        "github_org_name": github_org_name,
+        "corresponding_ror_id": corresponding_ror_id,
+        "repos": repo_records,
+        "logins": registry.resolved(registry.orcids),
+        "persons": {iri: digest for iri, digest in registry.person_digests.items() if iri in persons},
+    }
+
+def record_digest(record):
+    """Digest of a fetched (not yet enriched) ORCID record, used to detect changed persons."""
+    return hashlib.sha1(json.dumps(record, sort_keys=True).encode("utf-8")).hexdigest()
+
+def load_build_state(state_file):
+    if not os.path.exists(state_file):
+        return {}
+    with open(state_file, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_build_state(state, state_file):
+    # Write to a temporary file first, so an interrupted run never leaves a truncated state file
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp_file, state_file)
+
+def remove_entity(graph, node):
+    """Removes all triples of `node` and of the blank nodes that only it references."""
+    for _, _, obj in list(graph.triples((node, None, None))):
+        graph.remove((node, None, obj))
+        if isinstance(obj, BNode) and (None, None, obj) not in graph:
+            remove_entity(graph, obj)
+
+def remove_person(graph, person):
+    """Removes a person and the creative works that no other person in the graph created."""
+    for work in list(graph.subjects(SCHEMA.creator, person)):
+        graph.remove((work, SCHEMA.creator, person))
+        if (work, SCHEMA.creator, None) not in graph:
+            remove_entity(graph, work)
+    remove_entity(graph, person)
+
+def refresh_changed_persons(graph, persons, registry, orcid_token, logger, max_workers=1):
+    """
+    Fetches the ORCID records of `persons` (IRIs of persons in `graph`) again and replaces the
+    triples of those whose record digest differs from the one in `registry.person_digests`.
+    Persons whose record cannot be fetched are kept as they are.
+
+    Returns:
+        list: The IRIs of the replaced persons.
+    """
+    def fetch_if_changed(iri):
+        person = fetch_contributor_orcid_person(iri.split("/")[-1], orcid_token, logger)
+        if not person or registry.person_digests.get(iri) == record_digest(person):
+            return None
+        return person
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fetched = executor.map(with_build_settings(fetch_if_changed), persons)
+        changed = [(iri, person) for iri, person in zip(persons, fetched) if person]
+
+    # Resolve the organizations of all changed persons in one batch, like `process_repo`
+    identifiers = set()
+    for _, person in changed:
+        identifiers |= collect_organization_identifiers(person)
+    resolve_organization_identifiers(identifiers, logger)
+    for iri, person in changed:
+        registry.person_digests[iri] = record_digest(person)
+        logger.info(f"Replacing person whose ORCID record changed: {iri}")
+        # Only the person's own triples (and works) are removed, the contributor links stay
+        remove_person(graph, URIRef(iri))
+        add_schema_org_document(graph, update_person_organizations_with_ror(person, logger))
+    return [iri for iri, _ in changed]
+
+
+def process_repo(repo, org, github_token, orcid_token, logger, registry):
+    """
+    Fetches and enriches the contributors of a single repository.
+
+    Contributors are resolved through the per-build `registry`, so a person is only fetched
+    and enriched the first time they show up. Later appearances only link the person by @id.
+
+    Returns:
+        tuple: The repository in schema.org SoftwareSourceCode format and the list of
+               enriched schema.org Person records that were resolved for this repository.
+    """
+    # Step 4: Convert the repository data to schema.org SoftwareSourceCode format
+    logger.debug("Processing repository: %s", repo.get('name', 'Unknown Name'))
+    source_code = github_repo_to_SoftwareSourceCode(repo)
+    source_code["sourceOrganisation"] = {"@id": org["@id"]}  # Link the repository to the organization
+    source_code["contributor"] = []  # Initialize an empty list for contributors
+    new_persons = []
+    
+    # Step 5: Fetch contributors for the current repository
+    contributors = fetch_github_contributors(repo["contributors_url"], github_token, logger)
+    if get_orcid_candidate_store():
+        # Search the names of all new contributors of the repository at once
+        contributors = list(contributors)
+        with get_instrumentation().stage("orcid_lookup"):
+            prefetch_contributor_orcids(contributors, registry, github_token, orcid_token, logger)
+    n_contributors = 0
+    for contributor in contributors:
+        n_contributors += 1
+        # Step 6: Find the contributor's ORCID ID (once per GitHub login)
+        with get_instrumentation().stage("orcid_lookup"):
+            orcid, _ = registry.resolve(registry.orcids, contributor["login"],
+                                        lambda: lookup_contributor_orcid(contributor, github_token, orcid_token, logger))
+        if not orcid:
+            continue  # Skip contributors without an ORCID ID
         
-        for contributor in contributors:
-            # Fetch GitHub user details for the contributor
-            user = fetch_github_user(contributor["url"], github_token, logger)
-            
-            # Skip contributors without a proper name to avoid random orcids showing up in the graph
-            if not user["name"] or user["name"] == user["login"]:
-                logger.warning(f"Skipping contributor with no valid name: {user.get('login', 'Unknown Login')}")
-                continue
-            
-            # Step 6: Attempt to find the contributor's ORCID ID using their name
-            logger.info(f"Looking up ORCID for contributor: {user['name']}")
-            orcid = orcid_lookup(user["name"], orcid_token, logger)
-            if not orcid:
-                logger.warning(f"No ORCID found for contributor: {user['name']}")
-                continue  # Skip contributors without an ORCID ID
-            
-            # Step 7: Fetch the ORCID record for the contributor
-            logger.info(f"Fetching ORCID data for: {user['name']} ({orcid})")
-            person = fetch_orcid_person(orcid, orcid_token, logger, accept_header="ld+json")
-            
-            # Step 8: Try to find ROR IDs for all organizations listed in person.
-            # If org has ROR ID -> ROR ID is returned
-            # If org has GRID ID -> ROR API is fetched for the corresponding ROR ID
-            # If org has RINGGOLD ID -> WikiData is fetched for the corresponding ROR ID if available
-            # Organizations without ROR ID are excluded from the graph
-            logger.info(f"Updating organization data for contributor: {user['name']}")
-            person = update_person_organizations_with_ror(person, logger)
-            
-            # Add the contributor's enriched data to the graph
-            graph.parse(data=person, format="json-ld")
-            logger.info(f"Contributor {user['name']} added to the graph.")
-            
-            # Link the contributor to the current repository
-            source_code["contributor"].append(person)
+        # Step 7: Fetch the ORCID record (once per ORCID ID)
+        with get_instrumentation().stage("orcid_person"):
+            person, is_new = registry.resolve(registry.persons, orcid,
+                                              lambda: fetch_registered_orcid_person(orcid, orcid_token, logger, registry))
+        if not person:
+            continue  # Skip contributors whose ORCID record could not be fetched
+        if is_new:
+            new_persons.append(person)
         
-        # Add the repository (SoftwareSourceCode) to the graph
-        graph.parse(data=source_code, format="json-ld")
-        logger.info(f"Repository {repo.get('name', 'Unknown Name')} added to the graph.")
+        # Link the contributor to the current repository
+        source_code["contributor"].append({"@id": person.get("@id", f"https://orcid.org/{orcid}")})
     
-    logger.info("Graph building process completed successfully.")
-    # Return the constructed RDF graph
-    return graph
+    logger.info(f"Found {n_contributors} contributors for the repository: {repo.get('name', 'Unknown Name')}")
+    
+    # Step 8: Try to find ROR IDs for all organizations listed in the new persons.
+    # If org has ROR ID -> ROR ID is returned
+    # If org has GRID or RINGGOLD ID -> WikiData is queried for the corresponding ROR IDs,
+    # in batches for all persons of the repository. GRID IDs unknown to WikiData are looked up in the ROR API.
+    # Organizations without ROR ID are excluded from the graph
+    with get_instrumentation().stage("organization_resolvers"):
+        identifiers = set()
+        for person in new_persons:
+            identifiers |= collect_organization_identifiers(person)
+        resolve_organization_identifiers(identifiers, logger)
+        persons = [update_person_organizations_with_ror(person, logger) for person in new_persons]
+    
+    return source_code, persons
+
+
+def lookup_contributor_orcid(contributor, github_token, orcid_token, logger):
+    # Reuse the ORCID ID found for the login in earlier builds
+    store = get_orcid_candidate_store()
+    if store:
+        entry = store.login(contributor["login"])
+        if entry:
+            return entry["orcid"]
+
+    # Fetch GitHub user details for the contributor
+    user = fetch_github_user(contributor["url"], github_token, logger)
+    if not user:
+        logger.error(f"Failed to fetch GitHub user: {contributor.get('login', 'Unknown Login')}")
+        return None
+    
+    # Skip contributors without a proper name to avoid random orcids showing up in the graph
+    if not has_valid_name(user):
+        logger.warning(f"Skipping contributor with no valid name: {user.get('login', 'Unknown Login')}")
+        if store:
+            store.add_login(contributor["login"], user["name"], None)
+        return None
+    
+    # Attempt to find the contributor's ORCID ID using their name
+    logger.debug("Looking up ORCID for contributor: %s", user["name"])
+    orcid = orcid_lookup(user["name"], orcid_token, logger)
+    if not orcid:
+        logger.warning(f"No ORCID found for contributor: {user['name']}")
+    if store and store.candidates(user["name"]) is not None:  # Not if the search failed
+        store.add_login(contributor["login"], user["name"], orcid)
+    return orcid
+
+
+def has_valid_name(user):
+    return bool(user.get("name")) and user["name"] != user["login"]
+
+
+def prefetch_contributor_orcids(contributors, registry, github_token, orcid_token, logger):
+    """
+    Resolves the ORCID IDs of the GitHub `contributors` that are new to `registry`, searching the names
+    of those unknown to the ORCID candidate store (see `set_orcid_candidate_store`) in batched queries.
+    """
+    store = get_orcid_candidate_store()
+    contributors = {contributor["login"]: contributor for contributor in contributors}
+    claimed = registry.claim(registry.orcids, contributors)
+    try:
+        names = {}
+        for login in claimed:
+            if store.login(login):
+                continue
+            user = fetch_github_user(contributors[login]["url"], github_token, logger)
+            if not user:
+                continue  # Retried (and logged) by `lookup_contributor_orcid`
+            if has_valid_name(user):
+                names[login] = user["name"]
+            else:
+                logger.warning(f"Skipping contributor with no valid name: {login}")
+                store.add_login(login, user["name"], None)
+
+        search_orcid_candidates(list(names.values()), orcid_token, logger)
+        for login, name in names.items():
+            if store.candidates(name) is not None:  # Not if the search failed
+                store.add_login(login, name, store.best_candidate(name))
+
+        # Known to the store now, unless a request failed
+        while claimed:
+            registry.complete(registry.orcids, claimed[0],
+                              lookup_contributor_orcid(contributors[claimed[0]], github_token, orcid_token, logger))
+            claimed.pop(0)
+    except BaseException as e:
+        for login in claimed:
+            registry.complete(registry.orcids, login, exception=e)
+        raise
+
+
+def fetch_registered_orcid_person(orcid, orcid_token, logger, registry):
+    """Fetches an ORCID record and remembers its digest in `registry.person_digests`."""
+    person = fetch_contributor_orcid_person(orcid, orcid_token, logger)
+    if person:
+        registry.person_digests[person.get("@id", f"https://orcid.org/{orcid}")] = record_digest(person)
+    return person
+
+def fetch_contributor_orcid_person(orcid, orcid_token, logger):
+    logger.debug("Fetching ORCID data for: %s", orcid)
+    sections = get_orcid_sections()
+    if sections:
+        person = fetch_orcid_person_sections(orcid, orcid_token, logger, sections)
+    else:
+        person = fetch_orcid_person(orcid, orcid_token, logger, accept_header="ld+json")
+    if not person:
+        logger.error(f"Failed to fetch ORCID record: {orcid}")
+    return person
+
+
+class EntityRegistry:
+    """
+    Per-build registry of resolved entities, keyed by GitHub login (`orcids`), by
+    ORCID ID (`persons`) and by @id (`documents`). Every key is resolved exactly once, even when
+    several worker threads ask for it at the same time; the other threads wait for the first result.
+
+    Args:
+        parent (EntityRegistry): Optional registry shared by several builds. Keys that are new to this
+                                 registry are resolved through the parent, so each build still adds
+                                 every entity to its own graph, but it is only fetched once.
+    """
+
+    def __init__(self, parent=None):
+        self._lock = threading.Lock()
+        self.parent = parent
+        self.orcids = {}     # GitHub login -> Future of the ORCID ID (or None)
+        self.persons = {}    # ORCID ID -> Future of the enriched schema.org Person, or only its @id once it was added
+        self.documents = {}  # @id -> Future of the triples of the schema.org document (only with a parent)
+        # Person @id -> digest of the fetched ORCID record (see `record_digest`), shared with the parent
+        self.person_digests = parent.person_digests if parent is not None else {}
+
+    def add(self, table, key, value):
+        """Registers an already known value for `key` in `table`."""
+        future = Future()
+        future.set_result(value)
+        with self._lock:
+            table[key] = future
+
+    def replace(self, table, key, value):
+        """
+        Replaces the value of `key` in `table` and in the parent's table, e.g. by a reference to an entity
+        that was added to the graph, so the registries do not keep the whole record.
+        """
+        table_name = self.table_name(table)
+        registry = self
+        while registry is not None:
+            registry.add(getattr(registry, table_name), key, value)
+            registry = registry.parent
+
+    def table_name(self, table):
+        return next(name for name in ("orcids", "persons", "documents") if getattr(self, name) is table)
+
+    def resolved(self, table):
+        """Returns the successfully resolved values of `table` as a plain dict."""
+        with self._lock:
+            futures = dict(table)
+        return {key: future.result() for key, future in futures.items()
+                if future.done() and not future.exception()}
+
+    def claim(self, table, keys):
+        """
+        Registers the `keys` that are unknown to `table` as being resolved by the caller, who has to
+        `complete` every one of them. Meanwhile `resolve` waits for their values.
+
+        Returns:
+            list: The claimed keys.
+        """
+        with self._lock:
+            claimed = [key for key in dict.fromkeys(keys) if key not in table]
+            for key in claimed:
+                table[key] = Future()
+        return claimed
+
+    def complete(self, table, key, value=None, exception=None):
+        """Sets the value of a key claimed with `claim`, or forgets it again if resolving it raised `exception`."""
+        with self._lock:
+            future = table[key]
+            if exception is not None:
+                del table[key]
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(value)
+
+    def resolve(self, table, key, resolver):
+        """
+        Returns the value for `key` in `table`, calling `resolver` if it is unknown.
+
+        Returns:
+            tuple: The value and whether it was resolved by this call.
+        """
+        if self.parent is not None:
+            parent_table = getattr(self.parent, self.table_name(table))
+            resolve_once = resolver
+            resolver = lambda: self.parent.resolve(parent_table, key, resolve_once)[0]
+
+        with self._lock:
+            future = table.get(key)
+            is_new = future is None
+            if is_new:
+                future = table[key] = Future()
+        if not is_new:
+            return future.result(), False
+
+        try:
+            value = resolver()
+        except BaseException as e:
+            # Forget the failed key so a later appearance can try again
+            with self._lock:
+                del table[key]
+            future.set_exception(e)
+            raise
+        future.set_result(value)
+        return value, True
 
 
 # def build_graph_from_github_org(github_org_name, corresponding_ror_id, github_token, orcid_token):
@@ -137,7 +918,14 @@ def build_graph_from_github_org(github_org_name, corresponding_ror_id, github_to
     
 #     return graph
 
-def get_logger(name="app_logger", log_file="app.log", level=logging.DEBUG, overwrite=False):
+def get_logger(name="app_logger", log_file="app.log", level=logging.DEBUG, overwrite=False, asynchronous=True):
+    """
+    Returns the logger `name`, writing to `log_file` and (from INFO on) to the console.
+
+    With `asynchronous` the calling threads only put the log records into a queue. They are
+    formatted and written by a background thread, so slow consoles (e.g. in notebooks) and disk
+    I/O do not hold up the build. The queue is drained when the interpreter exits.
+    """
     
     # Create a logger with the given name
     logger = logging.getLogger(name)
@@ -154,20 +942,76 @@ def get_logger(name="app_logger", log_file="app.log", level=logging.DEBUG, overw
     else:
         file_handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=5,  encoding='utf-8')  # Append with rotation
     
-    # Create console handler
+    # Create console handler. Debug details (e.g. every request) only go to the log file.
     console_handler = logging.StreamHandler()
+    console_handler.setLevel(max(level, logging.INFO))
     
     # Define the log format
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
-    # Attach the handlers to the logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Attach the handlers to the logger, or to the background writer of the asynchronous logger
+    if asynchronous:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        _log_listeners[name] = listener
+        logger.addHandler(DeferredQueueHandler(log_queue))
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
     
     return logger
 
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves the formatting of the records to the background writer.
+    The standard QueueHandler formats every message in the logging thread, so that
+    records can be pickled, which is not needed for an in-process queue.
+    """
+
+    def prepare(self, record):
+        return record
+
+def flush_logger(logger):
+    """Waits until the background writer of an asynchronous logger (see `get_logger`) wrote all queued records."""
+    listener = _log_listeners.get(logger.name)
+    if listener:
+        listener.stop()
+        listener.start()
+
+def set_request_logging(level=logging.DEBUG, every=1):
+    """
+    Sets the level of the per-request log messages of `fetch`, and logs only every `every`-th
+    request (e.g. `every=100` to sample large builds). Failed requests are always logged, and the
+    builds log a summary of all requests at the end, see `log_request_summary`.
+    """
+    global request_log_level, request_log_every
+    request_log_level = level
+    request_log_every = max(1, every)
+
+def is_request_logged(logger):
+    return logger.isEnabledFor(request_log_level) and next(_request_log_counter) % request_log_every == 0
+
+def record_request(base_url, start, outcome):
+    """Counts a request of `fetch` for the summary and the active instrumentation."""
+    get_instrumentation().record_request(base_url, time.perf_counter() - start, outcome)
+    with _request_counts_lock:
+        request_counts[urlparse(base_url).netloc, outcome] += 1
+
+def log_request_summary(logger):
+    """Logs the number of requests per API host and outcome since the last summary."""
+    with _request_counts_lock:
+        counts = dict(request_counts)
+        request_counts.clear()
+    hosts = {}
+    for (host, outcome), count in sorted(counts.items()):
+        hosts.setdefault(host, []).append(f"{count} {outcome}")
+    for host, outcomes in hosts.items():
+        logger.info("Requests to %s: %s", host, ", ".join(outcomes))
+
 def hide_token(headers):
     sanitized_headers = headers.copy()
     if 'Authorization' in sanitized_headers:
@@ -175,42 +1019,248 @@ def hide_token(headers):
     return sanitized_headers
 
 
+def set_api_concurrency(limits):
+    """Overrides the maximum number of concurrent requests for the given API hosts. A limit of None removes it."""
+    with _api_semaphores_lock:
+        for host, limit in limits.items():
+            if limit is None:
+                API_CONCURRENCY.pop(host, None)
+            else:
+                API_CONCURRENCY[host] = limit
+            _api_semaphores.pop(host, None)
+
+def set_api_urls(urls):
+    """Overrides the base URLs of the given APIs ("github", "orcid", "ror", "wikidata")."""
+    API_URLS.update(urls)
+
+def get_api_semaphore(url):
+    host = urlparse(url).netloc
+    # Limits of the running build have their own semaphores, see `build_settings`
+    limits = build_setting("api_concurrency", {})
+    if host in limits:
+        limit, semaphores = limits[host], build_setting("api_semaphores", {})
+    else:
+        limit, semaphores = API_CONCURRENCY.get(host), _api_semaphores
+    if not limit:
+        return None
+    with _api_semaphores_lock:
+        if host not in semaphores:
+            semaphores[host] = threading.BoundedSemaphore(limit)
+        return semaphores[host]
+
+def set_response_cache(cache):
+    """Sets the `cache.ResponseCache` used by `fetch`, or disables caching if `cache` is None."""
+    global response_cache
+    response_cache = cache
+
+def set_request_scheduler(scheduler):
+    """Replaces the `scheduler.RequestScheduler` that paces and retries the requests of `fetch`."""
+    global request_scheduler
+    request_scheduler = scheduler
+
+def set_session_pool(pool):
+    """Replaces the `sessions.SessionPool` used by `fetch`, e.g. to configure other pool sizes."""
+    global session_pool
+    previous, session_pool = session_pool, pool
+    previous.close()
+
+def set_instrumentation(instrumentation):
+    """Sets the `instrumentation.Instrumentation` used by `fetch` and the builds, or disables it if None."""
+    global active_instrumentation
+    active_instrumentation = instrumentation if instrumentation is not None else NoInstrumentation()
+
+@contextmanager
+def build_settings(api_concurrency=None, cache=None, ror_index=None, instrumentation=None,
+                   orcid_sections=None, orcid_store=None):
+    """
+    Applies the per-build settings of `build_graph_from_github_org` to the calling build only. They are
+    kept in a context variable instead of the module globals, so builds running at the same time in other
+    threads keep their own settings and nothing leaks into later calls. Settings that are None are taken
+    from an enclosing `build_settings`, or else from the process-wide ones of the `set_*` functions.
+
+    Tasks that the build runs in worker threads have to be wrapped with `with_build_settings`.
+    """
+    settings = dict(current_build_settings.get())
+    if api_concurrency:
+        # The limits of this build get their own semaphores, inherited limits keep theirs
+        settings["api_semaphores"] = {host: semaphore for host, semaphore in settings.get("api_semaphores", {}).items()
+                                      if host not in api_concurrency}
+        settings["api_concurrency"] = {**settings.get("api_concurrency", {}), **api_concurrency}
+    if orcid_sections is not None:
+        settings["orcid_sections"] = validate_orcid_sections(orcid_sections)
+    settings.update({name: value for name, value in [("cache", cache), ("ror_index", ror_index),
+                                                     ("instrumentation", instrumentation),
+                                                     ("orcid_store", orcid_store)] if value is not None})
+    token = current_build_settings.set(settings)
+    try:
+        yield
+    finally:
+        current_build_settings.reset(token)
+
+def build_setting(name, default):
+    """Returns the setting `name` of the running build (see `build_settings`), or `default` outside of builds."""
+    return current_build_settings.get().get(name, default)
+
+def with_build_settings(function):
+    """Wraps `function` to run with the settings of the calling build, e.g. in the worker threads of the build."""
+    settings = current_build_settings.get()
+
+    def run(*args, **kwargs):
+        token = current_build_settings.set(settings)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            current_build_settings.reset(token)
+    return run
+
+def get_response_cache():
+    return build_setting("cache", response_cache)
+
+def get_ror_index():
+    return build_setting("ror_index", ror_index)
+
+def get_instrumentation():
+    return build_setting("instrumentation", active_instrumentation)
+
+def get_orcid_sections():
+    return build_setting("orcid_sections", orcid_sections)
+
+def get_orcid_candidate_store():
+    return build_setting("orcid_store", orcid_candidate_store)
+
+def send_request(base_url, **kwargs):
+    with get_api_semaphore(base_url) or nullcontext():
+        start = time.perf_counter()
+        status = None
+        try:
+            response = session_pool.get(base_url, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            get_instrumentation().record_attempt(base_url, time.perf_counter() - start, status)
+
 def fetch(base_url, headers, logger, **kwargs):
+    data, _ = fetch_with_headers(base_url, headers, logger, **kwargs)
+    return data
+
+def fetch_with_headers(base_url, headers, logger, **kwargs):
+    """Like `fetch`, but returns the JSON data together with the (cached) response headers."""
+    start = time.perf_counter()
+    # Per-request messages are formatted lazily, and only for the sampled requests
+    logged = is_request_logged(logger)
+    # Serve fresh responses (or any response in offline mode) from the persistent cache
+    cache = get_response_cache()
+    cached = None
+    if cache:
+        cache_key = cache.key(base_url, headers, kwargs.get("params"))
+        cached = cache.get(cache_key)
+        if cached and (cache.offline or cache.is_fresh(cached)):
+            if logged:
+                logger.log(request_log_level, "Serving %s from cache", base_url)
+            record_request(base_url, start, "cache_hit")
+            return cached["data"], cached["headers"]
+        if cache.offline:
+            logger.warning("Offline mode: no cached response for %s", base_url)
+            record_request(base_url, start, "cache_miss")
+            return None, {}
+        if cached:
+            headers = dict(headers, **cache.revalidation_headers(cached))
+
     try:
-        logger.info(f"Starting request to {base_url} with headers: {hide_token(headers)}")
-        response = requests.get(base_url, headers=headers, **kwargs)
+        if logged:
+            logger.log(request_log_level, "Starting request to %s with headers: %s", base_url, hide_token(headers))
+        response = request_scheduler.request(send_request, base_url, logger, headers=headers, **kwargs)
+        
+        if response.status_code == 304 and cached:
+            if logged:
+                logger.log(request_log_level, "Cached data for %s is still valid (Status: %s)",
+                           base_url, response.status_code)
+            cache.touch(cache_key)
+            record_request(base_url, start, "revalidated")
+            return cached["data"], cached["headers"]
         
+        if response.status_code == 204:  # No Content, e.g. the contributors of an empty repository
+            if cache:
+                cache.put(cache_key, base_url, "[]", response.headers)
+            record_request(base_url, start, "fetched")
+            return [], response.headers
+
         if response.status_code == 200:
-            logger.info(f"Successfully fetched data from {base_url} (Status: {response.status_code})")
-            return response.json() 
+            if logged:
+                logger.log(request_log_level, "Successfully fetched data from %s (Status: %s)",
+                           base_url, response.status_code)
+            data = response.json()
+            if cache:
+                cache.put(cache_key, base_url, response.text, response.headers)
+            record_request(base_url, start, "fetched")
+            return data, response.headers
         
-        logger.warning(f"Request to {base_url} returned status {response.status_code}")
+        logger.warning("Request to %s returned status %s", base_url, response.status_code)
+        record_request(base_url, start, "failed")
         response.raise_for_status()
+        return None, response.headers
         
     except requests.exceptions.RequestException as e:
-        logger.error(f"Request to {base_url} failed due to: {e}")
+        logger.error("Request to %s failed due to: %s", base_url, e)
+        if not isinstance(e, requests.exceptions.HTTPError):  # Already recorded above
+            record_request(base_url, start, "failed")
+        return None, {}
+    
+def fetch_paginated(base_url, headers, logger, per_page=100):
+    """
+    Generator over the items of a paginated GitHub API listing. It requests `per_page`
+    items per page and follows the `Link: rel="next"` headers, yielding the items of
+    each page as soon as it arrives.
+
+    Raises:
+        RuntimeError: If a page could not be fetched (e.g. an expired token, a server error
+                      after all retries, or a response missing from the cache in offline mode),
+                      so an incomplete listing is never mistaken for the whole one.
+    """
+    url, params = base_url, {"per_page": per_page}
+    while url:
+        items, response_headers = fetch_with_headers(url, headers, logger=logger, params=params)
+        if items is None:
+            raise RuntimeError(f"Could not fetch the listing {url}")
+        if not items:
+            return  # 204 No Content (e.g. empty repositories) or an empty last page
+        yield from items
+        url, params = get_next_page_url(response_headers.get("Link")), None  # next URL contains the query
+
+def get_next_page_url(link_header):
+    if not link_header:
         return None
+    for link in parse_header_links(link_header):
+        if link.get("rel") == "next":
+            return link["url"]
+    return None
     
 def fetch_github_org(org_name, token, logger):
     headers = {"Authorization": f"token {token}"}
-    base_url = f"https://api.github.com/orgs/{org_name}"
+    base_url = f"{API_URLS['github']}/orgs/{org_name}"
     
     return fetch(base_url, headers, logger=logger)
 
 def fetch_github_repos(repos_url, token, logger):
     headers = {"Authorization": f"token {token}"}
-    return fetch(repos_url, headers, logger=logger)
+    return fetch_paginated(repos_url, headers, logger=logger)
 
 def fetch_github_contributors(contributors_url, token, logger):
     headers = {"Authorization": f"token {token}"}
-    return fetch(contributors_url, headers, logger=logger)
+    return fetch_paginated(contributors_url, headers, logger=logger)
 
 def fetch_github_user(user_url, token, logger):
     headers = {"Authorization": f"token {token}"}
     return fetch(user_url, headers=headers, logger=logger)
 
 def orcid_lookup(name, orcid_token, logger):
-    base_url = "https://pub.orcid.org/v3.0/"
+    # Use the stored (or batch searched) candidates if there is an ORCID candidate store
+    store = get_orcid_candidate_store()
+    if store:
+        search_orcid_candidates([name], orcid_token, logger)
+        return store.best_candidate(name)
+
+    base_url = f"{API_URLS['orcid']}/"
     headers = {"Accept": "application/json", "Authorization": f"Bearer {orcid_token}"}
     
     family_name = name.split()[-1]
@@ -220,20 +1270,225 @@ def orcid_lookup(name, orcid_token, logger):
     query_url = f"{base_url}search/?q={query}"
     
     response_json = fetch(query_url, headers, logger=logger)
+    if not response_json:
+        logger.error(f"ORCID search for {name} failed.")
+        return None
     
-    if response_json["result"]:
+    if response_json.get("result"):
         return response_json["result"][0].get("orcid-identifier", {}).get("path", None) #take first result
     return None
     
 
+def search_orcid_candidates(names, orcid_token, logger):
+    """
+    Searches the ORCID candidates of the `names` that are not in the ORCID candidate store yet and
+    stores them. Up to `ORCID_SEARCH_BATCH_SIZE` names are searched in one expanded-search query.
+    Names whose search failed are not stored.
+    """
+    store = get_orcid_candidate_store()
+    names = list({name_key(name): name for name in names if store.candidates(name) is None}.values())
+    for start in range(0, len(names), ORCID_SEARCH_BATCH_SIZE):
+        search_orcid_batch(names[start:start + ORCID_SEARCH_BATCH_SIZE], orcid_token, logger)
+
+def search_orcid_batch(names, orcid_token, logger):
+    headers = {"Accept": "application/json", "Authorization": f"Bearer {orcid_token}"}
+    params = {"q": orcid_search_query(names), "rows": ORCID_SEARCH_ROWS}
+    response_json = fetch(f"{API_URLS['orcid']}/expanded-search/", headers, logger=logger, params=params)
+    if not response_json:
+        logger.error(f"ORCID search for {len(names)} names failed.")
+        return
+
+    results = response_json.get("expanded-result") or []
+    if response_json.get("num-found", 0) > len(results) and len(names) > 1:
+        # Too many results to attribute them to all names, search the halves separately
+        middle = len(names) // 2
+        search_orcid_batch(names[:middle], orcid_token, logger)
+        search_orcid_batch(names[middle:], orcid_token, logger)
+        return
+    store = get_orcid_candidate_store()
+    for name in names:
+        store.add_search_results(name, results)
+
+def orcid_search_query(names):
+    """ORCID search query matching any of the `names` (or their swapped given and family name)."""
+    def quote(value):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    clauses = []
+    for name in names:
+        given, family = split_name(name)
+        if not given:
+            clauses.append(f"family-name:{quote(family)}")
+            continue
+        clauses.append(f"(given-names:{quote(given)} AND family-name:{quote(family)})")
+        if " " not in given:
+            clauses.append(f"(given-names:{quote(family)} AND family-name:{quote(given)})")
+    return " OR ".join(clauses)
+
+def set_orcid_candidate_store(store):
+    """Sets the `orcid_candidates.OrcidCandidateStore` used to resolve contributors, or disables it if None."""
+    global orcid_candidate_store
+    orcid_candidate_store = store
+
 def fetch_orcid_person(orcid, orcid_token, logger, accept_header="ld+json"):
-    base_url = f"https://pub.orcid.org/v3.0/{orcid}"
+    base_url = f"{API_URLS['orcid']}/{orcid}"
     headers = {"Accept": f"application/{accept_header}", "Authorization": f"Bearer {orcid_token}"}
     return fetch(base_url, headers, logger=logger)
 
+def fetch_orcid_person_sections(orcid, orcid_token, logger, sections=("person", "employments", "educations")):
+    """
+    Fetches only the given sections of an ORCID record (see `ORCID_SECTIONS`) and maps them to a
+    schema.org Person like the one of `fetch_orcid_person`. The employment, education and work
+    summaries all come from one /activities response, so a record takes at most two requests.
+    Returns None if a request failed.
+    """
+    headers = {"Accept": "application/json", "Authorization": f"Bearer {orcid_token}"}
+    records = {}
+    for endpoint in ["person"] * ("person" in sections) + ["activities"] * bool(set(sections) - {"person"}):
+        records[endpoint] = fetch(f"{API_URLS['orcid']}/{orcid}/{endpoint}", headers, logger=logger)
+        if records[endpoint] is None:
+            logger.error(f"Failed to fetch the {endpoint} of ORCID record: {orcid}")
+            return None
+    activities = records.get("activities") or {}
+    employments, educations, works = (activities.get(section) or {} if section in sections else None
+                                      for section in ("employments", "educations", "works"))
+    return orcid_sections_to_schema_org(orcid, records.get("person"), employments, educations, works)
+
+def set_orcid_sections(sections):
+    """
+    Sets the ORCID record sections (see `ORCID_SECTIONS`) fetched for the contributors,
+    or fetches the full JSON-LD records again if `sections` is None.
+    """
+    global orcid_sections
+    orcid_sections = validate_orcid_sections(sections) if sections is not None else None
+
+def validate_orcid_sections(sections):
+    unknown = set(sections) - set(ORCID_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown ORCID record sections: {', '.join(sorted(unknown))}")
+    return tuple(sections)
+
 def get_ror_from_grid(grid, logger):
-    base_url = f"https://api.ror.org/organizations?query=%22{grid}%22"
-    logger.info(f"Starting ROR lookup for GRID: {grid}")
+    key = ("grid", normalize_grid_id(grid))
+    return resolve_organization_identifiers({key}, logger)[key]
+
+def get_ror_from_ringgold(ringgold_id, logger):
+    key = ("ringgold", str(ringgold_id))
+    return resolve_organization_identifiers({key}, logger)[key]
+
+def normalize_grid_id(grid):
+    # ORCID records use GRID URLs like https://www.grid.ac/institutes/grid.8385.6
+    match = re.search(r"grid\.\d+\.[0-9a-f]+", grid)
+    return match.group(0) if match else grid
+
+def collect_organization_identifiers(person):
+    """Returns the GRID and Ringgold identifiers of all organizations listed in `person`."""
+    identifiers = set()
+    for key in ["alumniOf", "affiliation"]:
+        organizations = person.get(key, [])
+        if isinstance(organizations, dict):
+            organizations = [organizations]
+        for org in organizations:
+            org_id = org.get('@id')
+            if org_id and "ror.org" not in org_id and "grid" in org_id:
+                identifiers.add(("grid", normalize_grid_id(org_id)))
+            
+            identifier = org.get('identifier', [])
+            if isinstance(identifier, dict):
+                identifier = [identifier]
+            for id_obj in identifier:
+                if str(id_obj.get('propertyID')).lower() == 'ringgold':
+                    identifiers.add(("ringgold", str(id_obj.get('value'))))
+    return identifiers
+
+def set_ror_index(index):
+    """Sets the `ror_index.RorIndex` used to resolve identifiers and ROR records without network access."""
+    global ror_index
+    ror_index = index
+
+def resolve_organization_identifiers(identifiers, logger):
+    """
+    Resolves GRID and Ringgold identifiers to ROR IDs and memoizes the results in `ror_id_memo`.
+    Unknown identifiers are looked up in the local ROR index (see `set_ror_index`) first.
+    The rest is resolved with a few batched WikiData queries, GRID IDs that WikiData does
+    not know are looked up in the ROR API.
+
+    Args:
+        identifiers (set): ("grid", GRID ID) and ("ringgold", Ringgold ID) tuples.
+
+    Returns:
+        dict: The ROR ID (or None) for each of the identifiers.
+    """
+    with _ror_id_memo_lock:
+        unknown = {identifier for identifier in identifiers if identifier not in ror_id_memo}
+    
+    index = get_ror_index()
+    if index:
+        for identifier in list(unknown):
+            ror_id = index.lookup(*identifier)
+            if ror_id:
+                with _ror_id_memo_lock:
+                    ror_id_memo[identifier] = ror_id
+                unknown.discard(identifier)
+    
+    for scheme in WIKIDATA_ID_PROPERTIES:
+        values = sorted(value for value_scheme, value in unknown if value_scheme == scheme)
+        for start in range(0, len(values), WIKIDATA_BATCH_SIZE):
+            batch = values[start:start + WIKIDATA_BATCH_SIZE]
+            resolved = query_wikidata_ror_ids(scheme, batch, logger)
+            if resolved is None:
+                continue  # Not memoized, so the identifiers are queried again next time
+            
+            for value in batch:
+                ror_id = resolved.get(value)
+                if ror_id is None and scheme == "grid":
+                    ror_id = search_ror_by_grid(value, logger)
+                with _ror_id_memo_lock:
+                    ror_id_memo[(scheme, value)] = ror_id
+    
+    with _ror_id_memo_lock:
+        return {identifier: ror_id_memo.get(identifier) for identifier in identifiers}
+
+def query_wikidata_ror_ids(scheme, values, logger):
+    """
+    Queries WikiData for the ROR IDs of the given GRID or Ringgold IDs in one SPARQL query.
+
+    Returns:
+        dict: The ROR ID of each value that WikiData knows, or None if the query failed.
+    """
+    # SPARQL query to fetch the ROR IDs of all organizations with one of the given identifiers
+    sparql_query = f"""
+    SELECT ?{scheme} ?ror_id WHERE {{
+      VALUES ?{scheme} {{ {" ".join(json.dumps(value) for value in values)} }}
+      ?org wdt:{WIKIDATA_ID_PROPERTIES[scheme]} ?{scheme} .  # Match the organizations by identifier
+      ?org wdt:P6782 ?ror_id .                              # Get the corresponding ROR ID (P6782)
+    }}
+    """
+    
+    # Wikidata Query Service endpoint
+    endpoint_url = API_URLS["wikidata"]
+    
+    headers = {
+        "User-Agent": "Python script to query Wikidata for ROR using Ringgold and GRID",
+        "Accept": "application/json"
+    }
+    logger.debug("Starting query for %d %s IDs in Wikidata.", len(values), scheme)
+    response = fetch(endpoint_url, headers, logger, params={"query": sparql_query, "format": "json"})
+    if not response:
+        logger.error(f"Wikidata query for {len(values)} {scheme} IDs failed.")
+        return None
+    
+    resolved = {}
+    for result in response.get('results', {}).get('bindings', []):
+        value = result[scheme]['value']
+        if value not in resolved:  # take the first ROR ID if there are several
+            resolved[value] = "https://ror.org/" + result['ror_id']['value']
+    logger.info("Found ROR IDs for %d of %d %s IDs in Wikidata.", len(resolved), len(values), scheme)
+    return resolved
+
+def search_ror_by_grid(grid, logger):
+    base_url = f"{API_URLS['ror']}/organizations?query=%22{grid}%22"
+    logger.debug("Starting ROR lookup for GRID: %s", grid)
     
     ror_results = fetch(base_url, {}, logger)
     
@@ -255,52 +1510,24 @@ def get_ror_from_grid(grid, logger):
         return None
     
     if n_results == 1:
-        logger.info(f"Successfully found 1 ROR record for GRID: {grid} -> ROR: {ror}")
+        logger.debug("Successfully found 1 ROR record for GRID: %s -> ROR: %s", grid, ror)
     else:
         logger.warning(f"Multiple ROR records found for GRID: {grid}. Using first ROR: {ror}")
     
     return ror
 
-def get_ror_from_ringgold(ringgold_id, logger):
-    # SPARQL query to fetch the ROR ID from Wikidata using the Ringgold ID
-    sparql_query = f"""
-    SELECT ?ror_id WHERE {{
-      ?org wdt:P3500 "{ringgold_id}" .  # Match the organization with the given Ringgold ID (P3500)
-      ?org wdt:P6782 ?ror_id .           # Get the corresponding ROR ID (P6782)
-    }}
-    """
-    
-    # Wikidata Query Service endpoint
-    endpoint_url = "https://query.wikidata.org/sparql"
-    
-    headers = {
-        "User-Agent": "Python script to query Wikidata for ROR using Ringgold",
-        "Accept": "application/json"
-    }
-    logger.info(f"Starting query for Ringgold ID {ringgold_id} in Wikidata.")
-    response = fetch(endpoint_url, headers, logger, params={"query": sparql_query, "format": "json"})
-    
-    results = response.get('results', {}).get('bindings', [])
-    if not results:
-        logger.info(f"No ROR ID found for Ringgold ID {ringgold_id}.")
-        return None
-        
-    ror_id = "https://ror.org/"+results[0]['ror_id']['value']  # Extract the ROR ID from the SPARQL result
-    logger.info(f"Found ROR ID {ror_id} for Ringgold ID {ringgold_id}.")
-    return ror_id
-
 def get_ror_from_organization(org, logger):  
-    logger.info(f"Starting to extract ROR for the organization: {org.get('name', 'Unnamed Organization')}")
+    logger.debug("Starting to extract ROR for the organization: %s", org.get('name', 'Unnamed Organization'))
 
     # Step 1: Check if @id is a ROR URL
     org_id = org.get('@id')
     if org_id:
-        logger.info(f"Found @id: {org_id}")
+        logger.debug("Found @id: %s", org_id)
         if "ror.org" in org_id:
-            logger.info(f"@id is already a ROR identifier: {org_id}")
+            logger.debug("@id is already a ROR identifier: %s", org_id)
             return org_id
         elif "grid" in org_id:
-            logger.info(f"@id is a GRID identifier: {org_id}")
+            logger.debug("@id is a GRID identifier: %s", org_id)
             ror_id = get_ror_from_grid(org_id, logger)
             if ror_id:
                 return ror_id
@@ -308,7 +1535,7 @@ def get_ror_from_organization(org, logger):
     # Step 2: Check for identifier
     identifier = org.get('identifier')
     if identifier:
-        logger.info(f"Found identifier: {identifier}")
+        logger.debug("Found identifier: %s", identifier)
         
         if isinstance(identifier, list):
             for id_obj in identifier:
@@ -322,28 +1549,28 @@ def get_ror_from_organization(org, logger):
                 return ror
     
     # If no ROR was found
-    logger.info("No ROR could be determined for this organization.")
+    logger.debug("No ROR could be determined for this organization.")
     return None
 
 def process_identifier(identifier, logger):
     property_id = identifier.get('propertyID')
     value = identifier.get('value')
 
-    logger.info(f"Processing identifier with propertyID: {property_id}, value: {value}")
+    logger.debug("Processing identifier with propertyID: %s, value: %s", property_id, value)
 
     # Check if the propertyID corresponds to a ROR
     if property_id.lower() == 'ror':
-        logger.info(f"Identifier is a ROR: {value}")
+        logger.debug("Identifier is a ROR: %s", value)
         return value
     
     # Check if the propertyID corresponds to a Ringgold ID
     if property_id.lower() == 'ringgold':
-        logger.info(f"Identifier is a Ringgold identifier. Querying ROR for Ringgold: {value}")
+        logger.debug("Identifier is a Ringgold identifier. Querying ROR for Ringgold: %s", value)
         ror_id = get_ror_from_ringgold(value, logger)
         if ror_id:
             return ror_id
 
-    logger.info(f"PropertyID {property_id} is not recognized as ROR or Ringgold.")
+    logger.debug("PropertyID %s is not recognized as ROR or Ringgold.", property_id)
     return None
 
 def fetch_schema_org_organization_from_ror(ror_id, logger):
@@ -352,15 +1579,24 @@ def fetch_schema_org_organization_from_ror(ror_id, logger):
     if ror_id.startswith("https://ror.org/"):
         ror_id = ror_id.split('/')[-1]
     
-    base_url = f"https://api.ror.org/organizations/{ror_id}"
+    # Use the local ROR index if it knows the organization
+    index = get_ror_index()
+    if index:
+        ror_data = index.record(ror_id)
+        if ror_data:
+            logger.debug("Found ROR data for ROR ID %s in the local ROR index", ror_id)
+            return ror_org_to_schema_org(ror_data)
+    
+    base_url = f"{API_URLS['ror']}/organizations/{ror_id}"
     headers = {"Accept": "application/json"}
     
-    logger.info(f"Starting query to ROR API for ROR ID: {ror_id}")
+    logger.debug("Starting query to ROR API for ROR ID: %s", ror_id)
     
     ror_data = fetch(base_url, headers, logger)
     if not ror_data:
         logger.error(f"Failed to fetch ROR data for ROR ID: {ror_id}.")
-    logger.info(f"Successfully fetched ROR data for ROR ID: {ror_id}")
+        return None
+    logger.debug("Successfully fetched ROR data for ROR ID: %s", ror_id)
     return ror_org_to_schema_org(ror_data)
 
 def update_person_organizations_with_ror(person, logger):
@@ -383,7 +1619,7 @@ def update_person_organizations_with_ror(person, logger):
                         '@id': ror_id
                     })
                 else:
-                    print(f"Organization {org.get('@id', 'Unknown')} could not be resolved to a ROR ID and will be removed.")
+                    logger.warning("Organization %s could not be resolved to a ROR ID and will be removed.", org.get('@id', 'Unknown'))
             
             if updated_organizations:
                 person[key] = updated_organizations
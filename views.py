@@ -0,0 +1,190 @@
+from collections import Counter, defaultdict
+
+from rdflib import Literal, Namespace, URIRef
+
+SCHEMA = Namespace("http://schema.org/")
+
+# Predicates the views are derived from
+VIEW_PREDICATES = (SCHEMA.contributor, SCHEMA.sourceOrganisation, SCHEMA.affiliation, SCHEMA.familyName)
+
+
+def get_graph_views(graph):
+    """
+    Returns the `GraphViews` of `graph`. The views are built on first use, cached on the graph
+    object and rebuilt if the graph was changed without refreshing them (see `refresh_graph_views`).
+    """
+    views = getattr(graph, "_graph_views", None)
+    if views is None:
+        views = GraphViews(graph)
+        graph._graph_views = views
+    elif views.fingerprint != graph_version(graph):
+        views.refresh()
+    return views
+
+
+def refresh_graph_views(graph, subjects):
+    """
+    Incrementally refreshes the cached views of `graph` after the triples of `subjects` changed.
+    Graphs without materialized views are left alone; their views are built on first use.
+    """
+    views = getattr(graph, "_graph_views", None)
+    if views is not None:
+        views.refresh(subjects)
+
+
+def graph_version(graph):
+    """
+    Returns the version of `graph` that the views and the visualizer caches are keyed on: its store,
+    its number of triples and the number of changes made by the builds (see `bump_graph_version`).
+
+    Edits that keep the number of triples the same, like replacing a triple or a SPARQL UPDATE, are
+    only detected if they are followed by `bump_graph_version(graph)`. The builds and
+    `update_graph_from_github_org` do this for their changes.
+    """
+    return (id(graph.store), len(graph), getattr(graph, "_graph_version", 0))
+
+
+def bump_graph_version(graph):
+    """Marks `graph` as changed, so the views and caches derived from it are rebuilt on next use."""
+    graph._graph_version = getattr(graph, "_graph_version", 0) + 1
+
+
+class GraphViews:
+    """
+    Materialized views of the common analytics queries over a built graph: contributors per
+    repository, repositories per person, persons per affiliated (ROR) organization, repositories
+    per source organization and co-contributor pairs. Answers are dictionary lookups instead of
+    SPARQL queries over the whole graph.
+
+    Args:
+        graph (rdflib.Graph): The graph the views are derived from.
+
+    Notes:
+        - Building the views only reads the triples of the `VIEW_PREDICATES`, not the whole graph.
+        - After changing the graph, call `refresh(subjects)` with the changed repositories and
+          persons. `update_graph_from_github_org` does this for the views of the updated graph.
+        - `get_graph_views` rebuilds views whose `graph_version` is outdated.
+        - IRIs can be passed as strings or `rdflib.URIRef`. Results are `rdflib.URIRef`s.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.refresh()
+
+    def refresh(self, subjects=None):
+        """Rebuilds the views, or only the entries derived from the triples of `subjects`."""
+        if subjects is None:
+            self.clear()
+            for predicate in VIEW_PREDICATES:
+                for subject, obj in self.graph.subject_objects(predicate):
+                    self._add(subject, predicate, obj)
+        else:
+            for subject in map(to_term, subjects):
+                for predicate, objects in ((SCHEMA.contributor, self.contributors),
+                                           (SCHEMA.sourceOrganisation, self.repo_organizations),
+                                           (SCHEMA.affiliation, self.affiliations),
+                                           (SCHEMA.familyName, self.family_names)):
+                    for obj in list(objects.get(subject, ())):
+                        self._remove(subject, predicate, obj)
+                    for obj in self.graph.objects(subject, predicate):
+                        self._add(subject, predicate, obj)
+        self.fingerprint = graph_version(self.graph)
+
+    def clear(self):
+        self.contributors = defaultdict(set)          # repo -> persons
+        self.repos = defaultdict(set)                 # person -> repos
+        self.repo_organizations = defaultdict(set)    # repo -> source organizations
+        self.organization_repos = defaultdict(set)    # organization -> repos
+        self.affiliations = defaultdict(set)          # person -> organizations
+        self.affiliated_persons = defaultdict(set)    # organization -> persons
+        self.family_names = defaultdict(set)          # person -> family names
+        self.persons_by_name = defaultdict(set)       # family name -> persons
+        self.co_contributors = defaultdict(Counter)   # person -> {person: number of shared repos}
+
+    def _add(self, subject, predicate, obj):
+        if predicate == SCHEMA.contributor:
+            if obj in self.contributors[subject]:
+                return
+            for other in self.contributors[subject]:
+                self.co_contributors[obj][other] += 1
+                self.co_contributors[other][obj] += 1
+            self.contributors[subject].add(obj)
+            self.repos[obj].add(subject)
+        elif predicate == SCHEMA.sourceOrganisation:
+            self.repo_organizations[subject].add(obj)
+            self.organization_repos[obj].add(subject)
+        elif predicate == SCHEMA.affiliation:
+            self.affiliations[subject].add(obj)
+            self.affiliated_persons[obj].add(subject)
+        elif predicate == SCHEMA.familyName:
+            self.family_names[subject].add(str(obj))
+            self.persons_by_name[str(obj)].add(subject)
+
+    def _remove(self, subject, predicate, obj):
+        if predicate == SCHEMA.contributor:
+            self.contributors[subject].discard(obj)
+            self.repos[obj].discard(subject)
+            for other in self.contributors[subject]:
+                for a, b in ((obj, other), (other, obj)):
+                    self.co_contributors[a][b] -= 1
+                    if not self.co_contributors[a][b]:
+                        del self.co_contributors[a][b]
+        elif predicate == SCHEMA.sourceOrganisation:
+            self.repo_organizations[subject].discard(obj)
+            self.organization_repos[obj].discard(subject)
+        elif predicate == SCHEMA.affiliation:
+            self.affiliations[subject].discard(obj)
+            self.affiliated_persons[obj].discard(subject)
+        elif predicate == SCHEMA.familyName:
+            self.family_names[subject].discard(str(obj))
+            self.persons_by_name[str(obj)].discard(subject)
+
+    # Query API
+
+    def contributors_of(self, repo):
+        return sorted(self.contributors.get(to_term(repo), ()))
+
+    def repos_of(self, person):
+        return sorted(self.repos.get(to_term(person), ()))
+
+    def repos_of_organization(self, organization):
+        return sorted(self.organization_repos.get(to_term(organization), ()))
+
+    def organizations_of(self, person):
+        return sorted(self.affiliations.get(to_term(person), ()))
+
+    def persons_affiliated_with(self, organization):
+        return sorted(self.affiliated_persons.get(to_term(organization), ()))
+
+    def persons_by_family_name(self, family_name):
+        return sorted(self.persons_by_name.get(family_name, ()))
+
+    def co_contributors_of(self, person):
+        """Returns [(person, number of shared repos)] for a person, most shared repos first."""
+        return sorted(self.co_contributors.get(to_term(person), {}).items(), key=lambda item: (-item[1], item[0]))
+
+    def contributor_counts(self, organization=None):
+        """Returns {repo: number of contributors}, optionally only for the repos of `organization`."""
+        repos = self.contributors if organization is None else self.repos_of_organization(organization)
+        return {repo: len(self.contributors[repo]) for repo in repos if self.contributors.get(repo)}
+
+    def affiliation_counts(self):
+        """Returns {organization: number of affiliated persons}."""
+        return {organization: len(persons) for organization, persons in self.affiliated_persons.items() if persons}
+
+    def co_contributor_pairs(self, min_shared_repos=1):
+        """Returns {(person, person): number of shared repos} for all pairs of co-contributors."""
+        return {(a, b): count for a, others in self.co_contributors.items()
+                for b, count in others.items() if a < b and count >= min_shared_repos}
+
+    def person_neighbourhood(self, person):
+        """Returns the repositories, affiliations and co-contributors of a person."""
+        return {
+            "repos": self.repos_of(person),
+            "affiliations": self.organizations_of(person),
+            "co_contributors": self.co_contributors_of(person),
+        }
+
+
+def to_term(node):
+    return node if isinstance(node, (URIRef, Literal)) else URIRef(node)
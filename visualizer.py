@@ -1,10 +1,56 @@
+import json
+import math
+import random
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+
 import rdflib
-from rdflib import Graph
+from rdflib import BNode, Graph, Literal, RDF
+from rdflib.plugins.sparql import prepareQuery
 from pyvis.network import Network
 
+from views import graph_version
+
+# Number of compiled SPARQL queries and of extracted subgraphs per graph that are cached
+QUERY_CACHE_SIZE = 128
+SUBGRAPH_CACHE_SIZE = 32
+
+# Parameterised versions of the notebook's example queries, see `get_subgraph`
+REPO_QUERY = """
+PREFIX schema: <http://schema.org/>
+
+SELECT ?subject ?predicate ?object
+WHERE {
+  ?software a schema:SoftwareSourceCode .
+  ?software schema:name ?name .
+  ?software ?predicate ?object .
+  BIND(?software AS ?subject)
+}
+"""
+
+PERSON_NEIGHBOURHOOD_QUERY = """
+PREFIX schema: <http://schema.org/>
+
+SELECT ?subject ?predicate ?object
+WHERE {
+  ?person a schema:Person .
+  ?person schema:familyName ?familyName .
+  {
+    ?person ?predicate ?object .
+    BIND(?person AS ?subject)
+  }
+  UNION
+  {
+    ?subject ?predicate ?person .
+    BIND(?person AS ?object)
+  }
+}
+"""
+
+
 def visualize_graph(graph, hide_literals=False, hide_BNodes=False,
                     hide_labels=False, hide_type_nodes=False,
-                    sparql_query="", physics=False):
+                    sparql_query="", physics=False, bindings=None, subgraph=None):
     """
     Visualizes an RDFLib graph using PyVis, with options to filter nodes, edges, 
     and customize the visualization. The resulting interactive graph is displayed 
@@ -23,6 +69,10 @@ def visualize_graph(graph, hide_literals=False, hide_BNodes=False,
         sparql_query (str): A SPARQL query to extract a subgraph for visualization.
                             If empty, the entire graph is visualized.
         physics (bool): If True, enables physics simulation for the graph layout.
+        bindings (dict): Values of variables of `sparql_query`, e.g. `{"name": "metador-push"}`
+                         for `REPO_QUERY`. See `get_subgraph`.
+        subgraph (rdflib.Graph): A subgraph of `graph` to visualize instead of a query result,
+                                 e.g. from `ego_graph`. Node titles are still taken from `graph`.
 
     Returns:
         IPython.core.display.IFrame: An IFrame displaying the interactive graph, 
@@ -41,21 +91,21 @@ def visualize_graph(graph, hide_literals=False, hide_BNodes=False,
         - Even when hiding labels, literals, or type nodes, all associated information 
           is preserved in the node titles, which can be accessed by clicking on a node 
           in the interactive graph.
+        - Node metadata is computed only for the nodes that are drawn and cached on the graph
+          (see `get_node_index`), so repeated queries cost time in proportion to the subgraph.
+        - Queries are compiled once and their subgraphs are cached per graph (see `get_subgraph`),
+          so re-running a query with the same bindings does not evaluate it again.
     """
     # Initialize a PyVis network
     g = Network(notebook=True, directed=True)
     
     # If a SPARQL query is provided, filter the graph and build a subgraph
-    if sparql_query:
-        subgraph = Graph()
-        for row in graph.query(sparql_query):
-            subgraph.add(row)  # Add each result to the subgraph
-    else:
-        subgraph = graph  # Use the full graph if no SPARQL query is provided
+    if subgraph is None:
+        subgraph = get_subgraph(graph, sparql_query, bindings)
     
-    # Fetch types and literals for nodes to enhance visualization details
-    node_types = get_node_types(graph)
-    node_literals = get_node_literals(graph)
+    # Node types, literals, titles and colors are looked up in the (cached) index of the full graph
+    node_index = get_node_index(graph)
+    added_nodes = set()
     
     # Iterate over each triple in the subgraph
     for subject, predicate, obj in subgraph:
@@ -73,15 +123,14 @@ def visualize_graph(graph, hide_literals=False, hide_BNodes=False,
             if predicate == rdflib.term.URIRef('http://www.w3.org/1999/02/22-rdf-syntax-ns#type'):
                 continue
         
-        # Add subject and object nodes with labels, titles, and colors
-        g.add_node(subject,
-                   label=get_node_labels(subject, node_types, hide_labels),
-                   title=get_title(subject, node_types, node_literals),
-                   color=get_color(subject, node_types))
-        g.add_node(obj,
-                   label=get_node_labels(obj, node_types, hide_labels),
-                   title=get_title(obj, node_types, node_literals),
-                   color=get_color(obj, node_types))
+        # Add subject and object nodes with labels, titles, and colors (once per node)
+        for node in (subject, obj):
+            if node not in added_nodes:
+                added_nodes.add(node)
+                g.add_node(node,
+                           label=node_index.label(node, hide_labels),
+                           title=node_index.title(node),
+                           color=node_index.color(node))
         
         # Add edges with predicate labels
         if hide_labels:
@@ -89,60 +138,388 @@ def visualize_graph(graph, hide_literals=False, hide_BNodes=False,
         else:
             edge_label = use_prefix(predicate)  # Use prefixes for predicate labels
         g.add_edge(subject, obj, label=edge_label,
-                   title=get_title(predicate, node_types, node_literals))
-        
-        # Enable or disable physics simulation based on the `physics` argument
-        g.toggle_physics(physics)
+                   title=node_index.title(predicate))
+    
+    # Enable or disable physics simulation based on the `physics` argument
+    g.toggle_physics(physics)
     
     # Display the graph in an interactive HTML file and return the file path
     return g.show("graph.html")
 
 
-def get_node_labels(node, node_types, hide_labels):
-    if hide_labels:
-        return " "
-    if isinstance(node, rdflib.BNode):
-        return "BNode/type:" + use_prefix(node_types[str(node)])
-    else:
-        return use_prefix(node)
+def visualize_large_graph(graph, sparql_query="", max_nodes=1000,
+                          collapse_literals=True, collapse_creative_works=True,
+                          hide_labels=False, show_titles=True,
+                          html_file="graph.html", json_file=None, bindings=None, subgraph=None):
+    """
+    Visualizes large RDFLib graphs (e.g. the whole graph.ttl) with PyVis. Unlike `visualize_graph`,
+    the graph is reduced to at most `max_nodes` nodes and laid out in Python, so the browser
+    only draws the precomputed positions and does not run a physics simulation.
 
-def get_node_types(graph):
-    query = """
-        SELECT ?node ?type WHERE { ?node a ?type }
+    Args:
+        graph (rdflib.Graph): The RDFLib graph to visualize.
+        sparql_query (str): A SPARQL query to extract a subgraph for visualization.
+                            If empty, the entire graph is visualized.
+        max_nodes (int): Maximum number of drawn nodes. If the graph has more nodes,
+                         the nodes with the most connections are kept.
+        collapse_literals (bool): If True, literals are not drawn as nodes.
+                                  They are preserved in the node titles.
+        collapse_creative_works (bool): If True, the schema:CreativeWork nodes linked to a node
+                                        are collapsed into one aggregate node listing them.
+        hide_labels (bool): If True, hides the labels on nodes.
+        show_titles (bool): If True, nodes have titles with their types and literals.
+                            Disable it to make the HTML file considerably smaller.
+        html_file (str): Name of the HTML file the visualization is saved to.
+        json_file (str): Optional name of a file the drawn nodes and edges are saved to as JSON.
+        bindings (dict): Values of variables of `sparql_query`, see `get_subgraph`.
+        subgraph (rdflib.Graph): A subgraph of `graph` to visualize instead of a query result,
+                                 e.g. from `ego_graph`.
+
+    Returns:
+        IPython.core.display.IFrame: An IFrame displaying the interactive graph,
+                                     also saved as an HTML file.
+
+    Notes:
+        - `rdf:type` edges are not drawn; the types are shown by the node colors (see `visualize_graph`)
+          and in the node titles. Predicates are shown in the edge titles instead of edge labels.
+        - The layout uses `networkx.spring_layout` if numpy is installed and a pure Python
+          force-directed layout otherwise.
     """
+    if subgraph is None:
+        subgraph = get_subgraph(graph, sparql_query, bindings)
+    node_index = get_node_index(graph)
+    creative_work = "http://schema.org/CreativeWork"
 
-    node_types = {}
-    for node, node_type in graph.query(query):
-        node_types[str(node)] = str(node_type)
-    return node_types
+    # Collect the edges to draw, collapsing literals and creative works
+    edges = {}
+    creative_works = defaultdict(set)
+    for subject, predicate, obj in subgraph:
+        if predicate == rdflib.RDF.type or (collapse_literals and isinstance(obj, rdflib.Literal)):
+            continue
+        if collapse_creative_works:
+            subject_is_work = node_index.type(subject) == creative_work
+            obj_is_work = node_index.type(obj) == creative_work
+            if subject_is_work or obj_is_work:
+                # Works are attached to the persons/organizations they link, their other nodes are dropped
+                if subject_is_work and not obj_is_work and isinstance(obj, rdflib.URIRef):
+                    creative_works[obj].add(subject)
+                elif obj_is_work and not subject_is_work and isinstance(subject, rdflib.URIRef):
+                    creative_works[subject].add(obj)
+                continue
+        edges.setdefault((subject, obj), set()).add(use_prefix(predicate))
 
-from rdflib import Graph, URIRef, BNode, Literal
+    for node, works in creative_works.items():
+        edges[(node, (node, "CreativeWork"))] = {f"{len(works)} schema/CreativeWork"}
 
-def get_node_literals(graph):
-    node_literals = {}
+    # Keep the nodes with the most connections
+    degrees = defaultdict(int)
+    for subject, obj in edges:
+        degrees[subject] += 1
+        degrees[obj] += 1
+    nodes = sorted(degrees, key=lambda node: (-degrees[node], str(node)))[:max_nodes]
+    kept_nodes = set(nodes)
+    edges = {edge: predicates for edge, predicates in edges.items()
+             if edge[0] in kept_nodes and edge[1] in kept_nodes}
 
-    for subject, predicate, obj in graph:
-        if isinstance(obj, Literal):
-            node_key = str(subject)
-            if node_key not in node_literals:
-                node_literals[node_key] = []
-            node_literals[node_key].append((str(predicate), str(obj)))
-        
-        # # Handle case where the object is a node (URI or blank node) and the object itself has literals
-        # if isinstance(obj, (URIRef, BNode)):
-        #     for _, p, o in graph.triples((obj, None, None)):
-        #         if isinstance(o, Literal):
-        #             node_key = str(obj)
-        #             if node_key not in node_literals:
-        #                 node_literals[node_key] = []
-        #             node_literals[node_key].append(str(o))
-    
-    # Remove duplicates from the lists of literals for each node
-    for node in node_literals:
-        node_literals[node] = list(set(node_literals[node]))
+    positions = compute_layout(nodes, list(edges))
+
+    g = Network(notebook=True, directed=True)
+    ids = {node: i for i, node in enumerate(nodes)}
+    for node in nodes:
+        x, y = positions[node]
+        if isinstance(node, tuple):  # Aggregate of creative works
+            works = sorted(creative_works[node[0]])
+            label = f"{len(works)} CreativeWorks"
+            title = "type: http://schema.org/CreativeWork\n" + "".join(f"id: {work}\n" for work in works)
+            color = get_color(node[0], {str(node[0]): creative_work})
+        else:
+            label = node_index.label(node)
+            title = node_index.title(node)
+            color = node_index.color(node)
+        options = {"label": " " if hide_labels else label, "color": color, "x": x, "y": y}
+        if show_titles:
+            options["title"] = title
+        g.nodes.append(dict(options, id=ids[node], shape="dot"))
+    # The nodes and edges are added directly, since `Network.add_edge` checks every node per edge
+    g.node_ids = list(range(len(nodes)))
+    g.node_map = {node["id"]: node for node in g.nodes}
+    for (subject, obj), predicates in edges.items():
+        g.edges.append({"from": ids[subject], "to": ids[obj], "title": ", ".join(sorted(predicates)),
+                        "arrows": "to"})
+
+    g.toggle_physics(False)
+    g.options.edges.smooth.enabled = False
+    g.options.interaction.hideEdgesOnDrag = True
+
+    if json_file:
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump({"nodes": g.nodes, "edges": g.edges}, f, separators=(",", ":"))
+    return g.show(html_file)
+
+
+def get_subgraph(graph, sparql_query, bindings=None):
+    """
+    Returns the subgraph of `graph` selected by a SPARQL query, or `graph` if the query is empty.
+
+    Args:
+        graph (rdflib.Graph): The graph to query.
+        sparql_query (str): A SELECT query with three result variables (subject, predicate, object),
+                            or a CONSTRUCT query.
+        bindings (dict): Initial values of query variables, e.g. `{"familyName": "Hofmann"}` for
+                         `PERSON_NEIGHBOURHOOD_QUERY`. Values that are not rdflib terms are bound
+                         as literals.
+
+    Returns:
+        rdflib.Graph: The subgraph.
+
+    Notes:
+        - The query is parsed and compiled once (see `prepare_query`), only the bindings change
+          between calls, so templates can be re-run with different values without string formatting.
+        - Subgraphs are cached on the graph object (see `get_subgraph_cache`) until the graph changes.
+          The returned graph is shared between calls and should not be modified.
+    """
+    if not sparql_query:
+        return graph
+    bindings = {name: to_binding(value) for name, value in (bindings or {}).items()}
+    key = ("sparql", sparql_query, frozenset(bindings.items()))
+    cache = get_subgraph_cache(graph)
+    subgraph = cache.get(key)
+    if subgraph is None:
+        result = graph.query(prepare_query(sparql_query), initBindings=bindings)
+        if result.type in ("CONSTRUCT", "DESCRIBE"):
+            subgraph = result.graph
+        else:
+            subgraph = Graph()
+            subgraph.addN((*row, subgraph) for row in result if None not in row)
+        cache.put(key, subgraph)
+    return subgraph
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def prepare_query(sparql_query):
+    """Parses and compiles a SPARQL query. The compiled queries are kept in an LRU cache."""
+    return prepareQuery(sparql_query)
+
+
+def to_binding(value):
+    return value if isinstance(value, rdflib.term.Identifier) else rdflib.Literal(value)
+
+
+def find_nodes(graph, predicate, value, node_type=None):
+    """
+    Returns the subjects with the literal `value` of `predicate` using the graph's triple indexes,
+    e.g. `find_nodes(graph, "http://schema.org/familyName", "Hofmann", "http://schema.org/Person")`.
+
+    Args:
+        graph (rdflib.Graph): The graph to search.
+        predicate (str): IRI of the predicate.
+        value: The value, bound as a literal unless it is an rdflib term.
+        node_type (str): If given, only subjects with this rdf:type are returned.
+    """
+    predicate, value = rdflib.URIRef(predicate), to_binding(value)
+    nodes = set(graph.subjects(predicate, value))
+    if node_type is not None:
+        nodes = {node for node in nodes if (node, rdflib.RDF.type, rdflib.URIRef(node_type)) in graph}
+    return sorted(nodes)
+
+
+def neighbourhood(graph, nodes, direction="both", predicates=None):
+    """
+    Returns the triples of `nodes` as a subgraph, looked up with triple patterns instead of SPARQL.
+    `neighbourhood(graph, find_nodes(graph, schema.familyName, "Hofmann"))` is the same subgraph
+    as `PERSON_NEIGHBOURHOOD_QUERY`.
+
+    Args:
+        graph (rdflib.Graph): The graph to extract the subgraph from.
+        nodes (list or rdflib.term.Node): The nodes (IRIs as strings or rdflib terms).
+        direction (str): "out" for the triples with a node as subject, "in" for the triples
+                         with a node as object, or "both".
+        predicates (list): If given, only triples with these predicates are included.
+
+    Returns:
+        rdflib.Graph: The subgraph, cached like the results of `get_subgraph`.
+    """
+    return ego_graph(graph, nodes, radius=1, direction=direction, predicates=predicates)
+
+
+def ego_graph(graph, nodes, radius=1, direction="both", predicates=None, max_nodes=None):
+    """
+    Returns the subgraph of the triples within `radius` steps of `nodes`. The graph is walked
+    breadth first with triple patterns on the graph's indexes; literals and the classes of
+    rdf:type triples are included but not walked through.
+
+    Args:
+        graph (rdflib.Graph): The graph to extract the subgraph from.
+        nodes (list or rdflib.term.Node): The center nodes (IRIs as strings or rdflib terms).
+        radius (int): Number of steps from the center nodes.
+        direction (str): "out" to follow triples from subject to object, "in" from object to
+                         subject, or "both".
+        predicates (list): If given, only triples with these predicates are followed.
+        max_nodes (int): If given, the walk stops once this many nodes were reached.
+
+    Returns:
+        rdflib.Graph: The subgraph, cached like the results of `get_subgraph`. It is shared
+                      between calls and should not be modified.
+    """
+    if direction not in ("in", "out", "both"):
+        raise ValueError(f"Unknown direction '{direction}', use 'in', 'out' or 'both'.")
+    if isinstance(nodes, (str, rdflib.term.Node)):
+        nodes = [nodes]
+    nodes = [node if isinstance(node, rdflib.term.Node) else rdflib.URIRef(node) for node in nodes]
+    predicates = None if predicates is None else [rdflib.URIRef(predicate) for predicate in predicates]
+
+    key = ("ego", frozenset(nodes), radius, direction,
+           None if predicates is None else frozenset(predicates), max_nodes)
+    cache = get_subgraph_cache(graph)
+    subgraph = cache.get(key)
+    if subgraph is not None:
+        return subgraph
+
+    subgraph = Graph()
+    visited = set(nodes)
+    frontier = nodes
+    for _ in range(radius):
+        triples = []
+        for node in frontier:
+            for predicate in predicates or [None]:
+                if direction != "in":
+                    triples.extend(graph.triples((node, predicate, None)))
+                if direction != "out":
+                    triples.extend(graph.triples((None, predicate, node)))
+        subgraph.addN((*triple, subgraph) for triple in triples)
+
+        frontier = []
+        for subject, predicate, obj in triples:
+            # Classes are not walked through, they would connect all nodes of a type
+            for node in (subject,) if predicate == rdflib.RDF.type else (subject, obj):
+                if node not in visited and not isinstance(node, rdflib.Literal):
+                    visited.add(node)
+                    frontier.append(node)
+        if max_nodes is not None and len(visited) >= max_nodes:
+            break
+    cache.put(key, subgraph)
+    return subgraph
+
+
+def get_subgraph_cache(graph):
+    """
+    Returns the `SubgraphCache` of `graph`. Like the `NodeIndex`, it is cached on the graph object
+    and cleared once the graph has changed.
+    """
+    fingerprint = graph_version(graph)
+    cache = getattr(graph, "_subgraph_cache", None)
+    if cache is None:
+        cache = SubgraphCache(SUBGRAPH_CACHE_SIZE)
+        graph._subgraph_cache = cache
+    if cache.fingerprint != fingerprint:
+        cache.clear()
+        cache.fingerprint = fingerprint
+    return cache
+
+
+class SubgraphCache:
+    """
+    LRU cache of the subgraphs extracted from a graph by `get_subgraph`, `neighbourhood` and `ego_graph`.
+
+    Args:
+        max_size (int): Maximum number of cached subgraphs.
+
+    Notes:
+        - Like for the `NodeIndex`, the fingerprint of the graph is its `views.graph_version`. Call
+          `views.bump_graph_version(graph)` after edits that keep the number of triples the same.
+    """
+
+    def __init__(self, max_size=SUBGRAPH_CACHE_SIZE):
+        self.max_size = max_size
+        self.fingerprint = None
+        self.clear()
+
+    def clear(self):
+        self._subgraphs = OrderedDict()
+
+    def get(self, key):
+        subgraph = self._subgraphs.get(key)
+        if subgraph is not None:
+            self._subgraphs.move_to_end(key)
+        return subgraph
+
+    def put(self, key, subgraph):
+        self._subgraphs[key] = subgraph
+        self._subgraphs.move_to_end(key)
+        while len(self._subgraphs) > self.max_size:
+            self._subgraphs.popitem(last=False)
 
-    return node_literals
 
+def compute_layout(nodes, edges, scale=None, seed=0):
+    """Returns {node: (x, y)} pixel positions of a force-directed layout of the nodes."""
+    if not nodes:
+        return {}
+    try:
+        import networkx as nx
+        import numpy  # noqa: F401 (required by networkx.spring_layout)
+        nx_graph = nx.Graph()
+        nx_graph.add_nodes_from(nodes)
+        nx_graph.add_edges_from(edges)
+        positions = nx.spring_layout(nx_graph, seed=seed)
+    except ImportError:
+        positions = spring_layout(nodes, edges, seed=seed)
+
+    # Spread the unit-sized layout so that the average node has room for its label
+    scale = scale or 60 * math.sqrt(len(nodes))
+    return {node: (round(float(x) * scale), round(float(y) * scale)) for node, (x, y) in positions.items()}
+
+
+def spring_layout(nodes, edges, iterations=50, seed=0):
+    """
+    Pure Python Fruchterman-Reingold layout, used when numpy is not available.
+    Repulsion is only computed between nodes in neighbouring grid cells, which keeps an
+    iteration roughly linear in the number of nodes.
+    """
+    rng = random.Random(seed)
+    k = 1 / math.sqrt(len(nodes))  # Ideal distance between nodes in the unit square
+    positions = {node: [rng.random(), rng.random()] for node in nodes}
+    temperature = 0.1
+    for _ in range(iterations):
+        displacement = {node: [0.0, 0.0] for node in nodes}
+
+        cells = defaultdict(list)
+        for node, (x, y) in positions.items():
+            cells[(int(x // (2 * k)), int(y // (2 * k)))].append(node)
+        for (cell_x, cell_y), members in cells.items():
+            neighbours = [other for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                          for other in cells.get((cell_x + dx, cell_y + dy), ())]
+            for node in members:
+                x, y = positions[node]
+                move = displacement[node]
+                for other in neighbours:
+                    if other is node:
+                        continue
+                    dx, dy = x - positions[other][0], y - positions[other][1]
+                    force = k * k / max(dx * dx + dy * dy, 1e-9)
+                    move[0] += dx * force
+                    move[1] += dy * force
+
+        for a, b in edges:
+            dx, dy = positions[a][0] - positions[b][0], positions[a][1] - positions[b][1]
+            force = math.sqrt(dx * dx + dy * dy) / k
+            displacement[a][0] -= dx * force
+            displacement[a][1] -= dy * force
+            displacement[b][0] += dx * force
+            displacement[b][1] += dy * force
+
+        for node, (dx, dy) in displacement.items():
+            length = math.sqrt(dx * dx + dy * dy)
+            if length > 0:
+                step = min(length, temperature) / length
+                positions[node][0] += dx * step
+                positions[node][1] += dy * step
+        temperature -= 0.1 / (iterations + 1)
+
+    # Center the layout and rescale it to [-1, 1] like networkx
+    center_x = sum(x for x, _ in positions.values()) / len(positions)
+    center_y = sum(y for _, y in positions.values()) / len(positions)
+    extent = max(max(abs(x - center_x), abs(y - center_y)) for x, y in positions.values()) or 1
+    return {node: ((x - center_x) / extent, (y - center_y) / extent) for node, (x, y) in positions.items()}
 
 
 def use_prefix(term):
@@ -179,17 +556,72 @@ def get_color(node, node_types):
     
     return "#D3D3D3"  # Default: Light gray for other URIs
 
-def get_title(node, node_types, node_literals):
-    node_description = {}
-    node_description["type"] = node_types.get(str(node), type(node))
-    node_description["id"] = str(node)
-    
-    literals = node_literals.get(str(node), [])
-    for predicate, literal in literals:
-        node_description[use_prefix(predicate)] = str(literal)
-    
-    title = ""
-    for key in node_description:
-        title += f"{key}: {node_description[key]}\n"
-        
-    return title
\ No newline at end of file
+
+def get_node_index(graph):
+    """
+    Returns the `NodeIndex` of `graph`. The index is cached on the graph object and rebuilt
+    once the graph has changed, so repeated `visualize_graph` calls share the computed metadata.
+    """
+    fingerprint = graph_version(graph)
+    node_index = getattr(graph, "_node_index", None)
+    if node_index is None or node_index.fingerprint != fingerprint:
+        node_index = NodeIndex(graph, fingerprint)
+        graph._node_index = node_index
+    return node_index
+
+
+class NodeIndex:
+    """
+    Lazily computed metadata (type, literals, title and color) of the nodes of a graph.
+    The metadata of a node is looked up in the graph's indexes the first time the node is drawn
+    and memoized afterwards, instead of scanning the whole graph up front.
+
+    Args:
+        graph (rdflib.Graph): The graph the metadata is taken from.
+        fingerprint (tuple): Identifies the state of `graph` the index was built for, see `graph_version`.
+    """
+
+    def __init__(self, graph, fingerprint=None):
+        self.graph = graph
+        self.fingerprint = fingerprint
+        self.clear()
+
+    def clear(self):
+        self._types = {}
+        self._titles = {}
+
+    def type(self, node):
+        """Returns the rdf:type of `node` as a string, or None."""
+        if node not in self._types:
+            node_type = None
+            if not isinstance(node, Literal):
+                node_type = self.graph.value(node, RDF.type, any=True)
+            self._types[node] = str(node_type) if node_type is not None else None
+        return self._types[node]
+
+    def literals(self, node):
+        """Returns the distinct (predicate, literal) pairs of `node` as strings."""
+        if isinstance(node, Literal):
+            return []
+        return list({(str(predicate), str(obj)) for predicate, obj in self.graph.predicate_objects(node)
+                     if isinstance(obj, Literal)})
+
+    def label(self, node, hide_labels=False):
+        if hide_labels:
+            return " "
+        if isinstance(node, BNode):
+            return "BNode/type:" + use_prefix(self.type(node) or "")
+        return use_prefix(node)
+
+    def title(self, node):
+        if node not in self._titles:
+            node_description = {}
+            node_description["type"] = self.type(node) or type(node)
+            node_description["id"] = str(node)
+            for predicate, literal in self.literals(node):
+                node_description[use_prefix(predicate)] = literal
+            self._titles[node] = "".join(f"{key}: {value}\n" for key, value in node_description.items())
+        return self._titles[node]
+
+    def color(self, node):
+        return get_color(node, {str(node): self.type(node)})